@@ -0,0 +1,289 @@
+import io
+import os
+import re
+import csv
+import sys
+import json
+import glob
+import time
+import traceback
+import importlib
+import contextlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Tuple
+
+# ============================================================
+# ✅ 실행 설정 (여기만 바꾸면 됨)
+# ============================================================
+# 폴더째 받은 경력증명서를 한 번에 추출
+#   python batch_extract.py
+#   python batch_extract.py extract_main "allfile" manifest.csv
+#   python batch_extract.py extract_main_withcloud "0129/*.pdf" manifest.json
+MODULE   = "extract_main"       # extract_main / extract_elect / extract_main_withcloud / ...
+INPUT    = r"allfile"           # 폴더 또는 glob 패턴
+MANIFEST = r"manifest.csv"      # 파일 -> USER_NO 매핑 (CSV: file,user_no / JSON: {"파일": "user_no"} 또는 [{"file":..,"user_no":..}])
+OUT_DIR  = "batch_out"          # 사람별 JSON + _summary.json + logs/
+
+WORKERS = os.cpu_count() or 1   # 파일 단위 프로세스 수
+SKIP_UNMAPPED = True            # manifest에 없는 PDF는 건너뜀(False면 실패로 기록)
+
+# ============================================================
+# ✅ manifest / 입력 파일
+# ============================================================
+MANIFEST_COLUMNS = ("file", "user_no")
+
+# user_no는 결과 파일 이름(<OUT_DIR>/<user_no>.json)으로 그대로 씀
+#   -> 글자/숫자/한글, '.', '-', '_' 만 (경로 구분자, '..', 윈도우 금지 문자/예약 이름 막음)
+USER_NO_RE = re.compile(r"[\w\-.]{1,100}")
+WINDOWS_RESERVED = {"CON", "PRN", "AUX", "NUL", *(f"COM{i}" for i in range(1, 10)), *(f"LPT{i}" for i in range(1, 10))}
+
+def check_user_no(user_no: str, file_: str) -> str:
+    if (not USER_NO_RE.fullmatch(user_no) or user_no.startswith(".") or user_no.endswith(".")
+            or user_no.split(".")[0].upper() in WINDOWS_RESERVED):
+        raise ValueError(f"manifest: user_no {user_no!r} for '{file_}' is not a safe file name "
+                         f"(allowed: letters/digits/한글 . - _, no leading/trailing '.', no CON/NUL/COM1..)")
+    return user_no
+
+def load_manifest(path: str) -> Dict[str, str]:
+    """
+    return: {파일명 또는 경로: user_no}
+    CSV  : 헤더 file,user_no (순서 무관)
+    JSON : {"a.pdf": "hong"} 또는 [{"file": "a.pdf", "user_no": "hong"}, ...]
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"manifest not found: {path}")
+
+    rows: List[Tuple[str, str]] = []
+    if p.suffix.lower() == ".json":
+        with open(p, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            rows = [(str(k), str(v)) for k, v in data.items()]
+        else:
+            for i, r in enumerate(data):
+                missing = [c for c in MANIFEST_COLUMNS if c not in r]
+                if missing:
+                    raise ValueError(f"manifest {path}: row {i} missing key(s) {', '.join(missing)}")
+                rows.append((str(r["file"]), str(r["user_no"])))
+    else:
+        with open(p, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            missing = [c for c in MANIFEST_COLUMNS if c not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"manifest {path}: missing column(s) {', '.join(missing)} "
+                                 f"(header: {reader.fieldnames}, need: {','.join(MANIFEST_COLUMNS)})")
+            for r in reader:
+                file_ = (r.get("file") or "").strip()
+                user_no = (r.get("user_no") or "").strip()
+                if file_ and user_no:
+                    rows.append((file_, user_no))
+
+    manifest: Dict[str, str] = {}
+    seen_user: Dict[str, str] = {}
+    for file_, user_no in rows:
+        check_user_no(user_no, file_)
+        # 사람당 JSON 1개 -> 같은 user_no가 두 파일에 매핑되면 결과가 덮어써지므로 막음
+        if user_no in seen_user and seen_user[user_no] != file_:
+            raise ValueError(f"manifest: user_no '{user_no}' mapped to both '{seen_user[user_no]}' and '{file_}'")
+        seen_user[user_no] = file_
+        manifest[file_] = user_no
+    return manifest
+
+def list_input_pdfs(input_: str) -> List[Path]:
+    p = Path(input_)
+    if p.is_dir():
+        files = [x for x in p.iterdir() if x.suffix.lower() == ".pdf"]
+    else:
+        files = [Path(x) for x in glob.glob(input_, recursive=True) if x.lower().endswith(".pdf")]
+    return sorted(files)
+
+def lookup_user_no(manifest: Dict[str, str], pdf_path: Path):
+    # 경로 그대로 -> 파일명 -> 확장자 뺀 이름 순으로 찾음
+    for key in (str(pdf_path), pdf_path.as_posix(), pdf_path.name, pdf_path.stem):
+        if key in manifest:
+            return manifest[key]
+    return None
+
+# ============================================================
+# ✅ 파일 1개 추출 (워커 프로세스)
+#   - 추출기 모듈의 실행 설정(PDF_PATH/OUT_JSON/USER_NO)을 바꿔서 main() 그대로 실행
+#   - 예외는 여기서 잡아서 결과로 돌려줌 -> 한 파일 실패가 배치를 멈추지 않음
+# ============================================================
+def run_one(module_name: str, pdf_path: str, user_no: str, out_json: str, log_path: str) -> Dict[str, Any]:
+    res: Dict[str, Any] = {
+        "file": pdf_path,
+        "user_no": user_no,
+        "out_json": out_json,
+        "ok": False,
+        "items": None,
+        "seconds": None,
+        "error": None,
+        "header_cache": None,
+    }
+    t0 = time.perf_counter()
+    log = io.StringIO()
+    try:
+        mod = importlib.import_module(module_name)
+        mod.PDF_PATH = pdf_path
+        mod.OUT_JSON = out_json
+        mod.USER_NO = user_no
+        mod.SAVE_DEBUG_PNG = False
+        if hasattr(mod, "PARALLEL_WORKERS"):
+            mod.PARALLEL_WORKERS = 0  # 파일 단위로 이미 병렬 -> 페이지 병렬은 끔
+        # 헤더 컬럼 매핑 캐시(extract_transl)는 워커 프로세스에 남아서 다음 파일도 씀 -> 이 파일 몫만 기록
+        hc0 = mod.header_cache_stats() if hasattr(mod, "header_cache_stats") else None
+
+        with contextlib.redirect_stdout(log):
+            mod.main()
+
+        if hc0 is not None:
+            hc = mod.header_cache_stats()
+            res["header_cache"] = {"tables": hc["tables"] - hc0["tables"], "hits": hc["hits"] - hc0["hits"]}
+
+        with open(out_json, "r", encoding="utf-8") as f:
+            res["items"] = len(json.load(f))
+        res["ok"] = True
+    except Exception as e:
+        res["error"] = f"{type(e).__name__}: {e}"
+        log.write(traceback.format_exc())
+    finally:
+        res["seconds"] = round(time.perf_counter() - t0, 3)
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write(log.getvalue())
+    return res
+
+def _run_jobs(jobs: List[Tuple[str, str, str, str, str]], workers: int) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as ex:
+        futures = [ex.submit(run_one, *job) for job in jobs]
+        for i, fut in enumerate(futures):
+            try:
+                results[i] = fut.result()
+            except BrokenProcessPool:
+                results[i] = None  # 워커 프로세스 자체가 죽음 -> 아래에서 따로 재시도
+    return results
+
+def _failed_result(pdf_path: str, user_no: str, out_json, error: str) -> Dict[str, Any]:
+    return {
+        "file": pdf_path, "user_no": user_no, "out_json": out_json,
+        "ok": False, "items": None, "seconds": None, "error": error,
+    }
+
+def run_batch(module_name: str, pdfs: List[Path], manifest: Dict[str, str], out_dir: str, workers: int):
+    out = Path(out_dir)
+    (out / "logs").mkdir(parents=True, exist_ok=True)
+
+    resolved: List[Tuple[Path, str]] = []
+    skipped = []
+    for pdf in pdfs:
+        user_no = lookup_user_no(manifest, pdf)
+        if user_no is None:
+            skipped.append(str(pdf))
+            continue
+        resolved.append((pdf, user_no))
+
+    # 사람당 JSON 1개: 파일명/확장자 뺀 이름으로 찾으면 다른 폴더의 같은 이름 PDF도 같은 user_no가 됨
+    #   -> 같은 <user_no>.json/.log에 동시에 써서 한 사람 결과가 조용히 덮임
+    #   -> 그런 user_no는 하나도 실행 안 하고 전부 실패로 기록 (manifest에 경로로 적어야 구분됨)
+    files_by_user: Dict[str, List[str]] = {}
+    for pdf, user_no in resolved:
+        files_by_user.setdefault(user_no, []).append(str(pdf))
+
+    jobs = []
+    conflicts = []
+    for pdf, user_no in resolved:
+        files = files_by_user[user_no]
+        if len(files) > 1:
+            others = [f for f in files if f != str(pdf)]
+            conflicts.append(_failed_result(
+                str(pdf), user_no, None,
+                f"user_no '{user_no}' also matched by {others} -> use the PDF path as the manifest key"))
+            continue
+        jobs.append((
+            module_name,
+            str(pdf),
+            user_no,
+            str(out / f"{user_no}.json"),
+            str(out / "logs" / f"{user_no}.log"),
+        ))
+
+    results = _run_jobs(jobs, workers)
+
+    # 프로세스가 통째로 죽으면(세그폴트 등) 같은 풀의 나머지도 같이 실패하므로
+    # 해당 파일만 1개씩 새 프로세스에서 다시 돌려 범인만 실패로 남김
+    for i, res in enumerate(results):
+        if res is None:
+            retry = _run_jobs([jobs[i]], 1)[0]
+            if retry is None:
+                _, pdf_path, user_no, out_json, _ = jobs[i]
+                retry = _failed_result(pdf_path, user_no, out_json, "BrokenProcessPool: worker process crashed")
+            results[i] = retry
+
+    return results + conflicts, skipped
+
+# ============================================================
+# ✅ main
+# ============================================================
+def main():
+    global MODULE, INPUT, MANIFEST
+    if len(sys.argv) >= 2:
+        MODULE = sys.argv[1]
+    if len(sys.argv) >= 3:
+        INPUT = sys.argv[2]
+    if len(sys.argv) >= 4:
+        MANIFEST = sys.argv[3]
+
+    manifest = load_manifest(MANIFEST)
+    pdfs = list_input_pdfs(INPUT)
+    if not pdfs:
+        raise FileNotFoundError(f"no PDF found: {INPUT}")
+
+    t0 = time.perf_counter()
+    results, skipped = run_batch(MODULE, pdfs, manifest, OUT_DIR, WORKERS)
+    elapsed = time.perf_counter() - t0
+
+    failed = [r for r in results if not r["ok"]]
+    if not SKIP_UNMAPPED:
+        failed += [{"file": f, "user_no": None, "ok": False, "error": "not in manifest"} for f in skipped]
+
+    summary = {
+        "module": MODULE,
+        "input": INPUT,
+        "manifest": MANIFEST,
+        "workers": WORKERS,
+        "seconds": round(elapsed, 3),
+        "count_files": len(pdfs),
+        "count_ok": sum(1 for r in results if r["ok"]),
+        "count_failed": len(failed),
+        "count_unmapped": len(skipped),
+        "results": results,
+        "unmapped": skipped,
+    }
+    hcs = [r["header_cache"] for r in results if r.get("header_cache")]
+    if hcs:
+        hc_tables = sum(h["tables"] for h in hcs)
+        hc_hits = sum(h["hits"] for h in hcs)
+        summary["header_cache"] = {
+            "tables": hc_tables,
+            "hits": hc_hits,
+            "hit_rate": round(hc_hits / hc_tables, 4) if hc_tables else None,
+        }
+    summary_path = Path(OUT_DIR) / "_summary.json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"[OK] saved: {summary_path}")
+    print(f" - files: {len(pdfs)}  ok: {summary['count_ok']}  failed: {len(failed)}  unmapped: {len(skipped)}")
+    print(f" - elapsed: {elapsed:.2f}s  workers: {WORKERS}")
+    if summary.get("header_cache"):
+        hc = summary["header_cache"]
+        rate = f"{hc['hit_rate']:.1%}" if hc["hit_rate"] is not None else "-"
+        print(f" - header column map cache: hits={hc['hits']}/{hc['tables']} tables ({rate})")
+    for r in failed:
+        print(f"[FAIL] {r['file']} ({r.get('user_no')}): {r.get('error')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import io
+import os
+import sys
+import time
+import random
+import importlib
+import contextlib
+from pathlib import Path
+
+# ============================================================
+# ✅ 실행 설정 (여기만 바꾸면 됨)
+# ============================================================
+# 텍스트 레이어 추출기 벤치마크 (extract_main.py / extract_elect.py)
+#   python bench_extract.py
+#   python bench_extract.py extract_elect "C:/file/전기기술인협회/강대용(전기).pdf"
+#   python bench_extract.py cells      (셀 텍스트 단계만: 합성 페이지)
+#   python bench_extract.py header [pdf] (페이지 분류용 상단 헤더 읽기만)
+#   python bench_extract.py backend [module] [pdf] (텍스트 백엔드 pdfplumber vs pdfium: JSON 동일 여부 + 페이지당 시간)
+MODULE   = "extract_main"
+PDF_PATH = r"allfile/경력증명서_건설기술인협회_강국삼_OCR.pdf"
+REPEAT   = 1
+
+# 셀 텍스트 마이크로벤치(합성 페이지, A4 pt)
+SYNTH_WORDS = 2000
+SYNTH_CELLS = 120
+SYNTH_LOOPS = 50
+
+# 헤더 probe 벤치 상단 비율
+HEADER_TOP_RATIO = 0.20
+
+# ============================================================
+# ✅ before: 셀마다 page.extract_words()를 다시 돌리던 기존 방식
+# ============================================================
+def legacy_extract_text_in_bbox_strict(mod):
+    def _extract(page, bbox):
+        x0, y0, x1, y1 = mod._clamp_bbox_to_page(page, bbox)
+
+        words = page.extract_words(
+            keep_blank_chars=False,
+            use_text_flow=False
+        ) or []
+
+        picked = []
+        for w in words:
+            wx0, wx1 = w["x0"], w["x1"]
+            wy0, wy1 = w["top"], w["bottom"]
+            if (wx0 >= x0 and wx1 <= x1 and wy0 >= y0 and wy1 <= y1):
+                picked.append(w)
+
+        picked.sort(key=lambda d: (round(d["top"], 1), d["x0"]))
+        txt = " ".join([p["text"] for p in picked])
+        return mod.clean_text(txt)
+    return _extract
+
+def per_cell_extract_texts(extract_one):
+    # 셀마다 extract_one(page, bbox) 호출 (단일 스윕 배정 이전 방식)
+    def _extract_many(page, bboxes):
+        return {key: extract_one(page, bbox) for key, bbox in bboxes.items()}
+    return _extract_many
+
+# ============================================================
+# ✅ 1회 실행: main()을 그대로 돌리고 결과 JSON + 시간 반환
+# ============================================================
+def run_once(mod, out_json: str):
+    mod.PDF_PATH = PDF_PATH
+    mod.OUT_JSON = out_json
+    mod.SAVE_DEBUG_PNG = False
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        mod.main()
+    dt = time.perf_counter() - t0
+
+    return Path(out_json).read_bytes(), dt
+
+def count_pages(pdf_path: str) -> int:
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def bench(label: str, mod, out_json: str):
+    best = None
+    data = b""
+    for _ in range(max(1, REPEAT)):
+        data, dt = run_once(mod, out_json)
+        best = dt if best is None else min(best, dt)
+    Path(out_json).unlink(missing_ok=True)
+    return label, data, best
+
+# ============================================================
+# ✅ 셀 텍스트 단계 마이크로벤치: 기존 루프 vs python 격자 vs numpy
+# ============================================================
+def make_synthetic_page(n_words: int, n_cells: int, seed: int = 0):
+    rnd = random.Random(seed)
+    pw, ph = 595.0, 842.0
+
+    words = []
+    for i in range(n_words):
+        x = rnd.uniform(0, pw - 30)
+        y = rnd.uniform(0, ph - 10)
+        words.append({
+            "text": f"w{i}",
+            "x0": x, "x1": x + rnd.uniform(3, 30),
+            "top": y, "bottom": y + rnd.uniform(5, 9),
+        })
+
+    # 표처럼 행/열로 자른 셀 + 일부 겹치는 셀
+    cells = {}
+    cols = 12
+    rows = max(1, n_cells // cols)
+    cw, rh = pw / cols, ph / rows
+    for r in range(rows):
+        for c in range(cols):
+            cells[(r, c)] = (c * cw, r * rh, (c + 1) * cw + 8, (r + 1) * rh + 4)
+    return words, cells
+
+def loop_words_in_cells(words, cells):
+    # extract_text_in_bbox_strict를 셀마다 돌리던 방식(단어 재추출 비용 제외)
+    out = {}
+    for key, (x0, y0, x1, y1) in cells.items():
+        picked = [w for w in words
+                  if w["x0"] >= x0 and w["x1"] <= x1 and w["top"] >= y0 and w["bottom"] <= y1]
+        picked.sort(key=lambda d: (round(d["top"], 1), d["x0"]))
+        out[key] = picked
+    return out
+
+def bench_cells():
+    from pdf_cells import PageWordIndex, np
+
+    words, cells = make_synthetic_page(SYNTH_WORDS, SYNTH_CELLS)
+    idx = PageWordIndex(words)
+
+    runs = [("loop(cells x words)", lambda: loop_words_in_cells(words, cells)),
+            ("python(grid sweep)", lambda: idx.words_in_cells(cells, backend="python"))]
+    if np is not None:
+        runs.append(("numpy(broadcast)", lambda: idx.words_in_cells(cells, backend="numpy")))
+    else:
+        print("[BENCH] numpy not installed: numpy backend skipped")
+
+    print(f"[BENCH] synthetic page words={len(words)} cells={len(cells)} loops={SYNTH_LOOPS}")
+    base = None
+    for label, fn in runs:
+        res = fn()  # warm-up (numpy 배열 생성 포함)
+        t0 = time.perf_counter()
+        for _ in range(SYNTH_LOOPS):
+            res = fn()
+        dt = (time.perf_counter() - t0) / SYNTH_LOOPS
+        if base is None:
+            base = res
+        same = "same" if res == base else "DIFF"
+        print(f" - {label:24s} {dt * 1000:8.3f} ms/page  output={same}")
+        if res != base:
+            raise SystemExit("[BENCH] output mismatch")
+
+# ============================================================
+# ✅ 헤더 읽기 벤치: crop().extract_text() vs page.chars 상단 밴드 probe
+# ============================================================
+def bench_header():
+    import pdfplumber
+    from pdf_cells import header_band_key, normalize_header_key
+
+    def _crop_keys(pdf):
+        out = []
+        for p in pdf.pages:
+            top = p.crop((0, 0, p.width, p.height * HEADER_TOP_RATIO))
+            out.append(normalize_header_key(top.extract_text() or ""))
+        return out
+
+    def _probe_keys(pdf):
+        return [header_band_key(p, HEADER_TOP_RATIO) for p in pdf.pages]
+
+    # page.chars 파싱(pdfminer 해석)은 셀 추출과 공유되는 비용이라 따로 잼
+    with pdfplumber.open(PDF_PATH) as pdf:
+        t0 = time.perf_counter()
+        for p in pdf.pages:
+            p.chars
+        parse_dt = time.perf_counter() - t0
+
+        results = []
+        for label, fn in (("crop().extract_text()", _crop_keys), ("page.chars band probe", _probe_keys)):
+            best, keys = None, None
+            for _ in range(max(1, REPEAT)):
+                t0 = time.perf_counter()
+                keys = fn(pdf)
+                dt = time.perf_counter() - t0
+                best = dt if best is None else min(best, dt)
+            results.append((label, keys, best))
+
+    n_pages = len(results[0][1])
+    base = results[0][1]
+    print(f"[BENCH] header probe pdf={PDF_PATH} pages={n_pages} top_ratio={HEADER_TOP_RATIO}")
+    print(f" - {'parse(page.chars, shared)':24s} {parse_dt:8.3f}s")
+    for label, keys, dt in results:
+        diff = sum(1 for a, b in zip(keys, base) if a != b)
+        print(f" - {label:24s} {dt:8.3f}s  {dt / max(1, n_pages) * 100:8.3f}s/100pages  key_diff_pages={diff}")
+
+# ============================================================
+# ✅ 텍스트 백엔드 비교: pdfplumber(pdfminer) vs pdfium
+#   - 같은 JSON이 나와야 통과 (다르면 exit 1)
+# ============================================================
+def bench_backends(mod):
+    n_pages = count_pages(PDF_PATH)
+    backend_orig = mod.TEXT_BACKEND
+
+    results = []
+    try:
+        for backend in ("pdfplumber", "pdfium"):
+            mod.TEXT_BACKEND = backend
+            results.append(bench(backend, mod, f"_bench_{backend}.json"))
+    finally:
+        mod.TEXT_BACKEND = backend_orig
+
+    base = results[0][1]
+    print(f"[BENCH] text backend module={MODULE} pdf={PDF_PATH} pages={n_pages}")
+    for label, data, dt in results:
+        same = "same" if data == base else "DIFF"
+        print(f" - {label:12s} {dt:8.2f}s  {dt / max(1, n_pages) * 1000:8.1f} ms/page  output={same}")
+
+    if any(data != base for _, data, _ in results):
+        raise SystemExit("[BENCH] output mismatch: pdfium 백엔드 사용 불가(이 PDF)")
+
+def main():
+    global MODULE, PDF_PATH
+    if len(sys.argv) >= 2 and sys.argv[1] == "cells":
+        bench_cells()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "header":
+        if len(sys.argv) >= 3:
+            PDF_PATH = sys.argv[2]
+        bench_header()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "backend":
+        if len(sys.argv) >= 3:
+            MODULE = sys.argv[2]
+        if len(sys.argv) >= 4:
+            PDF_PATH = sys.argv[3]
+        if not Path(PDF_PATH).exists():
+            raise FileNotFoundError(f"PDF not found: {PDF_PATH}")
+        bench_backends(importlib.import_module(MODULE))
+        return
+
+    if len(sys.argv) >= 2:
+        MODULE = sys.argv[1]
+    if len(sys.argv) >= 3:
+        PDF_PATH = sys.argv[2]
+
+    if not Path(PDF_PATH).exists():
+        raise FileNotFoundError(f"PDF not found: {PDF_PATH}")
+
+    mod = importlib.import_module(MODULE)
+    n_pages = count_pages(PDF_PATH)
+
+    results = []
+    one_orig = mod.extract_text_in_bbox_strict
+    many_orig = mod.extract_texts_in_bboxes_strict
+
+    # before (셀마다 extract_words)
+    mod.extract_texts_in_bboxes_strict = per_cell_extract_texts(legacy_extract_text_in_bbox_strict(mod))
+    try:
+        results.append(bench("before(per-cell extract_words)", mod, "_bench_before.json"))
+    finally:
+        mod.extract_texts_in_bboxes_strict = many_orig
+
+    # 페이지 단어 인덱스 + 셀마다 bisect 조회
+    mod.extract_texts_in_bboxes_strict = per_cell_extract_texts(one_orig)
+    try:
+        results.append(bench("page word index(per-cell lookup)", mod, "_bench_index.json"))
+    finally:
+        mod.extract_texts_in_bboxes_strict = many_orig
+
+    # 현재: 페이지 단어 1회 스윕 셀 배정 (python / numpy)
+    backend_orig = mod.CELL_TEXT_BACKEND
+    try:
+        mod.CELL_TEXT_BACKEND = "python"
+        results.append(bench("single-pass cell assignment", mod, "_bench_assign.json"))
+        mod.CELL_TEXT_BACKEND = "numpy"
+        results.append(bench("numpy containment matrix", mod, "_bench_numpy.json"))
+    finally:
+        mod.CELL_TEXT_BACKEND = backend_orig
+
+    # 페이지 병렬 (extract_main.py만)
+    if hasattr(mod, "PARALLEL_WORKERS"):
+        workers_orig = mod.PARALLEL_WORKERS
+        try:
+            mod.PARALLEL_WORKERS = max(2, os.cpu_count() or 1)
+            results.append(bench(f"page-parallel({mod.PARALLEL_WORKERS} procs)", mod, "_bench_parallel.json"))
+        finally:
+            mod.PARALLEL_WORKERS = workers_orig
+
+    base = results[0][1]
+    print(f"[BENCH] module={MODULE} pdf={PDF_PATH} pages={n_pages}")
+    for label, data, dt in results:
+        same = "same" if data == base else "DIFF"
+        print(f" - {label:36s} {dt:8.2f}s  {n_pages / dt:8.2f} pages/sec  output={same}")
+
+    if any(data != base for _, data, _ in results):
+        raise SystemExit("[BENCH] output mismatch")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1597 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import resource
+import tempfile
+import subprocess
+import threading
+import importlib
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+
+from pypdf import PdfReader, PdfWriter
+
+# ============================================================
+# ✅ 실행 설정 (여기만 바꾸면 됨)
+# ============================================================
+# 로컬 가짜 CLOVA OCR 서버(지연 주입)로 분할 OCR 호출 방식 비교
+#   python bench_ocr.py
+#   python bench_ocr.py extract_sobang 95
+#   python bench_ocr.py split 200      (분할 방식: 디스크 파일 vs 메모리, 스캔형 PDF 기준 peak RSS/시간)
+#   python bench_ocr.py cache [module] (OCR 캐시: hit/miss, 같은 이름 다른 내용, 동시 쓰기, 용량 삭제)
+#   python bench_ocr.py pages [module] (페이지 캐시: 재발급본에서 추가/바뀐 페이지만 OCR 되는지)
+#   python bench_ocr.py fields [pages] (캐시 hit 경로: OCR JSON 파싱+dict 순회 vs 열 단위 fields mmap)
+#   python bench_ocr.py pick [pages]   (셀 field 선택: 전체 스캔 vs y 정렬 bisect 창, 등급/근무처/섹션 레이아웃 전부)
+#   python bench_ocr.py header [pages] (페이지 찾기: 찾을 때마다 상단 field 순회 vs 상단 밴드 텍스트표 1회)
+#   python bench_ocr.py twostage [pages] [module] (2단계 OCR: 요청/과금 페이지/시간 + 찾은 페이지 동일 여부)
+#   python bench_ocr.py raster [pages] [module]   (업로드 전 래스터화: 원본 컬러 스캔 vs 회색조 jpeg/png, 업로드 바이트/시간)
+#   python bench_ocr.py faults [module]           (적응형 chunk: 413/타임아웃 반분할, 429/5xx 재시도, 실패해도 끝난 chunk 유지, 바이트 상한)
+#   python bench_ocr.py stream [pages] [module]   (스트리밍 파싱: OCR 다 받고 파싱 vs chunk 오는 대로 파싱, JSON 동일 여부)
+#   python bench_ocr.py memory [module]           (응답/캐시 JSON 페이지 단위 읽기: 페이지 수별 peak RSS, 새 OCR + 캐시 hit)
+#   python bench_ocr.py tables [pages] [module]   (표 파싱: 판정/매핑마다 셀 재정규화+행마다 전체 셀 스캔 vs 표당 TableIndex 1번
+#                                                  + extract_transl 헤더 컬럼 매핑 캐시 off/on, hit rate)
+MODULE = "extract_main_withcloud"   # load_or_run_ocr가 있는 추출기
+PAGES  = 95                         # 가짜 PDF 페이지 수
+
+FAKE_LATENCY_SEC = 1.0              # 요청 1건당 기본 지연
+FAKE_JITTER_SEC  = 0.5              # 0~JITTER 랜덤 추가 지연 (완료 순서 뒤섞기)
+
+# 비교할 설정: (라벨, OCR_MAX_IN_FLIGHT, OCR_RATE_PER_SEC)
+VARIANTS = [
+    ("sequential(1 in-flight)", 1, 3.0),
+    ("concurrent(4 in-flight)", 4, 3.0),
+    ("concurrent(8 in-flight)", 8, 3.0),
+]
+
+# split 벤치: 스캔형 페이지(노이즈 JPEG) 크기, 가짜 서버 지연(분할 비용만 보이게 짧게)
+SCAN_PAGE_PX = (1240, 1754)
+SPLIT_LATENCY_SEC = 0.05
+
+# raster 벤치: 300 DPI 컬러 스캔 흉내, 가짜 서버 업로드 대역폭(공유 회선, bytes/sec)
+RASTER_SCAN_DPI = 300
+RASTER_UPLINK_BYTES_PER_SEC = 4_000_000
+# faults 벤치: 요청 타임아웃 / 멈춘 요청이 응답 없이 버티는 시간
+FAULT_TIMEOUT_SEC = 1.0
+FAULT_HANG_SEC = 1.5
+FAULT_PAGES = 40
+
+# stream 벤치: 키워드 페이지마다 표 STREAM_TABLES개 x 데이터 STREAM_ROWS행 (3페이지 중 2페이지가 키워드 페이지)
+STREAM_TABLES = 2
+STREAM_ROWS = 40
+
+RASTER_VARIANTS = [
+    ("original pdf", None),
+    ("gray jpeg 200dpi q80", {"dpi": 200, "format": "jpeg", "quality": 80}),
+    ("gray jpeg 150dpi q70", {"dpi": 150, "format": "jpeg", "quality": 70}),
+    ("gray png 200dpi", {"dpi": 200, "format": "png", "quality": 80}),
+]
+
+# ============================================================
+# ✅ 가짜 CLOVA OCR 서버
+#   - 업로드 파일명(_p011_to_020 / _p003_p007) 기준으로 페이지마다 image 1개 응답
+#   - inferText에 원본 페이지 번호를 넣어서 병합 순서 검증
+#   - echo_page_text=True: 업로드된 페이지의 텍스트 레이어를 inferText로 (페이지 캐시 끼워 넣기 검증)
+#   - image_fields(파일명, 바이트): PDF 아닌 업로드(2단계 OCR 상단 밴드 이미지) 응답 fields를 벤치가 만들어 줌
+#   - upload_bytes_per_sec > 0: 업로드를 공유 회선 하나로 흉내 (요청 본문 크기 / 대역폭 만큼 차례로 대기)
+#   - fault(페이지 목록) -> None | (status, headers): 오류 응답 주입, status 0이면 응답 없이 FAULT_HANG_SEC 멈춤(타임아웃)
+#   - page_json(페이지 번호) -> bytes: 페이지 image를 미리 직렬화한 JSON (표 있는 응답, 서버 CPU는 거의 안 씀)
+# ============================================================
+CHUNK_NAME_RE = re.compile(rb'filename="[^"]*_p(\d+)_to_(\d+)\.pdf"')
+CHUNK_PAGES_RE = re.compile(rb'filename="[^"]*?((?:_p\d{3,})+)\.pdf"')
+PDF_BYTES_RE = re.compile(rb"%PDF.*%%EOF", re.S)
+UPLOAD_NAME_RE = re.compile(rb'name="file"; filename="([^"]+)"')
+
+class FakeClovaHandler(BaseHTTPRequestHandler):
+    requests_log: List[float] = []
+    pages_log: List[int] = []
+    echo_page_text = False
+    image_fields = None
+    upload_bytes_per_sec = 0.0
+    bytes_log: List[int] = []
+    fault = None
+    faults_log: List[int] = []
+    page_json = None
+    lock = threading.Lock()
+    link_lock = threading.Lock()
+
+    def do_POST(self):
+        with self.lock:
+            self.requests_log.append(time.monotonic())
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        with self.lock:
+            self.bytes_log.append(len(body))
+        if self.upload_bytes_per_sec > 0:
+            with self.link_lock:
+                time.sleep(len(body) / self.upload_bytes_per_sec)
+        up = UPLOAD_NAME_RE.search(body)
+        if self.image_fields and up and not up.group(1).lower().endswith(b".pdf"):
+            with self.lock:
+                self.pages_log.append(0)  # 이미지 1장 = 과금 1건 (페이지 번호 0으로 표시)
+            time.sleep(FAKE_LATENCY_SEC + random.random() * FAKE_JITTER_SEC)
+            self._send_json({"images": [{"fields": self.image_fields(up.group(1).decode("utf-8"), body)}]})
+            return
+
+        m = CHUNK_NAME_RE.search(body)
+        m2 = CHUNK_PAGES_RE.search(body)
+        pdf = PDF_BYTES_RE.search(body)
+        if m:
+            pages = list(range(int(m.group(1)), int(m.group(2)) + 1))
+        elif m2:
+            pages = [int(x) for x in re.findall(rb"_p(\d+)", m2.group(1))]
+        else:
+            # 분할 안 한 단일 호출: 업로드된 PDF 페이지 수로 응답
+            pages = list(range(1, (len(PdfReader(io.BytesIO(pdf.group(0))).pages) if pdf else 1) + 1))
+
+        err = self.fault(pages) if self.fault else None
+        if err is not None:
+            status, headers = err
+            with self.lock:
+                self.faults_log.append(status)
+            if status == 0:
+                time.sleep(FAULT_HANG_SEC)
+                return
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.page_json:
+            with self.lock:
+                self.pages_log.extend(pages)
+            time.sleep(FAKE_LATENCY_SEC + random.random() * FAKE_JITTER_SEC)
+            self._send_raw(b'{"images":[' + b",".join(self.page_json(pno) for pno in pages) + b"]}")
+            return
+
+        texts = [f"page-{pno}" for pno in pages]
+        if self.echo_page_text and pdf:
+            texts = [(p.extract_text() or "").strip() for p in PdfReader(io.BytesIO(pdf.group(0))).pages]
+        with self.lock:
+            self.pages_log.extend(pages)
+
+        time.sleep(FAKE_LATENCY_SEC + random.random() * FAKE_JITTER_SEC)
+
+        images = [{
+            "convertedImageInfo": {"width": 1240, "height": 1754},
+            "fields": [{
+                "inferText": text,
+                "boundingPoly": {"vertices": [{"x": 10, "y": 10}, {"x": 100, "y": 10},
+                                              {"x": 100, "y": 40}, {"x": 10, "y": 40}]},
+            }],
+        } for text in texts]
+
+        self._send_json({"images": images})
+
+    def _send_json(self, obj):
+        self._send_raw(json.dumps(obj).encode("utf-8"))
+
+    def _send_raw(self, out: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        try:
+            self.wfile.write(out)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 먼저 끊음(타임아웃)
+
+    def log_message(self, *args):
+        pass
+
+def start_fake_server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FakeClovaHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}/ocr"
+
+def make_blank_pdf(path: Path, pages: int):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+def make_text_pdf(path: Path, labels: List[str]):
+    # 페이지마다 다른 텍스트 1줄 (페이지 지문/결과 위치 확인용)
+    from reportlab.pdfgen import canvas
+    c = canvas.Canvas(str(path), pagesize=(595, 842))
+    for label in labels:
+        c.drawString(72, 770, label)
+        c.showPage()
+    c.save()
+
+def make_scan_pdf(path: Path, pages: int):
+    # 스캔 PDF 흉내: 페이지마다 다른 노이즈 그레이 JPEG 1장
+    from PIL import Image
+    w, h = SCAN_PAGE_PX
+    first = None
+    rest = []
+    for i in range(pages):
+        im = Image.frombytes("L", (w // 4, h // 4), os.urandom((w // 4) * (h // 4))).resize((w, h))
+        if first is None:
+            first = im
+        else:
+            rest.append(im)
+    first.save(path, "PDF", resolution=150.0, save_all=True, append_images=rest)
+
+def make_color_scan_pdf(path: Path, pages: int, dpi: int = RASTER_SCAN_DPI, seed: int = 0):
+    # 컬러 스캔 흉내: 누런 종이 + 표 선 + 글자 줄 + 스캔 잡음, 페이지마다 JPEG(q90) 1장
+    from PIL import Image, ImageDraw, ImageFont
+    rnd = random.Random(seed)
+    w, h = int(595 / 72 * dpi), int(842 / 72 * dpi)
+    font = ImageFont.load_default(size=max(10, dpi // 8))
+    noise = Image.effect_noise((w, h), 12).convert("RGB")
+    ims = []
+    for i in range(pages):
+        im = Image.new("RGB", (w, h), (246, 242, 228))
+        d = ImageDraw.Draw(im)
+        d.text((w * 0.1, h * 0.06), f"career certificate page {i + 1}", fill=(20, 20, 60), font=font)
+        for r in range(28):
+            y = int(h * 0.15 + r * h * 0.028)
+            d.line((w * 0.06, y, w * 0.94, y), fill=(90, 90, 90), width=max(1, dpi // 100))
+            d.text((w * 0.08, y + 6), " ".join(f"{rnd.randrange(10**6):06d}" for _ in range(5)), fill=(30, 30, 30), font=font)
+        ims.append(Image.blend(im, noise, 0.06))
+    ims[0].save(path, "PDF", resolution=float(dpi), save_all=True, append_images=ims[1:], quality=90)
+
+def max_starts_per_window(starts: List[float], window: float = 1.0) -> int:
+    best, j = 0, 0
+    for i in range(len(starts)):
+        while starts[i] - starts[j] >= window:
+            j += 1
+        best = max(best, i - j + 1)
+    return best
+
+# ============================================================
+# ✅ split 벤치: 디스크 분할(예전 split_pdf_by_pages) vs 메모리 분할
+#   - peak RSS는 프로세스 단위라서 방식마다 새 프로세스에서 측정
+#   - 가짜 서버는 부모 프로세스에 둠 (업로드 본문 버퍼가 측정에 안 섞이게)
+# ============================================================
+def legacy_split_pdf_by_pages(pdf_path: str, pages_per_chunk: int = 10) -> List[str]:
+    reader = PdfReader(pdf_path)
+    total = len(reader.pages)
+
+    out_files = []
+    base = Path(pdf_path)
+    out_dir = base.parent / f"{base.stem}_chunks"
+    out_dir.mkdir(exist_ok=True)
+
+    for i in range(0, total, pages_per_chunk):
+        writer = PdfWriter()
+        for j in range(i, min(i + pages_per_chunk, total)):
+            writer.add_page(reader.pages[j])
+
+        out_path = out_dir / f"{base.stem}_p{i+1:03d}_to_{min(i+pages_per_chunk, total):03d}.pdf"
+        with open(out_path, "wb") as f:
+            writer.write(f)
+
+        out_files.append(str(out_path))
+
+    return out_files
+
+def peak_rss_mb() -> float:
+    # ru_maxrss는 exec 전 부모 값을 물려받을 수 있어서 /proc의 VmHWM 우선 (리눅스)
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def legacy_run_ocr_chunks(chunks: List[str], call, max_in_flight: int = 4) -> List[Dict[str, Any]]:
+    # 예전 clova_ocr.run_ocr_chunks (속도 제한 0일 때): chunk 순서대로 응답, 재시도/분할 없음
+    with ThreadPoolExecutor(max_workers=max(1, min(int(max_in_flight), len(chunks) or 1))) as ex:
+        return list(ex.map(call, chunks))
+
+def _split_child(variant: str, pdf_path: str, url: str):
+    mod = importlib.import_module(MODULE)
+    mod.CLOVA_OCR_API_URL = url
+    mod.CLOVA_OCR_SECRET = "fake"
+    mod.TWO_STAGE_OCR = False  # sobang/transl: 전체 OCR 경로만 (2단계는 twostage 벤치)
+    mod.USE_CACHE_IF_EXISTS = False
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if variant == "disk":
+            # 예전 load_or_run_ocr: 페이지 수 확인용 reader도 OCR 끝날 때까지 살아 있었음
+            reader = PdfReader(pdf_path)
+            total_pages = len(reader.pages)
+            paths = legacy_split_pdf_by_pages(pdf_path, pages_per_chunk=mod.PAGES_PER_CHUNK)
+            clova = {"images": []}
+            for res in legacy_run_ocr_chunks(paths, mod.call_clova_ocr_pdf, max_in_flight=mod.OCR_MAX_IN_FLIGHT):
+                clova["images"].extend(res.get("images") or [])
+            if len(clova["images"]) != total_pages:
+                raise SystemExit(f"[BENCH] disk split: images={len(clova['images'])} != pages={total_pages}")
+        else:
+            mod.OCR_RATE_PER_SEC = 0
+            clova = mod.load_or_run_ocr(pdf_path)
+    dt = time.perf_counter() - t0
+
+    print(json.dumps({
+        "seconds": dt,
+        "images": len(clova.get("images") or []),
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+def bench_split():
+    global FAKE_LATENCY_SEC, FAKE_JITTER_SEC
+    FAKE_LATENCY_SEC, FAKE_JITTER_SEC = SPLIT_LATENCY_SEC, 0.0
+
+    srv, url = start_fake_server()
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            pdf_path = Path(td) / "fake_scan.pdf"
+            make_scan_pdf(pdf_path, PAGES)
+            size_mb = pdf_path.stat().st_size / 1024 / 1024
+            print(f"[BENCH] split module={MODULE} pages={PAGES} pdf={size_mb:.1f}MB latency={SPLIT_LATENCY_SEC}s")
+
+            chunk_dir = Path(td) / "fake_scan_chunks"
+            for variant in ("disk", "memory"):
+                shutil.rmtree(chunk_dir, ignore_errors=True)
+                out = subprocess.run(
+                    [sys.executable, __file__, "split-child", variant, str(pdf_path), MODULE, url],
+                    capture_output=True, text=True, check=True,
+                ).stdout.strip().splitlines()[-1]
+                r = json.loads(out)
+                written = sum(f.stat().st_size for f in chunk_dir.glob("*.pdf")) / 1024 / 1024 if chunk_dir.exists() else 0.0
+                print(f" - {variant:8s} {r['seconds']:7.2f}s  peak_rss={r['peak_rss_mb']:8.1f}MB  "
+                      f"images={r['images']}  chunk_files_written={written:.1f}MB")
+    finally:
+        srv.shutdown()
+
+# ============================================================
+# ✅ cache 벤치: content-addressed OCR 캐시 동작 확인
+#   - 실패하면 SystemExit
+# ============================================================
+def _cache_writer(args):
+    cache_dir, key, n_images = args
+    from clova_ocr import save_ocr_cache
+    clova = {"images": [{"fields": [{"inferText": f"page-{i}"}]} for i in range(1, n_images + 1)]}
+    save_ocr_cache(cache_dir, key, clova)
+    return True
+
+def bench_cache():
+    from concurrent.futures import ProcessPoolExecutor
+    from clova_ocr import ocr_cache_key, load_ocr_cache, evict_ocr_cache, OCR_CACHE_SUFFIX
+
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.TWO_STAGE_OCR = False  # sobang/transl: 전체 OCR 경로만 (2단계는 twostage 벤치)
+            mod.USE_CACHE_IF_EXISTS = True
+            mod.OCR_CACHE_DIR = str(Path(td) / "cache")
+            mod.OCR_RATE_PER_SEC = 0
+
+            pdf_a = Path(td) / "a" / "홍길동.pdf"
+            pdf_b = Path(td) / "b" / "홍길동.pdf"   # 같은 파일명, 다른 내용
+            pdf_a.parent.mkdir()
+            pdf_b.parent.mkdir()
+            make_text_pdf(pdf_a, [f"a {i}" for i in range(PAGES)])
+            make_text_pdf(pdf_b, [f"b {i}" for i in range(PAGES + 1)])   # 페이지 캐시도 안 맞게 전부 다른 내용
+
+            def _run(pdf: Path):
+                FakeClovaHandler.requests_log = []
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    clova = mod.load_or_run_ocr(str(pdf))
+                return clova, len(FakeClovaHandler.requests_log), time.perf_counter() - t0
+
+            first, n1, dt1 = _run(pdf_a)
+            again, n2, dt2 = _run(pdf_a)
+            other, n3, _ = _run(pdf_b)
+
+            entries = list(Path(mod.OCR_CACHE_DIR).glob(f"*/*{OCR_CACHE_SUFFIX}"))
+            raw = len(json.dumps(first, ensure_ascii=False).encode("utf-8"))
+            gz = max(p.stat().st_size for p in entries)  # 파일 전체 항목
+            print(f"[BENCH] cache module={MODULE} pages={PAGES}")
+            print(f" - miss          {dt1:7.2f}s  requests={n1}")
+            print(f" - hit           {dt2:7.3f}s  requests={n2}  same={again == first}")
+            print(f" - same name, different PDF: requests={n3}  images={len(other['images'])}")
+            print(f" - entries={len(entries)} (file + page)  gzip {raw}B -> {gz}B")
+            if n2 != 0 or again != first or n3 == 0 or len(other["images"]) != PAGES + 1:
+                raise SystemExit("[BENCH] cache hit/miss mismatch")
+
+            # 여러 프로세스가 같은 키를 동시에 씀 -> 깨진 파일/남은 임시 파일 없어야 함
+            race_dir = str(Path(td) / "race")
+            key = ocr_cache_key(str(pdf_a), {"race": True})
+            with ProcessPoolExecutor(max_workers=4) as ex:
+                list(ex.map(_cache_writer, [(race_dir, key, 2000)] * 16))
+            data = load_ocr_cache(race_dir, key)
+            tmp_left = list(Path(race_dir).glob("*/*.tmp"))
+            print(f" - concurrent writers x16: readable={data is not None}  tmp_left={len(tmp_left)}")
+            if data is None or len(data["images"]) != 2000 or tmp_left:
+                raise SystemExit("[BENCH] concurrent write broke the cache")
+
+            # 용량 제한: 오래 안 쓴 것부터 삭제
+            evict_dir = str(Path(td) / "evict")
+            for i in range(20):
+                _cache_writer((evict_dir, f"{i:064x}", 3000))
+                p = next(Path(evict_dir).glob(f"*/{i:064x}{OCR_CACHE_SUFFIX}"))
+                os.utime(p, (1_000_000 + i, 1_000_000 + i))
+            one = next(Path(evict_dir).glob(f"*/*{OCR_CACHE_SUFFIX}")).stat().st_size
+            removed = evict_ocr_cache(evict_dir, max_mb=one * 5.5 / 1024 / 1024)
+            left = sorted(p.name[:64] for p in Path(evict_dir).glob(f"*/*{OCR_CACHE_SUFFIX}"))
+            expect = [f"{i:064x}" for i in range(15, 20)]
+            print(f" - size eviction: removed={removed}  kept_newest={left == expect}")
+            if left != expect:
+                raise SystemExit("[BENCH] size eviction kept the wrong entries")
+            removed = evict_ocr_cache(evict_dir, max_age_days=1)
+            print(f" - age eviction: removed={removed}")
+            if list(Path(evict_dir).glob(f"*/*{OCR_CACHE_SUFFIX}")):
+                raise SystemExit("[BENCH] age eviction left entries")
+    finally:
+        srv.shutdown()
+
+# ============================================================
+# ✅ pages 벤치: 페이지 단위 캐시
+#   - v1 OCR 후, 페이지 추가/교체/순서 변경한 재발급본 v2 -> 새 페이지만 서버로 가야 함
+# ============================================================
+def bench_page_cache():
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    FakeClovaHandler.echo_page_text = True
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.TWO_STAGE_OCR = False  # sobang/transl: 전체 OCR 경로만 (2단계는 twostage 벤치)
+            mod.USE_CACHE_IF_EXISTS = True
+            mod.OCR_CACHE_DIR = str(Path(td) / "cache")
+            mod.OCR_RATE_PER_SEC = 0
+
+            v1 = [f"career row {i}" for i in range(1, PAGES + 1)]
+            # 재발급: 앞쪽에 2장 끼워 넣고, 1장 내용 수정, 끝에 3장 추가
+            v2 = v1[:4] + ["new A", "new B"] + v1[4:]
+            v2[10] = v2[10] + " (revised)"
+            v2 += ["new C", "new D", "new E"]
+            new_pages = [i + 1 for i, t in enumerate(v2) if t not in v1]
+
+            def _run(labels: List[str], name: str):
+                pdf = Path(td) / name
+                make_text_pdf(pdf, labels)
+                FakeClovaHandler.requests_log = []
+                FakeClovaHandler.pages_log = []
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    clova = mod.load_or_run_ocr(str(pdf))
+                got = [img["fields"][0]["inferText"] for img in clova.get("images") or []]
+                return got, sorted(FakeClovaHandler.pages_log), len(FakeClovaHandler.requests_log), time.perf_counter() - t0
+
+            got1, sent1, req1, dt1 = _run(v1, "v1.pdf")
+            got2, sent2, req2, dt2 = _run(v2, "v2.pdf")
+
+            print(f"[BENCH] page cache module={MODULE} v1={len(v1)} pages, v2={len(v2)} pages")
+            print(f" - v1 (cold)    {dt1:7.2f}s  requests={req1}  pages_sent={len(sent1)}  order={'ok' if got1 == v1 else 'WRONG'}")
+            print(f" - v2 (reissue) {dt2:7.2f}s  requests={req2}  pages_sent={len(sent2)} {sent2}  order={'ok' if got2 == v2 else 'WRONG'}")
+            if got1 != v1 or got2 != v2:
+                raise SystemExit("[BENCH] spliced page order mismatch")
+            if sent2 != new_pages:
+                raise SystemExit(f"[BENCH] expected only {new_pages} to be OCR'd")
+    finally:
+        FakeClovaHandler.echo_page_text = False
+        srv.shutdown()
+
+# ============================================================
+# ✅ fields 벤치: 캐시 hit 때 다시 읽기 + 셀 텍스트 조회
+#   - before: OCR JSON(indent=2) json.load -> 셀마다 images[].fields[] 순회
+#   - fields, 호출마다 변환: ClovaFields mmap이지만 셀마다 정규화 -> PDF 좌표 변환 (user-015 방식)
+#   - after : ClovaFields mmap + 페이지 뷰(PDF 좌표 미리 변환) -> extract_text_in_bbox_from_clova 그대로
+# ============================================================
+FIELDS_PER_PAGE = 400
+CELLS_PER_PAGE = 60
+
+def make_fake_clova(pages: int, fields_per_page: int, seed: int = 0) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    words = ["기술경력", "2019.03.01", "~", "2021.12.31", "(120일)", "토목", "건축", "감리", "㈜대한건설", "도로공사", "100%", ""]
+    images = []
+    for p in range(pages):
+        w, h = 1654, 2339
+        fields = []
+        for _ in range(fields_per_page):
+            x, y = rnd.uniform(0, w - 80), rnd.uniform(0, h - 30)
+            fw, fh = rnd.uniform(20, 300), rnd.uniform(15, 40)
+            fields.append({
+                "valueType": "ALL",
+                "inferText": rnd.choice(words),
+                "inferConfidence": round(rnd.random(), 4),
+                "type": "NORMAL",
+                "lineBreak": rnd.random() < 0.2,
+                "boundingPoly": {"vertices": [{"x": x, "y": y}, {"x": x + fw, "y": y},
+                                              {"x": x + fw, "y": y + fh}, {"x": x, "y": y + fh}]},
+            })
+        img = {"uid": f"u{p}", "name": "career_pdf", "inferResult": "SUCCESS", "fields": fields}
+        if p % 9 != 4:  # 일부 페이지는 이미지 크기 없음 -> PDF 크기 fallback 경로
+            img["convertedImageInfo"] = {"width": w, "height": h, "pageIndex": p}
+        images.append(img)
+    return {"images": images}
+
+def legacy_extract_text_in_bbox_from_clova(mod):
+    # user-015 이전: 셀마다 images[i].fields 순회 + 필드마다 이미지 크기/좌표 변환
+    def _image_wh(img_obj, fw, fh):
+        for key in ("convertedImageInfo", "convertedImage", "imageInfo"):
+            if isinstance(img_obj.get(key), dict):
+                w, h = img_obj[key].get("width"), img_obj[key].get("height")
+                if w and h:
+                    return float(w), float(h)
+        w, h = img_obj.get("width"), img_obj.get("height")
+        if w and h:
+            return float(w), float(h)
+        return float(fw), float(fh)
+
+    def _extract(clova, page_index_0, page_pdf_w, page_pdf_h, bbox_pdf):
+        x0, y0, x1, y1 = bbox_pdf
+        images = clova.get("images") or []
+        if page_index_0 < 0 or page_index_0 >= len(images):
+            return ""
+        img_obj = images[page_index_0]
+        iw, ih = _image_wh(img_obj, page_pdf_w, page_pdf_h)
+        picked = []
+        for f in (img_obj.get("fields") or []):
+            txt = f.get("inferText", "")
+            if not txt:
+                continue
+            verts = (f.get("boundingPoly") or {}).get("vertices") or []
+            if verts:
+                xs = [v.get("x", 0) for v in verts]
+                ys = [v.get("y", 0) for v in verts]
+                fx0, fx1 = min(xs) / iw * page_pdf_w, max(xs) / iw * page_pdf_w
+                fy0, fy1 = min(ys) / ih * page_pdf_h, max(ys) / ih * page_pdf_h
+            else:
+                fx0 = fy0 = fx1 = fy1 = 0.0
+            if getattr(mod, "USE_CENTER_POINT_PICK", False):
+                cx, cy = (fx0 + fx1) / 2.0, (fy0 + fy1) / 2.0
+                if (x0 <= cx <= x1) and (y0 <= cy <= y1):
+                    picked.append((fy0, fx0, txt))
+            elif min(x1, fx1) > max(x0, fx0) and min(y1, fy1) > max(y0, fy0):
+                picked.append((fy0, fx0, txt))
+        picked.sort(key=lambda t: (round(t[0], 1), t[1]))
+        return mod.clean_text(" ".join(t[2] for t in picked))
+    return _extract
+
+def per_call_extract_text_in_bbox_from_fields(mod):
+    # 페이지 뷰 없이: 셀마다 page_fields를 돌며 PDF 좌표로 변환
+    def _extract(fields, page_index_0, page_pdf_w, page_pdf_h, bbox_pdf):
+        x0, y0, x1, y1 = bbox_pdf
+        if page_index_0 < 0 or page_index_0 >= len(fields):
+            return ""
+        picked = []
+        for nx0, ny0, nx1, ny1, txt in fields.page_fields(page_index_0, page_pdf_w, page_pdf_h):
+            fx0, fy0, fx1, fy1 = nx0 * page_pdf_w, ny0 * page_pdf_h, nx1 * page_pdf_w, ny1 * page_pdf_h
+            if getattr(mod, "USE_CENTER_POINT_PICK", False):
+                cx, cy = (fx0 + fx1) / 2.0, (fy0 + fy1) / 2.0
+                if (x0 <= cx <= x1) and (y0 <= cy <= y1):
+                    picked.append((fy0, fx0, txt))
+            elif min(x1, fx1) > max(x0, fx0) and min(y1, fy1) > max(y0, fy0):
+                picked.append((fy0, fx0, txt))
+        picked.sort(key=lambda t: (round(t[0], 1), t[1]))
+        return mod.clean_text(" ".join(t[2] for t in picked))
+    return _extract
+
+FIELDS_BROKEN_CASES = ("empty", "header only", "bad magic", "old version", "truncated columns", "truncated blob")
+
+def check_broken_fields_cache(td: Path) -> List[str]:
+    # 깨진/예전 버전 .fields 캐시 -> 예외 없이 지우고 다시 만들어야 함, 실패한 경우 이름 목록
+    from clova_ocr import ClovaFields, load_or_build_clova_fields, FIELDS_CACHE_SUFFIX
+
+    clova = make_fake_clova(2, 5)
+    good = ClovaFields.to_bytes(clova)
+    key = "fb" + "0" * 62
+    path = td / "fields_cache" / key[:2] / f"{key}{FIELDS_CACHE_SUFFIX}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    bad_version = good[:4] + (99).to_bytes(2, "little") + good[6:]  # header: magic(4) version(u16)
+    variants = dict(zip(FIELDS_BROKEN_CASES, (b"", b"CLVF\x01", b"XXXX" + good[4:], bad_version,
+                                              good[:len(good) // 2], good[:-1])))
+    failed = []
+    for name, data in variants.items():
+        path.write_bytes(data)
+        calls = []
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fields = load_or_build_clova_fields(str(td / "fields_cache"), key, lambda: calls.append(1) or clova)
+            with fields:
+                ok = calls == [1] and len(fields) == 2 and path.read_bytes() == good
+        except Exception as e:
+            ok = False
+            name = f"{name} ({type(e).__name__}: {e})"
+        if not ok:
+            failed.append(name)
+    return failed
+
+def bench_fields():
+    from clova_ocr import ClovaFields
+
+    mod = importlib.import_module(MODULE)
+    pw, ph = 595.0, 842.0
+    rnd = random.Random(1)
+    cells = []
+    for _ in range(CELLS_PER_PAGE):
+        x, y = rnd.uniform(0, pw - 120), rnd.uniform(0, ph - 40)
+        cells.append((x, y, x + rnd.uniform(30, 200), y + rnd.uniform(10, 40)))
+
+    with tempfile.TemporaryDirectory() as td:
+        clova = make_fake_clova(PAGES, FIELDS_PER_PAGE)
+        json_path = Path(td) / "cache.json"
+        json_path.write_text(json.dumps(clova, ensure_ascii=False, indent=2), encoding="utf-8")
+        fields_path = Path(td) / "cache.fields"
+        ClovaFields.from_clova(clova).save(str(fields_path))
+        del clova
+        sizes = (json_path.stat().st_size, fields_path.stat().st_size)
+
+        legacy = legacy_extract_text_in_bbox_from_clova(mod)
+        results = []
+        for label, load, extract in (
+            ("json + dict walk", lambda: json.loads(json_path.read_text(encoding="utf-8")), legacy),
+            ("fields, per-call", lambda: ClovaFields.open(str(fields_path)), per_call_extract_text_in_bbox_from_fields(mod)),
+            ("fields + page view", lambda: ClovaFields.open(str(fields_path)), mod.extract_text_in_bbox_from_clova),
+        ):
+            t0 = time.perf_counter()
+            data = load()
+            t_load = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            out = [extract(data, i0, pw, ph, bbox) for i0 in range(PAGES) for bbox in cells]
+            t_cells = time.perf_counter() - t0
+            results.append((label, t_load, t_cells, out))
+            del data
+
+        broken_failed = check_broken_fields_cache(Path(td))
+
+    print(f"[BENCH] fields module={MODULE} pages={PAGES} fields/page={FIELDS_PER_PAGE} cells/page={CELLS_PER_PAGE} "
+          f"center_pick={getattr(mod, 'USE_CENTER_POINT_PICK', False)}")
+    print(f" - file size: json(indent=2) {sizes[0] / 1024 / 1024:.1f}MB  fields {sizes[1] / 1024 / 1024:.1f}MB")
+    base = results[0][3]
+    for label, t_load, t_cells, out in results:
+        same = "same" if out == base else "DIFF"
+        print(f" - {label:18s} reload {t_load * 1000:8.1f} ms  cells {t_cells:7.2f}s  total {t_load + t_cells:7.2f}s  output={same}")
+    print(f" - broken cache rebuilt: {len(FIELDS_BROKEN_CASES) - len(broken_failed)}/{len(FIELDS_BROKEN_CASES)}"
+          + (f"  failed={broken_failed}" if broken_failed else ""))
+    if any(r[3] != base for r in results):
+        raise SystemExit("[BENCH] fields output mismatch")
+    if broken_failed:
+        raise SystemExit("[BENCH] broken fields cache not rebuilt")
+
+# ============================================================
+# ✅ pick 벤치: OcrPageView field 선택 (전체 스캔 vs bisect 창)
+#   - 1) 무작위 bbox(field 경계에 딱 붙은 것 포함)로 두 방식 결과 동일한지
+#   - 2) extract_main_withcloud main() 전체(등급/근무처/섹션 레이아웃) 시간 + JSON 동일 여부, 두 선택 규칙 모두
+# ============================================================
+PICK_FIELDS_PER_PAGE = 800
+PICK_FUZZ_BOXES = 3000
+
+def scan_pick_center(view, bbox):
+    x0, y0, x1, y1 = bbox
+    return [j for j in range(len(view)) if (x0 <= view.cx[j] <= x1) and (y0 <= view.cy[j] <= y1)]
+
+def scan_pick_overlap(view, bbox):
+    x0, y0, x1, y1 = bbox
+    return [j for j in range(len(view))
+            if min(x1, view.x1[j]) > max(x0, view.x0[j]) and min(y1, view.y1[j]) > max(y0, view.y0[j])]
+
+def make_scan_like_clova(pages: int, fields_per_page: int, seed: int = 0) -> Dict[str, Any]:
+    # 스캔 경력증명서 흉내: 상단 제목 + 표 줄 단위로 빽빽한 field
+    rnd = random.Random(seed)
+    titles = ["1. 기술경력", "2. 건설사업관리 및 감리경력", "경력사항", "근무처"]
+    words = ["2019.03.01", "~", "2021.12.31", "(120일)", "토목", "건축", "감리", "특급", "고급",
+             "㈜대한건설", "도로공사", "100%", "발주자", "설계", "시공", "1,234"]
+    w, h = 1654, 2339
+    images = []
+    for _ in range(pages):
+        fields = []
+        if rnd.random() < 0.6:
+            fields.append({"inferText": rnd.choice(titles), "boundingPoly": {"vertices": [
+                {"x": 200, "y": 120}, {"x": 700, "y": 120}, {"x": 700, "y": 170}, {"x": 200, "y": 170}]}})
+        rows = max(1, fields_per_page // 20)
+        for k in range(fields_per_page):
+            y = 250 + (k % rows) * (1950 / rows) + rnd.uniform(-4, 4)
+            x = rnd.uniform(20, w - 200)
+            fw, fh = rnd.uniform(30, 180), rnd.uniform(18, 34)
+            fields.append({"inferText": rnd.choice(words), "boundingPoly": {"vertices": [
+                {"x": x, "y": y}, {"x": x + fw, "y": y}, {"x": x + fw, "y": y + fh}, {"x": x, "y": y + fh}]}})
+        images.append({"convertedImageInfo": {"width": w, "height": h}, "fields": fields})
+    return {"images": images}
+
+def bench_pick():
+    from clova_ocr import ClovaFields, OcrPageView
+
+    clova = make_scan_like_clova(PAGES, PICK_FIELDS_PER_PAGE)
+    fields = ClovaFields.from_clova(clova)
+
+    # 1) fuzz
+    rnd = random.Random(2)
+    pw, ph = 595.0, 842.0
+    mismatch = 0
+    for _ in range(PICK_FUZZ_BOXES):
+        view = fields.page_view(rnd.randrange(PAGES), pw, ph)
+        if rnd.random() < 0.5 and len(view):
+            # field 중심/경계에 딱 맞춘 bbox (포함/미포함 경계 확인)
+            j, k = rnd.randrange(len(view)), rnd.randrange(len(view))
+            bbox = (min(view.cx[j], view.x1[k]), min(view.cy[j], view.y0[k]),
+                    max(view.cx[j], view.x1[k]), max(view.cy[j], view.y0[k]))
+        else:
+            x, y = rnd.uniform(-20, pw), rnd.uniform(-20, ph)
+            bbox = (x, y, x + rnd.uniform(0, 250), y + rnd.uniform(0, 60))
+        for fast, slow in ((view.pick_center, scan_pick_center), (view.pick_overlap, scan_pick_overlap)):
+            if sorted(fast(bbox)) != slow(view, bbox):
+                mismatch += 1
+    print(f"[BENCH] pick fuzz: boxes={PICK_FUZZ_BOXES} x 2 modes  mismatch={mismatch}")
+    if mismatch:
+        raise SystemExit("[BENCH] index pick differs from full scan")
+
+    # 2) main() 전체
+    mod = importlib.import_module("extract_main_withcloud")
+    center_orig = mod.USE_CENTER_POINT_PICK
+    fast_center, fast_overlap = OcrPageView.pick_center, OcrPageView.pick_overlap
+    with tempfile.TemporaryDirectory() as td:
+        pdf_path = Path(td) / "scan.pdf"
+        make_blank_pdf(pdf_path, PAGES)
+        mod.PDF_PATH = str(pdf_path)
+        mod.SAVE_DEBUG_PNG = False
+        mod.load_ocr_fields = lambda p: ClovaFields.from_clova(clova)  # 뷰 캐시 없이 매번 새로
+
+        print(f"[BENCH] pick main() pages={PAGES} fields/page={PICK_FIELDS_PER_PAGE}")
+        try:
+            for center in (True, False):
+                mod.USE_CENTER_POINT_PICK = center
+                outs = []
+                for label, pc, po in (("full scan", scan_pick_center, scan_pick_overlap),
+                                      ("bisect window", fast_center, fast_overlap)):
+                    OcrPageView.pick_center, OcrPageView.pick_overlap = pc, po
+                    mod.OUT_JSON = str(Path(td) / "out.json")
+                    t0 = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        mod.main()
+                    dt = time.perf_counter() - t0
+                    data = Path(mod.OUT_JSON).read_bytes()
+                    outs.append(data)
+                    same = "same" if data == outs[0] else "DIFF"
+                    print(f" - {'center' if center else 'overlap':7s} {label:14s} {dt:7.2f}s  "
+                          f"items={len(json.loads(data))}  output={same}")
+                if outs[0] != outs[1]:
+                    raise SystemExit("[BENCH] main() output mismatch")
+        finally:
+            OcrPageView.pick_center, OcrPageView.pick_overlap = fast_center, fast_overlap
+            mod.USE_CENTER_POINT_PICK = center_orig
+
+# ============================================================
+# ✅ header 벤치: 페이지 찾기 (찾는 함수마다 field 순회 vs HeaderBands 1회)
+#   - extract_main_withcloud: 등급/근무처 제외 판정 + 섹션 제목 2개 = 페이지당 상단 순회 4번 -> 1번
+#   - extract_sobang/transl: dict 기준(vertex 평균 y) 키워드 페이지, 비율 0.20/0.30 결과 동일 여부
+# ============================================================
+HEADER_LOOPS = 20
+
+def _fake_pdf(pages: int, w: float = 595.0, h: float = 842.0):
+    page = type("Page", (), {"width": w, "height": h})()
+    return type("Pdf", (), {"pages": [page] * pages})()
+
+def legacy_main_page_finders(mod, fields, pdf):
+    # 예전: 찾는 함수마다 페이지 상단 field를 다시 모음 (뷰 전체 cy 순회 + 매번 정규화)
+    def top_text(i0, r):
+        if i0 >= len(fields):
+            return ""
+        page = pdf.pages[i0]
+        view = fields.page_view(i0, page.width, page.height)
+        lim = page.height * r
+        return mod.clean_single_line(" ".join([t for t, cy in zip(view.texts, view.cy) if cy <= lim]))
+
+    def excluded(i0):
+        t = mod.normalize_ocr_key(top_text(i0, 0.20))
+        return any(mod.normalize_ocr_key(x) in t for x in mod.EXCLUDE_TITLES)
+
+    n = len(pdf.pages)
+    grade = [i for i in range(1, n + 1) if not excluded(i - 1)]
+    bigbox = [i for i in range(1, n + 1) if not excluded(i - 1)]
+    sections = [[i0 + 1 for i0 in range(n) if mod.normalize_ocr_key(t) in mod.normalize_ocr_key(top_text(i0, 0.20))]
+                for t in mod.SECTION_TITLES]
+    return grade, bigbox, sections
+
+def table_main_page_finders(mod, fields, pdf):
+    bands = mod.build_header_bands(fields, pdf)
+    grade = mod.find_grade_target_pages(bands, pdf)
+    bigbox = mod.find_bigbox_pages(bands, pdf)
+    sections = [mod.find_pages_for_title_clova(bands, pdf, t) for t in mod.SECTION_TITLES]
+    return grade, bigbox, sections
+
+def legacy_dict_find_pages(mod, clova, pdf, keyword, top_ratio):
+    key_norm = mod.normalize_ocr_key(keyword)
+    pages = []
+    images = clova.get("images") or []
+    for i0, page in enumerate(pdf.pages):
+        if i0 >= len(images):
+            break
+        img = images[i0]
+        img_h = mod._get_page_image_h(img, fallback_h=page.height)
+        top = []
+        for f in (img.get("fields") or []):
+            verts = (f.get("boundingPoly") or {}).get("vertices") or []
+            if not f.get("inferText", "") or not verts:
+                continue
+            if sum([v.get("y", 0) for v in verts]) / max(len(verts), 1) <= img_h * top_ratio:
+                top.append(f["inferText"])
+        if key_norm in mod.normalize_ocr_key(" ".join(top)):
+            pages.append(i0 + 1)
+    return pages
+
+def _time_loops(fn):
+    res = fn()
+    t0 = time.perf_counter()
+    for _ in range(HEADER_LOOPS):
+        res = fn()
+    return res, (time.perf_counter() - t0) / HEADER_LOOPS
+
+def bench_header():
+    from clova_ocr import ClovaFields
+
+    clova = make_scan_like_clova(PAGES, PICK_FIELDS_PER_PAGE)
+    pdf = _fake_pdf(PAGES)
+    print(f"[BENCH] header pages={PAGES} fields/page={PICK_FIELDS_PER_PAGE} loops={HEADER_LOOPS}")
+
+    # extract_main_withcloud (뷰는 셀 추출과 공유되므로 미리 만들어 두고 찾는 단계만 잼)
+    mod = importlib.import_module("extract_main_withcloud")
+    fields = ClovaFields.from_clova(clova)
+    for i0 in range(PAGES):
+        fields.page_view(i0, 595.0, 842.0)
+    a, dt_a = _time_loops(lambda: legacy_main_page_finders(mod, fields, pdf))
+    b, dt_b = _time_loops(lambda: table_main_page_finders(mod, fields, pdf))
+    print(f" - {'main per-finder walk':28s} {dt_a * 1000:8.2f} ms")
+    print(f" - {'main HeaderBands':28s} {dt_b * 1000:8.2f} ms  output={'same' if a == b else 'DIFF'}")
+    if a != b:
+        raise SystemExit("[BENCH] main page finders differ")
+
+    # extract_sobang / extract_transl (dict)
+    for name, fn_name in (("extract_sobang", "find_major_pages_top"), ("extract_transl", "find_pages_top_by_keyword")):
+        m = importlib.import_module(name)
+        for r in (0.20, 0.30):
+            a, dt_a = _time_loops(lambda: legacy_dict_find_pages(m, clova, pdf, "경력사항", r))
+            b, dt_b = _time_loops(lambda: getattr(m, fn_name)(m.build_header_bands(clova, pdf), "경력사항", r))
+            print(f" - {name:16s} r={r:.2f} walk {dt_a * 1000:7.2f} ms  bands {dt_b * 1000:7.2f} ms  "
+                  f"pages={len(b)}  output={'same' if a == b else 'DIFF'}")
+            if a != b:
+                raise SystemExit(f"[BENCH] {name} page finder differs")
+
+# ============================================================
+# ✅ twostage 벤치: 2단계 OCR (상단 밴드 분류 -> 해당 페이지만 표 OCR)
+#   - 경력 페이지가 가운데 몇 장 몰려 있는 긴 증명서 흉내
+#   - 1단계 이미지 응답은 벤치가 만듦: 칸마다 그 페이지 제목 field + 일부 페이지는 상단 경계 바로 아래에 키워드(걸러져야 함)
+#   - 전체 OCR과 찾은 페이지가 같아야 통과
+# ============================================================
+TWO_STAGE_KEYWORD = "careerhistory"   # 텍스트 PDF용 ASCII 키워드 (normalize_ocr_key 통과)
+
+def bench_twostage():
+    from clova_ocr import render_header_sheets
+
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    FakeClovaHandler.echo_page_text = True
+    attrs = {k: getattr(mod, k) for k in ("KEYWORD", "TWO_STAGE_OCR", "USE_CACHE_IF_EXISTS", "OCR_RATE_PER_SEC")}
+    finder = getattr(mod, "find_major_pages_top", None) or getattr(mod, "find_pages_top_by_keyword")
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.USE_CACHE_IF_EXISTS = False
+            mod.OCR_RATE_PER_SEC = 0
+            mod.KEYWORD = TWO_STAGE_KEYWORD
+
+            n_target = max(1, PAGES // 6)
+            first = PAGES // 3
+            labels = [f"{TWO_STAGE_KEYWORD} {i}" if first <= i < first + n_target else f"summary page {i}"
+                      for i in range(1, PAGES + 1)]
+            truth = [i for i in range(1, PAGES + 1) if first <= i < first + n_target]
+            decoys = {i for i in range(1, PAGES + 1, 7) if i not in truth}
+            pdf = Path(td) / "long.pdf"
+            make_text_pdf(pdf, labels)
+
+            sheets = {sh.name: sh for sh in render_header_sheets(
+                str(pdf), mod.TOP_RATIO, dpi=mod.HEADER_OCR_DPI, cols=mod.HEADER_OCR_COLS,
+                pages_per_sheet=mod.HEADER_OCR_PAGES_PER_SHEET)}
+
+            def _box(x, y, text):
+                return {"inferText": text, "boundingPoly": {"vertices": [
+                    {"x": x, "y": y}, {"x": x + 150, "y": y}, {"x": x + 150, "y": y + 20}, {"x": x, "y": y + 20}]}}
+
+            def _image_fields(name, _body):
+                fields = []
+                for pno, x, y, band_px in sheets[name].cells:
+                    fields.append(_box(x + 10, y + 10, labels[pno - 1]))
+                    if pno in decoys:  # 상단 ratio 경계 바로 아래(썸네일 여유 구간) -> 걸러져야 함
+                        fields.append(_box(x + 10, y + band_px + 2, TWO_STAGE_KEYWORD))
+                return fields
+
+            FakeClovaHandler.image_fields = staticmethod(_image_fields)
+
+            def _run(two_stage: bool):
+                mod.TWO_STAGE_OCR = two_stage
+                FakeClovaHandler.requests_log = []
+                FakeClovaHandler.pages_log = []
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    clova = mod.load_or_run_ocr(str(pdf))
+                dt = time.perf_counter() - t0
+                import pdfplumber
+                with pdfplumber.open(str(pdf)) as p:
+                    bands = mod.build_header_bands(clova, p, ratios=(*mod.HEADER_BAND_RATIOS, mod.TOP_RATIO))
+                found = finder(bands, mod.KEYWORD, mod.TOP_RATIO)
+                sent = FakeClovaHandler.pages_log
+                return found, len(FakeClovaHandler.requests_log), sum(1 for p in sent if p), sent.count(0), dt
+
+            print(f"[BENCH] two-stage OCR module={MODULE} pages={PAGES} target={truth[0]}~{truth[-1]} "
+                  f"decoys={len(decoys)} latency={FAKE_LATENCY_SEC}s")
+            outs = []
+            for label, two in (("full OCR", False), ("two-stage", True)):
+                found, n_req, n_pages, n_img, dt = _run(two)
+                outs.append(found)
+                print(f" - {label:10s} {dt:7.2f}s  requests={n_req:3d}  pdf_pages={n_pages:3d}  header_images={n_img}  "
+                      f"found={'ok' if found == truth else found}")
+            if outs[0] != truth or outs[1] != truth:
+                raise SystemExit("[BENCH] two-stage page selection differs from full OCR")
+    finally:
+        FakeClovaHandler.echo_page_text = False
+        FakeClovaHandler.image_fields = None
+        for k, v in attrs.items():
+            setattr(mod, k, v)
+        srv.shutdown()
+
+# ============================================================
+# ✅ raster 벤치: 업로드 전 래스터화 (원본 스캔 PDF vs 회색조 jpeg/png 재포장)
+#   - 업로드 바이트, load_or_run_ocr 전체 시간(렌더 + 업로드 + 응답), chunk 페이지 크기가 원본과 같은지
+# ============================================================
+def bench_raster():
+    import pdfplumber
+    from clova_ocr import split_pdf_chunks
+
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    attrs = {k: getattr(mod, k) for k in ("OCR_RASTER", "OCR_RASTER_DPI", "OCR_RASTER_FORMAT", "OCR_RASTER_QUALITY",
+                                          "USE_CACHE_IF_EXISTS", "OCR_RATE_PER_SEC")}
+    FakeClovaHandler.upload_bytes_per_sec = RASTER_UPLINK_BYTES_PER_SEC
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            pdf = Path(td) / "scan.pdf"
+            make_color_scan_pdf(pdf, PAGES)
+            with pdfplumber.open(str(pdf)) as p:
+                sizes = [(pg.width, pg.height) for pg in p.pages]
+
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.TWO_STAGE_OCR = False
+            mod.USE_CACHE_IF_EXISTS = False
+            mod.OCR_RATE_PER_SEC = 0
+
+            print(f"[BENCH] raster module={MODULE} pages={PAGES} file={pdf.stat().st_size / 1e6:.1f}MB "
+                  f"({RASTER_SCAN_DPI}dpi color) uplink={RASTER_UPLINK_BYTES_PER_SEC / 1e6:.1f}MB/s "
+                  f"latency={FAKE_LATENCY_SEC}s")
+            base = None
+            for label, raster in RASTER_VARIANTS:
+                mod.OCR_RASTER = raster is not None
+                if raster:
+                    mod.OCR_RASTER_DPI, mod.OCR_RASTER_FORMAT, mod.OCR_RASTER_QUALITY = \
+                        raster["dpi"], raster["format"], raster["quality"]
+                FakeClovaHandler.bytes_log = []
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    clova = mod.load_or_run_ocr(str(pdf))
+                dt = time.perf_counter() - t0
+                sent = sum(FakeClovaHandler.bytes_log)
+                base = base or sent
+
+                same_size = "-"
+                if raster:
+                    with pdfplumber.open(split_pdf_chunks(str(pdf), mod.PAGES_PER_CHUNK, raster=raster)[0].open()) as p:
+                        same_size = "same" if [(pg.width, pg.height) for pg in p.pages] == sizes[:len(p.pages)] else "DIFF"
+                print(f" - {label:22s} {dt:7.2f}s  uploaded={sent / 1e6:7.2f}MB ({sent / base * 100:5.1f}%)  "
+                      f"images={len(clova.get('images') or [])}  page_size={same_size}")
+                if same_size == "DIFF":
+                    raise SystemExit("[BENCH] rasterized page size differs from original")
+    finally:
+        FakeClovaHandler.upload_bytes_per_sec = 0.0
+        for k, v in attrs.items():
+            setattr(mod, k, v)
+        srv.shutdown()
+
+# ============================================================
+# ✅ faults 벤치: 적응형 chunk 전송 (chunk 10페이지 x 4)
+#   - p1~10 : 6페이지 이상 chunk는 응답 없음 -> 타임아웃 -> 반분할
+#   - p11~20: 4페이지 이상 chunk는 413 -> 반분할
+#   - p21~30: 처음 2번 503 -> backoff 재시도
+#   - p31~40: 처음 1번 429 (Retry-After) -> 재시도
+#   - 연결 타임아웃(ConnectTimeout): 나누지 않고 같은 chunk 재시도 (요청 수 그대로)
+#   - 끝까지 400 나는 chunk가 있어도 끝난 chunk는 페이지 캐시에 남고, 다시 돌리면 실패 구간만 OCR
+#   - 바이트 상한: chunk가 max 넘으면 보내기 전에 나눔 (요청당 페이지 수가 줄어드는지)
+# ============================================================
+def bench_faults():
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    attrs = {k: getattr(mod, k) for k in ("TWO_STAGE_OCR", "USE_CACHE_IF_EXISTS", "OCR_CACHE_DIR", "OCR_RATE_PER_SEC",
+                                          "OCR_TIMEOUT_SEC", "OCR_RETRY_BACKOFF_SEC", "OCR_CHUNK_MAX_MB", "PAGES_PER_CHUNK")
+             if hasattr(mod, k)}
+    FakeClovaHandler.echo_page_text = True
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.TWO_STAGE_OCR = False
+            mod.OCR_RATE_PER_SEC = 0
+            mod.PAGES_PER_CHUNK = 10
+            mod.OCR_TIMEOUT_SEC = FAULT_TIMEOUT_SEC
+            mod.OCR_RETRY_BACKOFF_SEC = 0.2
+            mod.OCR_CHUNK_MAX_MB = 0
+
+            labels = [f"career row {i}" for i in range(1, FAULT_PAGES + 1)]
+            pdf = Path(td) / "faults.pdf"
+            make_text_pdf(pdf, labels)
+            seen: Dict[Any, int] = {}
+
+            def _faults(pages):
+                key = tuple(pages)
+                with FakeClovaHandler.lock:
+                    seen[key] = seen.get(key, 0) + 1
+                    n = seen[key]
+                if pages[0] <= 10 and len(pages) >= 6:
+                    return 0, {}
+                if 11 <= pages[0] <= 20 and len(pages) >= 4:
+                    return 413, {}
+                if 21 <= pages[0] <= 30 and n <= 2:
+                    return 503, {}
+                if 31 <= pages[0] and n <= 1:
+                    return 429, {"Retry-After": "0.3"}
+                return None
+
+            def _run(fault, cache: bool):
+                FakeClovaHandler.fault = staticmethod(fault) if fault else None
+                FakeClovaHandler.requests_log = []
+                FakeClovaHandler.pages_log = []
+                FakeClovaHandler.faults_log = []
+                mod.USE_CACHE_IF_EXISTS = cache
+                mod.OCR_CACHE_DIR = str(Path(td) / "cache")
+                t0 = time.perf_counter()
+                clova, err = None, None
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        clova = mod.load_or_run_ocr(str(pdf))
+                except Exception as e:
+                    err = e
+                got = [img["fields"][0]["inferText"] for img in (clova or {}).get("images") or []]
+                return got, err, time.perf_counter() - t0
+
+            print(f"[BENCH] faults module={MODULE} pages={FAULT_PAGES} per_chunk=10 timeout={FAULT_TIMEOUT_SEC}s")
+            got, err, dt = _run(_faults, cache=False)
+            codes = sorted(FakeClovaHandler.faults_log)
+            ok = err is None and got == labels and sorted(FakeClovaHandler.pages_log) == list(range(1, FAULT_PAGES + 1))
+            print(f" - timeout/413/503/429  {dt:6.2f}s  requests={len(FakeClovaHandler.requests_log)}  "
+                  f"faults={ {c: codes.count(c) for c in sorted(set(codes))} }  "
+                  f"pages_billed={len(FakeClovaHandler.pages_log)}  order={'ok' if got == labels else 'WRONG'}")
+            if not ok:
+                raise SystemExit(f"[BENCH] adaptive OCR did not recover: {err}")
+
+            # 끝까지 실패(400)하는 chunk: 끝난 chunk는 페이지 캐시에 남는지
+            _, err, dt = _run(lambda pages: (400, {}) if 31 <= pages[0] else None, cache=True)
+            print(f" - permanent 400 p31~40 {dt:6.2f}s  raised={type(err).__name__ if err else None}  "
+                  f"pages_billed={len(FakeClovaHandler.pages_log)}")
+            got, err, dt = _run(None, cache=True)
+            resent = sorted(FakeClovaHandler.pages_log)
+            print(f" - rerun                {dt:6.2f}s  pages_sent={resent[0] if resent else '-'}~{resent[-1] if resent else '-'} "
+                  f"({len(resent)})  order={'ok' if got == labels else 'WRONG'}")
+            if err is not None or got != labels or resent != list(range(31, FAULT_PAGES + 1)):
+                raise SystemExit("[BENCH] rerun should OCR only the failed span")
+
+            # 연결 타임아웃: 서버까지 못 간 요청 -> chunk 크기와 무관, 나누면 안 됨
+            import requests
+            post = requests.post
+            refused = []
+
+            def _post_connect_timeout_once(*a, **kw):
+                with FakeClovaHandler.lock:
+                    first = len(refused) < FAULT_PAGES // 10
+                    if first:
+                        refused.append(1)
+                if first:
+                    raise requests.exceptions.ConnectTimeout("fake connect timeout")
+                return post(*a, **kw)
+
+            requests.post = _post_connect_timeout_once
+            try:
+                got, err, dt = _run(None, cache=False)
+            finally:
+                requests.post = post
+            n_req = len(FakeClovaHandler.requests_log)
+            print(f" - connect timeout x{len(refused)} {dt:6.2f}s  requests={n_req}  "
+                  f"pages_billed={len(FakeClovaHandler.pages_log)}  order={'ok' if got == labels else 'WRONG'}")
+            if err is not None or got != labels or n_req != FAULT_PAGES // 10:
+                raise SystemExit("[BENCH] connect timeout should retry the same chunk, not split it")
+
+            # 바이트 상한: 10페이지 chunk 크기의 1/3 -> chunk당 3페이지 안팎
+            from clova_ocr import split_pdf_chunks
+            per10 = len(split_pdf_chunks(str(pdf), 10)[0].open().getvalue())
+            mod.OCR_CHUNK_MAX_MB = per10 / 3 / (1024 * 1024)
+            got, err, dt = _run(None, cache=False)
+            print(f" - max_bytes={int(per10 / 3)}B     {dt:6.2f}s  requests={len(FakeClovaHandler.requests_log)}  "
+                  f"pages_billed={len(FakeClovaHandler.pages_log)}  order={'ok' if got == labels else 'WRONG'}")
+            if err is not None or got != labels:
+                raise SystemExit("[BENCH] byte-limited chunks mismatch")
+    finally:
+        FakeClovaHandler.echo_page_text = False
+        FakeClovaHandler.fault = None
+        for k, v in attrs.items():
+            setattr(mod, k, v)
+        srv.shutdown()
+
+# ============================================================
+# ✅ stream 벤치: OCR 다 받고 파싱(batch) vs chunk 오는 대로 파싱(stream)
+#   - 가짜 서버가 표 감지 응답(cellTextLines/cellWords)을 돌려줌 -> 추출기 main() 그대로
+#   - ocr only / parse only(batch - ocr) / batch / stream 시간 + JSON 바이트 동일 여부
+# ============================================================
+def _poly(x: int, y: int, w: int, h: int) -> Dict[str, Any]:
+    return {"vertices": [{"x": x, "y": y}, {"x": x + w, "y": y}, {"x": x + w, "y": y + h}, {"x": x, "y": y + h}]}
+
+def _cell(r: int, c: int, text: str, row_span: int = 1) -> Dict[str, Any]:
+    # 실제 표 감지 응답처럼 셀/줄/단어마다 boundingPoly + 신뢰도
+    x, y = 60 + c * 150, 200 + r * 30
+    words = [{"inferText": w, "inferConfidence": 0.9987, "boundingPoly": _poly(x + i * 40, y, 38, 24)}
+             for i, w in enumerate(text.split())]
+    return {"rowIndex": r, "columnIndex": c, "rowSpan": row_span, "columnSpan": 1,
+            "inferConfidence": 0.9991, "cellTextLines": [{"boundingPoly": _poly(x, y, 140, 26), "cellWords": words}],
+            "boundingPoly": _poly(x, y, 150, 30 * row_span)}
+
+def make_career_table_cells(module: str, rows: int, seed: int) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+
+    def _period():
+        y = rnd.randrange(2000, 2020)
+        return f"{y}.0{rnd.randrange(1, 10)}.1{rnd.randrange(0, 10)} ~ {y + 1}.1{rnd.randrange(0, 3)}.0{rnd.randrange(1, 10)} ({rnd.randrange(30, 900)}일)"
+
+    cells = []
+    if module == "extract_sobang":
+        for c, t in enumerate(["연번", "참여기간", "사업명 발주자 대상물규모", "주요용도", "직위", "담당업무", "업무분야", "구분"]):
+            cells.append(_cell(0, c, t, 2))
+        for i in range(rows):
+            r0 = 2 + i * 3
+            cells.append(_cell(r0, 0, str(i + 1), 3))
+            cells += [_cell(r0, 1, _period().split(" (")[0]), _cell(r0 + 1, 1, f"({rnd.randrange(30, 900)}일)")]
+            cells += [_cell(r0, 2, f"소방 설비 공사 {seed}-{i}"), _cell(r0 + 1, 2, "㈜대한건설"), _cell(r0 + 2, 2, "연면적 12,000㎡")]
+            cells += [_cell(r0, c, t, 3) for c, t in enumerate(["업무시설", "과장", "시공", "기계", "설계"], start=3)]
+    else:
+        for c, t in enumerate(["기 간", "근무처명", "직위 또는 직급", "담당업무", "참여사업명", "발주자"]):
+            cells.append(_cell(0, c, t))
+        for i in range(rows):
+            r = i + 1
+            cells += [_cell(r, c, t) for c, t in enumerate(
+                [_period(), f"㈜정보통신 {seed}", "대리", "통신 공사", f"통신망 구축 사업 {seed}-{i}", "한국전력공사"])]
+    return cells
+
+def make_stream_page_json(module: str, keyword: str, pno: int) -> bytes:
+    hit = pno % 3 != 0
+    fields = [{"inferText": keyword if hit else "부록",
+               "boundingPoly": {"vertices": [{"x": 100, "y": 60}, {"x": 400, "y": 60}, {"x": 400, "y": 100}, {"x": 100, "y": 100}]}}]
+    tables = [{"cells": make_career_table_cells(module, STREAM_ROWS, pno * 10 + t)} for t in range(STREAM_TABLES)] if hit else []
+    return json.dumps({"convertedImageInfo": {"width": 1240, "height": 1754}, "fields": fields, "tables": tables},
+                      ensure_ascii=False).encode("utf-8")
+
+def bench_stream():
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    attrs = {k: getattr(mod, k) for k in ("TWO_STAGE_OCR", "USE_CACHE_IF_EXISTS", "OCR_RATE_PER_SEC", "OCR_STREAM_PARSE",
+                                          "PDF_PATH", "OUT_JSON")}
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            pdf = Path(td) / "stream.pdf"
+            make_blank_pdf(pdf, PAGES)
+            pages_json = {pno: make_stream_page_json(MODULE, mod.KEYWORD, pno) for pno in range(1, PAGES + 1)}
+            FakeClovaHandler.page_json = staticmethod(pages_json.__getitem__)
+
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.TWO_STAGE_OCR = False
+            mod.USE_CACHE_IF_EXISTS = False
+            mod.OCR_RATE_PER_SEC = 0
+            mod.PDF_PATH = str(pdf)
+
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                mod.load_or_run_ocr(str(pdf))
+            ocr_dt = time.perf_counter() - t0
+
+            results = []
+            for label, stream in (("batch (ocr -> parse)", False), ("stream (parse per chunk)", True)):
+                mod.OCR_STREAM_PARSE = stream
+                mod.OUT_JSON = str(Path(td) / f"out_{stream}.json")
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    mod.main()
+                results.append((label, time.perf_counter() - t0, Path(mod.OUT_JSON).read_bytes()))
+
+            batch_dt = results[0][1]
+            parse_dt = max(0.0, batch_dt - ocr_dt)
+            base = results[0][2]
+            print(f"[BENCH] stream module={MODULE} pages={PAGES} tables/page={STREAM_TABLES} rows={STREAM_ROWS} "
+                  f"per_chunk={mod.PAGES_PER_CHUNK} in_flight={mod.OCR_MAX_IN_FLIGHT} latency={FAKE_LATENCY_SEC}s")
+            print(f" - ocr only                  {ocr_dt:7.2f}s")
+            print(f" - parse only (batch - ocr)  {parse_dt:7.2f}s   sum={ocr_dt + parse_dt:.2f}s  max={max(ocr_dt, parse_dt):.2f}s")
+            for label, dt, data in results:
+                print(f" - {label:25s} {dt:7.2f}s   items={len(json.loads(data))}  output={'same' if data == base else 'DIFF'}")
+            if any(data != base for _, _, data in results):
+                raise SystemExit("[BENCH] streaming output mismatch")
+    finally:
+        FakeClovaHandler.page_json = None
+        for k, v in attrs.items():
+            setattr(mod, k, v)
+        srv.shutdown()
+
+# ============================================================
+# ✅ memory 벤치: 표 감지 응답/캐시 JSON 읽기 peak RSS (페이지 수 늘려도 평평한지)
+#   - before: OCR 다 받고 파싱 + 응답 r.json() + 캐시 json.load (파일 전체 dict)
+#   - after : 스트리밍 파싱 + 응답/캐시를 images 원소 단위로 (페이지를 모아 두지 않음)
+#   - 변형마다 자식 프로세스(가짜 서버는 부모) -> 새 OCR(빈 캐시) / 캐시 hit 두 번, 출력 JSON 동일 여부
+# ============================================================
+MEMORY_PAGES = (60, 240)
+
+def legacy_post_clova_ocr(mod):
+    # user-023 이전 _post_clova_ocr: 응답 전체를 r.json()
+    import requests
+
+    def _post(file_name, f, image_format, table_detection):
+        req = {"version": "V2", "requestId": "bench", "timestamp": 0,
+               "enableTableDetection": table_detection, "images": [{"format": image_format, "name": "bench"}]}
+        r = requests.post(mod.CLOVA_OCR_API_URL, headers={"X-OCR-SECRET": mod.CLOVA_OCR_SECRET},
+                          data={"message": json.dumps(req)}, files={"file": (file_name, f)}, timeout=mod.OCR_TIMEOUT_SEC)
+        r.raise_for_status()
+        return r.json()
+    return _post
+
+def _memory_child(variant: str, pdf_path: str, url: str, cache_dir: str, out_json: str):
+    mod = importlib.import_module(MODULE)
+    mod.CLOVA_OCR_API_URL = url
+    mod.CLOVA_OCR_SECRET = "fake"
+    mod.TWO_STAGE_OCR = False
+    mod.USE_CACHE_IF_EXISTS = True
+    mod.OCR_CACHE_DIR = cache_dir
+    mod.OCR_RATE_PER_SEC = 0
+    mod.PDF_PATH = pdf_path
+    mod.OUT_JSON = out_json
+    mod.OCR_STREAM_PARSE = variant == "after"
+    if variant == "before":
+        mod._post_clova_ocr = legacy_post_clova_ocr(mod)
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as log:
+        mod.main()
+    print(json.dumps({"seconds": time.perf_counter() - t0, "peak_rss_mb": peak_rss_mb(),
+                      "cache_hit": "load cache" in log.getvalue()}))
+
+def bench_memory():
+    srv, url = start_fake_server()
+    mod = importlib.import_module(MODULE)
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            print(f"[BENCH] memory module={MODULE} tables/page={STREAM_TABLES} rows={STREAM_ROWS} latency={FAKE_LATENCY_SEC}s")
+            for pages in MEMORY_PAGES:
+                pdf = Path(td) / f"mem_{pages}.pdf"
+                make_text_pdf(pdf, [f"career page {i}" for i in range(1, pages + 1)])  # 페이지마다 내용 달라야 페이지 캐시 키가 다름
+                pages_json = {pno: make_stream_page_json(MODULE, mod.KEYWORD, pno) for pno in range(1, pages + 1)}
+                FakeClovaHandler.page_json = staticmethod(pages_json.__getitem__)
+                json_mb = sum(len(v) for v in pages_json.values()) / 1024 / 1024
+
+                base = None
+                for variant in ("before", "after"):
+                    cache_dir = Path(td) / f"cache_{variant}_{pages}"
+                    for run in ("fresh", "cache"):
+                        out_json = Path(td) / f"out_{variant}_{pages}_{run}.json"
+                        out = subprocess.run(
+                            [sys.executable, __file__, "memory-child", variant, str(pdf), MODULE, url,
+                             str(cache_dir), str(out_json)],
+                            capture_output=True, text=True, check=True,
+                        ).stdout.strip().splitlines()[-1]
+                        r = json.loads(out)
+                        data = out_json.read_bytes()
+                        base = base or data
+                        print(f" - pages={pages:4d} ({json_mb:5.1f}MB json)  {variant:6s} {run:5s} "
+                              f"{r['seconds']:6.2f}s  peak_rss={r['peak_rss_mb']:7.1f}MB  "
+                              f"cache_hit={r['cache_hit']!s:5s}  output={'same' if data == base else 'DIFF'}")
+                        if data != base:
+                            raise SystemExit("[BENCH] output mismatch")
+    finally:
+        FakeClovaHandler.page_json = None
+        srv.shutdown()
+
+# ============================================================
+# ✅ tables 벤치: 표 파싱(빈 표 판정 + 매핑)만, OCR 없이 메모리의 page JSON으로
+#   - before: 판정/매핑이 각자 셀 맵/정규화, 헤더 찾기는 행마다 셀 전체 스캔 (경력 표가 아니면 행 수 x 셀 수)
+#   - after : 표마다 TableIndex 1번 (추출기의 parse_page_tables 그대로)
+#   - 페이지마다 경력 표 + 헤더 없는 다른 표(교육/자격 등) 섞음
+# ============================================================
+TABLES_DECOY_ROWS = 30
+TABLES_REPEAT = 7
+
+def legacy_parse_page_tables(mod):
+    # user-024 이전 is_empty/parse (표마다 cells 리스트를 그대로 넘기던 방식)
+    clean, ns = mod.clean_single_line, mod.remove_all_spaces
+
+    def _cell_map(cells):
+        return {(c["rowIndex"], c["columnIndex"]): c for c in cells}
+
+    def _find_header(cells):
+        tokens = ["기간", "근무처", "근무처명", "직위", "직급", "직위또는직급", "담당업무", "참여사업", "참여사업명", "발주자"]
+        for r in sorted({c["rowIndex"] for c in cells}):
+            row_cells = [(c["columnIndex"], clean(c.get("text", ""))) for c in cells if c["rowIndex"] == r]
+            merged_ns = ns(" ".join([t for _, t in sorted(row_cells, key=lambda x: x[0])]))
+            if "기간" in merged_ns and sum(1 for tok in tokens if tok in merged_ns) >= 2:
+                cols = {}
+                for col, txt in row_cells:
+                    tns = ns(txt)
+                    if not tns:
+                        continue
+                    if tns == "기간":
+                        cols["기간"] = col
+                    elif "근무처" in tns:
+                        cols["근무처명"] = col
+                    elif "직위" in tns or "직급" in tns:
+                        cols["직위"] = col
+                    elif "담당업무" in tns:
+                        cols["담당업무"] = col
+                    elif "참여사업" in tns:
+                        cols["참여사업명"] = col
+                    elif "발주자" in tns:
+                        cols["발주자"] = col
+                if "기간" in cols and "근무처명" in cols:
+                    return r, cols
+        return None, None
+
+    def _txt(cell_map, r, col):
+        c = cell_map.get((r, col))
+        return clean(c["text"]) if c else ""
+
+    def _v(s):
+        return ns(clean(s)) or None
+
+    def _transl(cells):
+        if len([t for t in (ns(c.get("text", "")) for c in cells) if t]) < 8:
+            return None
+        header_row, cols = _find_header(cells)
+        if header_row is None or not cols or "기간" not in cols:
+            return None
+        data_rows = sorted({c["rowIndex"] for c in cells if c["rowIndex"] > header_row})
+        cm = _cell_map(cells)
+        if not any(ns(_txt(cm, r, cols["기간"])) for r in data_rows):
+            return None
+        header_row, cols = _find_header(cells)
+        cm = _cell_map(cells)
+        items = []
+        for r in sorted({c["rowIndex"] for c in cells}):
+            if r <= header_row:
+                continue
+            period = _txt(cm, r, cols.get("기간", -999))
+            if not ns(period):
+                continue
+            s_date, f_date, days = mod.parse_participation_period(period)
+            item = {"user_no": mod.USER_NO, "area_div": mod.AREA_DIV, "car_s_date": s_date, "car_f_date": f_date, "car_days": days}
+            for key, name in (("work_nm", "근무처명"), ("respon", "직위"), ("duty_job", "담당업무"),
+                              ("pjt_nm", "참여사업명"), ("order_nm", "발주자")):
+                item[key] = _v(_txt(cm, r, cols.get(name, -999)))
+            if item["car_s_date"] is not None:
+                items.append(item)
+        return items
+
+    def _sobang(cells):
+        if len([t for t in (ns(c.get("text", "")) for c in cells) if t]) < 10:
+            return None
+        if not any(c["columnIndex"] == 0 and ns(c.get("text", "")).isdigit() and c["rowIndex"] >= 2 for c in cells):
+            return None
+        cm = _cell_map(cells)
+        serials = sorted([c for c in cells if c["columnIndex"] == 0 and ns(c.get("text", "")).isdigit() and c["rowIndex"] >= 2],
+                         key=lambda x: x["rowIndex"])
+        items = []
+        for sc in serials:
+            r0 = sc["rowIndex"]
+            r_last = r0 + sc.get("rowSpan", 1) - 1
+            s_date, f_date, days = mod.parse_participation_period(" ".join([_txt(cm, r, 1) for r in range(r0, r_last + 1)]))
+            item = {"user_no": mod.USER_NO, "area_div": mod.AREA_DIV, "career_div": mod.CAREER_DIV_VALUE,
+                    "car_s_date": s_date, "car_f_date": f_date, "car_days": days,
+                    "pjt_nm": _v(_txt(cm, r0, 2)),
+                    "order_nm": _v(_txt(cm, r0 + 1, 2) if r0 + 1 <= r_last else ""),
+                    "con_detail": _v(_txt(cm, r0 + 2, 2) if r0 + 2 <= r_last else "")}
+            for key, col in (("con_type1", 3), ("respon", 4), ("duty_job", 5), ("duty_field", 6), ("fire_div", 7)):
+                item[key] = _v(_txt(cm, r0, col))
+            if item["car_s_date"] is not None:
+                items.append(item)
+        return items
+
+    parse_table = _sobang if mod.__name__ == "extract_sobang" else _transl
+
+    def _parse_page(pno, img):
+        out = []
+        for t in img.get("tables") or []:
+            raw_cells = t.get("cells") or []
+            if raw_cells:
+                out.extend(parse_table(mod.normalize_cells_for_mapping(raw_cells)) or [])
+        return out
+    return _parse_page
+
+def make_decoy_table_cells(rows: int, seed: int) -> List[Dict[str, Any]]:
+    # 헤더("기간" 등) 없는 다른 표: 예전 헤더 찾기가 행마다 셀 전체를 훑는 경우
+    cells = [_cell(0, c, t) for c, t in enumerate(["교육과정", "교육기관", "이수일", "시간", "비고", "확인"])]
+    for r in range(1, rows + 1):
+        cells += [_cell(r, c, f"{t} {seed}-{r}") for c, t in enumerate(["안전 교육", "협회", "2019.01.02", "16", "-", "O"])]
+    return cells
+
+def bench_tables():
+    mod = importlib.import_module(MODULE)
+    imgs = []
+    for pno in range(1, PAGES + 1):
+        tables = [{"cells": make_career_table_cells(MODULE, STREAM_ROWS, pno * 10 + t)} for t in range(STREAM_TABLES)]
+        tables.insert(1, {"cells": make_decoy_table_cells(TABLES_DECOY_ROWS, pno)})
+        imgs.append(json.loads(json.dumps({"tables": tables}, ensure_ascii=False)))
+    n_tables = sum(len(img["tables"]) for img in imgs)
+    n_cells = sum(len(t["cells"]) for img in imgs for t in img["tables"])
+
+    print(f"[BENCH] tables module={MODULE} pages={PAGES} tables={n_tables} cells={n_cells} "
+          f"(career rows={STREAM_ROWS}, decoy rows={TABLES_DECOY_ROWS})")
+    runs = [("before(per-call cell scan)", legacy_parse_page_tables(mod), None),
+            ("TableIndex(once per table)", mod.parse_page_tables, False)]
+    if hasattr(mod, "HEADER_CACHE"):
+        runs.append(("TableIndex + header cache", mod.parse_page_tables, True))
+
+    cache_orig = getattr(mod, "HEADER_CACHE", None)
+    base = None
+    try:
+        for label, parse, header_cache in runs:
+            if header_cache is not None:
+                mod.HEADER_CACHE = header_cache
+            best, items = None, None
+            for _ in range(TABLES_REPEAT):
+                if header_cache:
+                    mod._HEADER_SIG_CACHE.clear()  # 반복마다 빈 캐시에서 (첫 표는 miss)
+                    mod._HEADER_SIG_STATS.update(tables=0, hits=0)
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    items = [it for pno, img in enumerate(imgs, start=1) for it in parse(pno, img)]
+                dt = time.perf_counter() - t0
+                best = dt if best is None else min(best, dt)
+            base = base if base is not None else items
+            same = "same" if items == base else "DIFF"
+            extra = ""
+            if header_cache:
+                hc = mod.header_cache_stats()
+                extra = f"  hits={hc['hits']}/{hc['tables']} ({hc['hit_rate']:.1%}) signatures={hc['signatures']}"
+            print(f" - {label:28s} {best:7.3f}s  {best / n_tables * 1000:7.3f} ms/table  items={len(items)}  output={same}{extra}")
+            if items != base:
+                raise SystemExit("[BENCH] output mismatch")
+    finally:
+        if cache_orig is not None:
+            mod.HEADER_CACHE = cache_orig
+
+# ============================================================
+# ✅ main
+# ============================================================
+def main():
+    global MODULE, PAGES, FAKE_LATENCY_SEC
+    if len(sys.argv) >= 2 and sys.argv[1] == "split-child":
+        MODULE = sys.argv[4]
+        _split_child(sys.argv[2], sys.argv[3], sys.argv[5])
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "cache":
+        if len(sys.argv) >= 3:
+            MODULE = sys.argv[2]
+        FAKE_LATENCY_SEC = 0.2
+        bench_cache()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "fields":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 100
+        if len(sys.argv) >= 4:
+            MODULE = sys.argv[3]
+        bench_fields()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "pick":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 60
+        bench_pick()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "header":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 60
+        bench_header()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "twostage":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 120
+        MODULE = sys.argv[3] if len(sys.argv) >= 4 else "extract_transl"
+        FAKE_LATENCY_SEC = 0.5
+        bench_twostage()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "memory-child":
+        MODULE = sys.argv[4]
+        _memory_child(sys.argv[2], sys.argv[3], sys.argv[5], sys.argv[6], sys.argv[7])
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "tables":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 60
+        MODULE = sys.argv[3] if len(sys.argv) >= 4 else "extract_transl"
+        bench_tables()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "memory":
+        MODULE = sys.argv[2] if len(sys.argv) >= 3 else "extract_transl"
+        FAKE_LATENCY_SEC = 0.2
+        bench_memory()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "stream":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 120
+        MODULE = sys.argv[3] if len(sys.argv) >= 4 else "extract_transl"
+        FAKE_LATENCY_SEC = 0.5
+        bench_stream()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "faults":
+        if len(sys.argv) >= 3:
+            MODULE = sys.argv[2]
+        FAKE_LATENCY_SEC = 0.2
+        bench_faults()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "raster":
+        PAGES = int(sys.argv[2]) if len(sys.argv) >= 3 else 30
+        if len(sys.argv) >= 4:
+            MODULE = sys.argv[3]
+        FAKE_LATENCY_SEC = 0.5
+        bench_raster()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "pages":
+        if len(sys.argv) >= 3:
+            MODULE = sys.argv[2]
+        PAGES = 30
+        FAKE_LATENCY_SEC = 0.2
+        bench_page_cache()
+        return
+    if len(sys.argv) >= 2 and sys.argv[1] == "split":
+        if len(sys.argv) >= 3:
+            PAGES = int(sys.argv[2])
+        bench_split()
+        return
+
+    if len(sys.argv) >= 2:
+        MODULE = sys.argv[1]
+    if len(sys.argv) >= 3:
+        PAGES = int(sys.argv[2])
+
+    mod = importlib.import_module(MODULE)
+    srv, url = start_fake_server()
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            pdf_path = Path(td) / "fake_ocr.pdf"
+            make_blank_pdf(pdf_path, PAGES)
+
+            mod.CLOVA_OCR_API_URL = url
+            mod.CLOVA_OCR_SECRET = "fake"
+            mod.TWO_STAGE_OCR = False  # sobang/transl: 전체 OCR 경로만 (2단계는 twostage 벤치)
+            mod.USE_CACHE_IF_EXISTS = False
+
+            n_chunks = -(-PAGES // mod.PAGES_PER_CHUNK)
+            print(f"[BENCH] module={MODULE} pages={PAGES} chunks={n_chunks} "
+                  f"latency={FAKE_LATENCY_SEC}+rand({FAKE_JITTER_SEC})s")
+
+            for label, in_flight, rate in VARIANTS:
+                mod.OCR_MAX_IN_FLIGHT = in_flight
+                mod.OCR_RATE_PER_SEC = rate
+                FakeClovaHandler.requests_log = []
+
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    clova = mod.load_or_run_ocr(str(pdf_path))
+                dt = time.perf_counter() - t0
+
+                got = [img["fields"][0]["inferText"] for img in clova.get("images") or []]
+                expect = [f"page-{p}" for p in range(1, PAGES + 1)]
+                order = "ok" if got == expect else "WRONG"
+                peak = max_starts_per_window(sorted(FakeClovaHandler.requests_log))
+
+                print(f" - {label:26s} {dt:7.2f}s  page_order={order}  peak_starts/1s={peak}")
+                if got != expect:
+                    raise SystemExit("[BENCH] merged page order mismatch")
+    finally:
+        srv.shutdown()
+
+if __name__ == "__main__":
+    main()
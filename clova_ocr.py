@@ -0,0 +1,1506 @@
+import io
+import os
+import gzip
+import json
+import time
+import mmap
+import array
+import zlib
+import codecs
+import random
+import struct
+import hashlib
+import tempfile
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Tuple, Callable, Optional, Iterable, Iterator
+
+from pypdf import PdfReader, PdfWriter
+
+try:
+    import pypdfium2 as pdfium
+    from PIL import Image
+except ImportError:  # pdfium 없으면 2단계 OCR(상단 밴드 썸네일 분류) / 업로드 전 래스터화 사용 불가
+    pdfium = None
+    Image = None
+
+# pdfium은 스레드 안전하지 않음 -> 렌더는 한 번에 하나 (업로드는 그대로 동시에)
+_PDFIUM_LOCK = threading.Lock()
+
+# ============================================================
+# ✅ CLOVA OCR 공용 (extract_*_withcloud.py / extract_sobang.py / extract_transl.py)
+#   - 분할 chunk 동시 호출: 동시 요청 수 제한 + token bucket 속도 제한
+#   - 결과는 chunk(=페이지) 순서 그대로 돌려줌 -> _merge_clova_images에 그대로 넘김
+#   - PDF 분할은 메모리(BytesIO)에서, 업로드 직전에 chunk별로 생성
+#   - OCR 결과 캐시: PDF 내용 SHA-256 + 요청 옵션 기준 (파일명 무관, 추출기끼리 공유)
+#   - ClovaFields: fields만 열 단위 바이너리로 (mmap으로 바로 읽음, JSON 파싱 없음)
+#   - 2단계 OCR: 페이지 상단 밴드 썸네일로 먼저 분류 -> 필요한 페이지만 전체 OCR
+#   - 업로드 전 래스터화(선택): 페이지를 회색조 JPEG/무손실 이미지로 다시 싼 작은 PDF로 업로드
+#   - 적응형 chunk: 크기 초과/읽기 타임아웃이면 반으로 나눠 다시, 429/5xx/연결 타임아웃은 backoff 재시도
+#   - 스트리밍(선택): chunk 응답이 오는 대로 페이지를 넘겨줌 -> OCR 기다리는 동안 파싱, 결과는 reorder buffer로 페이지 순서
+#   - 응답/캐시 JSON은 images 원소(페이지) 단위로 조금씩 읽음 -> 전체 텍스트를 한 번에 안 올림
+# ============================================================
+class TokenBucket:
+    """
+    rate_per_sec: 초당 토큰 보충량 (<= 0 이면 제한 없음)
+    burst       : 한 번에 몰아서 쓸 수 있는 최대 토큰 수
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate = float(rate_per_sec or 0.0)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        # 토큰 1개 받을 때까지 대기, 실제로 기다린 시간(초) 반환
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                need = (1.0 - self.tokens) / self.rate
+            time.sleep(need)
+            waited += need
+
+# ============================================================
+# ✅ 적응형 chunk 전송
+#   - chunk는 페이지 수 + 바이트 둘 다로 제한: 만들어 보고 max_bytes 넘으면 보내기 전에 반으로
+#   - 413 / 응답 읽기 타임아웃 -> 그 chunk만 반으로 나눠 다시 (페이지 1장까지)
+#   - 429 / 5xx / 연결 끊김 / 연결 타임아웃 -> 같은 chunk를 지수 backoff(+jitter, Retry-After 우선)로 재시도
+#   - 끝난 chunk 결과는 그대로 둠: 최종 실패해도 끝난 페이지는 돌려줌 -> 페이지 캐시에 저장, 다음 실행은 실패 구간만
+# ============================================================
+OCR_SPLIT_STATUS = (413,)
+OCR_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+def ocr_error_action(e: BaseException) -> str:
+    """
+    "split": 요청이 너무 큼 / 응답이 너무 오래 걸림(ReadTimeout) -> chunk 반으로 나눠 다시
+    "retry": 일시 오류 (연결 타임아웃 포함) -> 같은 chunk 잠시 후 다시
+    "raise": 그 외 (인증, 요청 형식 등) -> 그대로 실패
+    requests 예외는 import 없이 모양으로 판단 (response.status_code / 클래스 이름)
+    """
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    if status in OCR_SPLIT_STATUS:
+        return "split"
+    if status in OCR_RETRY_STATUS:
+        return "retry"
+    if status is not None:
+        return "raise"
+    name = type(e).__name__
+    # ConnectTimeout은 ConnectionError이면서 Timeout -> 연결부터 먼저 봄
+    #   (연결이 안 열린 건 chunk 크기와 무관, 나누면 속도 제한에 걸리는 요청만 2배)
+    if isinstance(e, ConnectionError) or name in ("ConnectionError", "ConnectTimeout"):
+        return "retry"
+    if isinstance(e, TimeoutError) or name == "ReadTimeout":
+        return "split"
+    return "raise"
+
+def _retry_after_sec(e: BaseException) -> Optional[float]:
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+def run_ocr_chunks_adaptive(
+    chunks: List[Any],
+    send: Callable[[Any, Any], Dict[str, Any]],
+    max_in_flight: int = 4,
+    rate_per_sec: float = 0.0,
+    burst: int = 1,
+    max_bytes: int = 0,
+    max_retries: int = 3,
+    backoff_sec: float = 1.0,
+    on_started: Optional[Callable[[], None]] = None,
+    on_done: Optional[Callable[[List[int], Dict[str, Any]], None]] = None,
+) -> Tuple[List[Tuple[List[int], Dict[str, Any]]], Optional[BaseException]]:
+    """
+    chunks: .pages / .open() / .halves() 있는 chunk 목록 (PdfChunk 등), send(chunk, stream) -> clova 응답
+    반환  : ([(페이지 목록, 응답)] 페이지 순서, 최종 실패한 첫 예외 또는 None)
+      - 실패가 나면 아직 시작 안 한 chunk만 취소하고, 이미 보낸 chunk는 끝까지 받아서 같이 돌려줌
+      - on_done을 주면 응답은 on_done에만 넘기고 안 들고 있음 (반환 목록의 응답은 None)
+    on_started()          : 첫 chunk들을 보낸 직후, on_done(pages, 응답): chunk 끝날 때마다 (완료 순서)
+      - 둘 다 호출한 스레드에서 실행 (업로드/응답 대기는 작업 스레드) -> 여기서 파싱하면 네트워크와 겹침
+      - 콜백 예외도 OCR 실패처럼 처리 (남은 chunk 취소, 끝난 결과는 돌려줌 - 실패 뒤에 끝난 chunk도 on_done 호출)
+    동시 요청 슬롯은 응답을 on_done이 다 쓴 다음에 반납
+      - 파싱이 네트워크보다 느려도 메모리에 올라가는 응답은 max_in_flight개까지 (끝난 응답이 쌓이지 않음)
+    """
+    bucket = TokenBucket(rate_per_sec, burst)
+    slots = threading.Semaphore(max(1, int(max_in_flight)))
+
+    def _one(ch) -> Tuple[str, Optional[Dict[str, Any]]]:
+        slots.acquire()  # 반납은 호출한 스레드가 결과를 처리한 뒤
+        stream = ch.open()
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+        if max_bytes and size > max_bytes and len(ch.pages) > 1:
+            stream.close()
+            print(f"[OCR] chunk {ch.name}: {size}B > {max_bytes}B -> split")
+            return "split", None
+
+        attempt = 0
+        while True:
+            if stream is None:
+                stream = ch.open()  # 업로드하면서 닫힘 -> 재시도마다 다시 만듦
+            bucket.acquire()
+            t0 = time.perf_counter()
+            print(f"[OCR] chunk -> {ch}" + (f" (retry {attempt})" if attempt else ""))
+            try:
+                res = send(ch, stream)
+            except Exception as e:
+                stream = None
+                action = ocr_error_action(e)
+                if action == "split" and len(ch.pages) > 1:
+                    print(f"[WARN] chunk {ch.name}: {type(e).__name__} -> split")
+                    return "split", None
+                if action == "retry" and attempt < max_retries:
+                    wait_sec = _retry_after_sec(e)
+                    if wait_sec is None:
+                        wait_sec = backoff_sec * (2 ** attempt) * (0.5 + random.random())
+                    print(f"[WARN] chunk {ch.name}: {type(e).__name__} -> retry in {wait_sec:.1f}s")
+                    time.sleep(wait_sec)
+                    attempt += 1
+                    continue
+                raise
+            print(f"[OCR] chunk {ch.name} done ({time.perf_counter() - t0:.2f}s)")
+            return "done", res
+
+    done: List[Tuple[List[int], Dict[str, Any]]] = []
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=max(1, int(max_in_flight))) as ex:
+        pending = {ex.submit(_one, ch): ch for ch in chunks}
+
+        def _fail(e: BaseException, what: str):
+            nonlocal error
+            if error is None:
+                error = e
+                print(f"[WARN] OCR failed: {what} ({type(e).__name__}: {e}) -> cancel chunks not started")
+                for p in pending:
+                    p.cancel()
+
+        if on_started:
+            try:
+                on_started()
+            except Exception as e:
+                _fail(e, "on_started")
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in finished:
+                ch = pending.pop(f)
+                if f.cancelled():
+                    continue
+                try:
+                    kind, res = f.result()
+                except Exception as e:
+                    slots.release()
+                    _fail(e, f"pages {ch.pages[0]}~{ch.pages[-1]}")
+                    continue
+                if kind == "done":
+                    done.append((ch.pages, None if on_done else res))
+                    if on_done:
+                        # 실패 뒤에 끝난 chunk도 넘김 (받은 응답은 페이지 캐시에 남겨야 재실행 때 안 보냄)
+                        try:
+                            on_done(ch.pages, res)
+                        except Exception as e:
+                            _fail(e, f"on_done pages {ch.pages[0]}~{ch.pages[-1]}")
+                    res = None
+                elif error is None:
+                    for half in ch.halves():
+                        pending[ex.submit(_one, half)] = half
+                slots.release()
+
+    done.sort(key=lambda d: d[0][0])
+    return done, error
+
+# ============================================================
+# ✅ PDF 분할 (메모리)
+#   - chunk 내용은 업로드하는 스레드가 open() 할 때 만들어짐 -> 동시에 메모리에 올라가는 건 in-flight chunk뿐
+#   - save_dir를 주면(디버그) 예전처럼 <stem>_p001_to_010.pdf 파일로도 저장
+# ============================================================
+def count_pdf_pages(pdf_path: str) -> int:
+    # 파일 핸들로 열면 xref/페이지 트리만 읽음 (경로로 열면 파일 전체를 메모리로 읽음)
+    with open(pdf_path, "rb") as fh:
+        return len(PdfReader(fh).pages)
+
+class _PdfPageSource:
+    # PdfReader(경로)는 파일 전체를 메모리로 읽고 읽은 페이지도 계속 들고 있음
+    # -> chunk마다 파일 핸들로 새 reader를 열어서 그 chunk 페이지만 읽고 버림 (스레드 간 공유도 없음)
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.total = count_pdf_pages(pdf_path)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def write_pages(self, pages: List[int]) -> io.BytesIO:
+        buf = io.BytesIO()
+        with open(self.pdf_path, "rb") as fh:
+            reader = PdfReader(fh)
+            writer = PdfWriter()
+            for pno in pages:
+                writer.add_page(reader.pages[pno - 1])
+            writer.write(buf)
+        buf.seek(0)
+        return buf
+
+# ============================================================
+# ✅ 업로드 전 래스터화 (선택)
+#   - 300~600 DPI 컬러 스캔 원본 대신 pdfium으로 DPI 지정 회색조 렌더 -> JPEG(DCT) 또는 무손실(Flate, PNG와 같은 deflate)
+#   - 페이지마다 이미지 1장짜리 PDF 페이지로 다시 쌈 (CLOVA는 요청당 이미지 1장 -> chunk당 요청 1건 유지)
+#   - 페이지 크기(pt)는 원본 표시 크기 그대로 -> 응답 convertedImageInfo w/h로 정규화하는 기존 좌표 계산 그대로 맞음
+# ============================================================
+RASTER_FORMATS = ("jpeg", "png")
+
+def _encode_gray_page(im, fmt: str, quality: int) -> Tuple[str, bytes]:
+    if fmt == "jpeg":
+        buf = io.BytesIO()
+        im.save(buf, "JPEG", quality=int(quality), optimize=True)
+        return "DCTDecode", buf.getvalue()
+    return "FlateDecode", zlib.compress(im.tobytes(), 6)
+
+def _image_pages_pdf(pages: List[Tuple[float, float, int, int, str, bytes]]) -> bytes:
+    """
+    pages: [(page_w_pt, page_h_pt, img_w_px, img_h_px, filter, data), ...]
+    페이지 전체를 덮는 회색조 이미지 1장씩인 PDF (객체: 1 catalog, 2 pages, 페이지마다 page/content/image)
+    """
+    objs: List[bytes] = []
+    kids = " ".join(f"{3 + 3 * i} 0 R" for i in range(len(pages)))
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode("ascii"))
+    for i, (pw, ph, iw, ih, filt, data) in enumerate(pages):
+        content = f"q {pw:.4f} 0 0 {ph:.4f} 0 0 cm /Im0 Do Q".encode("ascii")
+        objs.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw:.4f} {ph:.4f}] "
+                     f"/Resources << /XObject << /Im0 {5 + 3 * i} 0 R >> >> /Contents {4 + 3 * i} 0 R >>").encode("ascii"))
+        objs.append(f"<< /Length {len(content)} >>\nstream\n".encode("ascii") + content + b"\nendstream")
+        objs.append((f"<< /Type /XObject /Subtype /Image /Width {iw} /Height {ih} /ColorSpace /DeviceGray "
+                     f"/BitsPerComponent 8 /Filter /{filt} /Length {len(data)} >>\nstream\n").encode("ascii")
+                    + data + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for num, body in enumerate(objs, start=1):
+        offsets.append(out.tell())
+        out.write(f"{num} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode("ascii"))
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode("ascii"))
+    out.write(f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+    return out.getvalue()
+
+class _RasterPageSource:
+    # _PdfPageSource와 같은 모양: write_pages(pages) -> 래스터화한 chunk PDF
+    def __init__(self, pdf_path: str, dpi: float = 200, fmt: str = "jpeg", quality: int = 80):
+        if pdfium is None:
+            raise RuntimeError("업로드 전 래스터화(OCR_RASTER)는 pypdfium2가 필요함. (pip install pypdfium2)")
+        if fmt not in RASTER_FORMATS:
+            raise ValueError(f"raster format must be one of {RASTER_FORMATS}: {fmt!r}")
+        self.pdf_path = pdf_path
+        self.total = count_pdf_pages(pdf_path)
+        self.scale = float(dpi) / 72.0
+        self.fmt = fmt
+        self.quality = quality
+
+    def __len__(self) -> int:
+        return self.total
+
+    def write_pages(self, pages: List[int]) -> io.BytesIO:
+        out = []
+        for pno in pages:
+            # 렌더만 잠그고 인코딩(JPEG/zlib)은 밖에서 -> 다른 chunk 렌더와 겹침
+            with _PDFIUM_LOCK:
+                doc = pdfium.PdfDocument(self.pdf_path)
+                try:
+                    page = doc[pno - 1]
+                    pw, ph = page.get_size()
+                    im = page.render(scale=self.scale, grayscale=True).to_pil().convert("L")
+                    page.close()
+                finally:
+                    doc.close()
+            filt, data = _encode_gray_page(im, self.fmt, self.quality)
+            out.append((pw, ph, im.width, im.height, filt, data))
+        return io.BytesIO(_image_pages_pdf(out))
+
+def _chunk_name(stem: str, pages: List[int]) -> str:
+    # 연속 구간: 예전 분할 파일명(<stem>_p011_to_020.pdf) / 건너뛴 페이지가 있으면 <stem>_p003_p007_p012.pdf
+    if pages == list(range(pages[0], pages[-1] + 1)):
+        return f"{stem}_p{pages[0]:03d}_to_{pages[-1]:03d}.pdf"
+    return f"{stem}_" + "_".join(f"p{pno:03d}" for pno in pages) + ".pdf"
+
+class PdfChunk:
+    """
+    원본 PDF의 pages(1-based, 오름차순) 페이지 묶음
+    name: 업로드 파일명
+    """
+
+    def __init__(self, source, name: str, pages: List[int]):
+        self._source = source
+        self.name = name
+        self.pages = pages
+
+    def open(self) -> io.BytesIO:
+        return self._source.write_pages(self.pages)
+
+    def halves(self) -> List["PdfChunk"]:
+        # 실패/크기 초과 chunk 반으로 (적응형 전송)
+        stem = Path(self._source.pdf_path).stem
+        mid = len(self.pages) // 2
+        return [PdfChunk(self._source, _chunk_name(stem, part), part)
+                for part in (self.pages[:mid], self.pages[mid:])]
+
+    def __str__(self) -> str:
+        return f"{self.name} (memory)"
+
+class _WholeFileChunk:
+    # 분할 안 한 원본 파일 그대로 (작은 PDF 한 번에) - 실패해서 나눌 때만 PdfChunk로
+    def __init__(self, pdf_path: str, pages: List[int]):
+        self.name = pdf_path
+        self.pages = pages
+
+    def open(self):
+        return open(self.name, "rb")
+
+    def halves(self) -> List[PdfChunk]:
+        return PdfChunk(_PdfPageSource(self.name), "", self.pages).halves()
+
+    def __str__(self) -> str:
+        return f"{Path(self.name).name} (file)"
+
+def split_pdf_chunks(pdf_path: str, pages_per_chunk: int = 10, save_dir: Optional[str] = None,
+                     pages: Optional[List[int]] = None, raster: Optional[Dict[str, Any]] = None) -> List[PdfChunk]:
+    """
+    pages : 이 페이지들만(1-based) 순서대로 묶음, None이면 전체
+    raster: {"dpi", "format", "quality"} 주면 원본 페이지 대신 래스터화한 페이지로 chunk 생성
+    """
+    if raster:
+        source = _RasterPageSource(pdf_path, dpi=raster["dpi"], fmt=raster["format"], quality=raster["quality"])
+    else:
+        source = _PdfPageSource(pdf_path)
+    if pages is None:
+        pages = list(range(1, len(source) + 1))
+    stem = Path(pdf_path).stem
+
+    chunks = []
+    for i in range(0, len(pages), pages_per_chunk):
+        part = pages[i:i + pages_per_chunk]
+        chunks.append(PdfChunk(source, _chunk_name(stem, part), part))
+
+    if save_dir:
+        out_dir = Path(save_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for ch in chunks:
+            (out_dir / ch.name).write_bytes(ch.open().getvalue())
+        print(f"[OCR] debug chunks saved: {out_dir}")
+
+    return chunks
+
+# ============================================================
+# ✅ JSON 조각 읽기: {"images": [페이지, 페이지, ...]} 를 페이지 하나씩
+#   - 소켓(iter_content) / gzip 캐시 파일을 조각(bytes)으로 받아서 images 원소를 하나 만들 때마다 돌려줌
+#   - 원소 하나는 json 표준 디코더(raw_decode)로 -> 속도는 json.loads와 같고, 메모리는 조각 + 원소 1개
+#   - 원소가 조각보다 크면 읽은 만큼 두 배씩 더 읽고 다시 디코드 (재시도 비용 합이 원소 크기의 몇 배 안쪽)
+# ============================================================
+JSON_READ_BYTES = 1 << 20
+_JSON_WS = " \t\n\r"
+_JSON_END = _JSON_WS + ",]}"
+_JSON_DECODER = json.JSONDecoder()
+
+class _JsonStream:
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._dec = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self, need: int = 1) -> bool:
+        # 적어도 need 글자 더 읽음 (읽은 만큼 앞부분은 버림), 더 없으면 False
+        parts = [self.buf[self.pos:]]
+        got = 0
+        while got < need and not self.eof:
+            b = next(self._chunks, None)
+            txt = self._dec.decode(b if b is not None else b"", final=b is None)
+            if b is None:
+                self.eof = True
+            parts.append(txt)
+            got += len(txt)
+        self.buf = "".join(parts)
+        self.pos = 0
+        return got > 0
+
+    def peek(self) -> str:
+        # 다음 공백 아닌 글자 (끝이면 "")
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _JSON_WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def take(self, allowed: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in allowed:
+            raise ValueError(f"JSON: expected one of {allowed!r}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _JSON_DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._more(max(len(self.buf) - self.pos, 1)):
+                    raise
+                continue
+            if (not self.eof and isinstance(obj, (int, float))
+                    and (end == len(self.buf) or self.buf[end] not in _JSON_END)):
+                # 숫자가 조각 끝에서 잘렸을 수 있음 ("12|3", "1.|5") -> 구분자까지 읽고 다시
+                self._more()
+                continue
+            self.pos = end
+            return obj
+
+def iter_json_items(chunks: Iterable[bytes], key: str = "images") -> Iterator[Any]:
+    """
+    chunks: JSON 객체 바이트 조각들, key 배열 원소를 하나씩 돌려줌 (다른 키 값은 읽고 버림)
+    """
+    js = _JsonStream(chunks)
+    js.take("{")
+    if js.peek() == "}":
+        return
+    while True:
+        k = js.value()
+        js.take(":")
+        if k == key and js.peek() == "[":
+            js.take("[")
+            if js.peek() == "]":
+                js.take("]")
+            else:
+                while True:
+                    yield js.value()
+                    if js.take(",]") == "]":
+                        break
+        else:
+            js.value()
+        if js.take(",}") == "}":
+            return
+
+def read_json_chunks(f, size: int = JSON_READ_BYTES) -> Iterator[bytes]:
+    return iter(lambda: f.read(size), b"")
+
+def load_clova_response(chunks: Iterable[bytes]) -> Dict[str, Any]:
+    # CLOVA 응답 -> {"images": [...]} (원문 bytes/str 사본 없이 페이지 단위로 바로 dict)
+    return {"images": list(iter_json_items(chunks, "images"))}
+
+# ============================================================
+# ✅ OCR 결과 캐시 (content-addressed)
+#   - 키: PDF 바이트 SHA-256 + OCR 옵션(enableTableDetection, chunk 크기 등)
+#     -> 파일명이 같아도 내용이 다르면 다른 키, 이름만 다른 같은 파일은 같은 키
+#   - <dir>/<키 앞 2자리>/<키>.json.gz (gzip)
+#   - 쓰기: 같은 폴더 임시 파일에 다 쓴 뒤 os.replace -> 동시에 여러 프로세스가 써도 반쯤 쓴 파일은 안 보임
+#   - 파일 mtime = 마지막 사용 시각(읽을 때 갱신) -> 나이/용량 기준 삭제에 같이 씀
+# ============================================================
+OCR_CACHE_SUFFIX = ".json.gz"
+FIELDS_CACHE_SUFFIX = ".fields"
+_CACHE_SUFFIXES = (OCR_CACHE_SUFFIX, FIELDS_CACHE_SUFFIX)
+_TMP_STALE_SEC = 3600  # 이보다 오래된 임시 파일은 죽은 writer가 남긴 것으로 보고 삭제
+
+def ocr_cache_key(pdf_path: str, options: Dict[str, Any]) -> str:
+    h = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(b"\0")
+    h.update(json.dumps(options, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+def _ocr_cache_path(cache_dir: str, key: str) -> Path:
+    return Path(cache_dir) / key[:2] / f"{key}{OCR_CACHE_SUFFIX}"
+
+def _unlink_quiet(p: Path) -> bool:
+    try:
+        p.unlink()
+        return True
+    except OSError:
+        return False  # 다른 프로세스가 먼저 지웠거나(윈도우) 열려 있음
+
+def load_ocr_cache(cache_dir: str, key: str, max_age_days: float = 0) -> Optional[Dict[str, Any]]:
+    p = _ocr_cache_path(cache_dir, key)
+    try:
+        if max_age_days > 0 and time.time() - p.stat().st_mtime > max_age_days * 86400:
+            return None
+        with gzip.open(p, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError) as e:
+        print(f"[WARN] broken OCR cache removed: {p} ({type(e).__name__})")
+        _unlink_quiet(p)
+        return None
+
+    try:
+        os.utime(p)
+    except OSError:
+        pass
+    return data
+
+def iter_ocr_cache_images(cache_dir: str, key: str, max_age_days: float = 0) -> Optional[Iterator[Dict[str, Any]]]:
+    """
+    파일 전체 캐시의 images를 한 장씩 (전체 JSON을 한 번에 안 읽음), 없으면 None
+    도중에 깨진 게 드러나면 파일을 지우고 예외 (이미 받은 페이지는 호출한 쪽이 처리)
+    """
+    p = _ocr_cache_path(cache_dir, key)
+    try:
+        if max_age_days > 0 and time.time() - p.stat().st_mtime > max_age_days * 86400:
+            return None
+        f = gzip.open(p, "rb")
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"[WARN] broken OCR cache removed: {p} ({type(e).__name__})")
+        _unlink_quiet(p)
+        return None
+
+    try:
+        os.utime(p)
+    except OSError:
+        pass
+
+    def _gen():
+        try:
+            with f:
+                yield from iter_json_items(read_json_chunks(f), "images")
+        except (OSError, EOFError, ValueError) as e:
+            print(f"[WARN] broken OCR cache removed: {p} ({type(e).__name__})")
+            _unlink_quiet(p)
+            raise
+    return _gen()
+
+def stream_ocr_cache(cache_dir: str, key: str, max_age_days: float,
+                     on_pages: Callable[[List[int], List[Dict[str, Any]]], None]) -> Tuple[bool, int]:
+    """
+    파일 전체 캐시 images를 한 장씩 on_pages([pno], [image])로 넘김 (스트리밍 파싱)
+    반환: (끝까지 넘겼는지, 넘긴 페이지 수) - 캐시 없으면 (False, 0), 도중에 깨졌으면 (False, 넘긴 수)
+    """
+    images = iter_ocr_cache_images(cache_dir, key, max_age_days)
+    if images is None:
+        return False, 0
+    print(f"[OCR] load cache (stream): {key[:12]} ({cache_dir})")
+    delivered = 0
+    while True:
+        try:
+            img = next(images)
+        except StopIteration:
+            return True, delivered
+        except (OSError, EOFError, ValueError):
+            return False, delivered
+        delivered += 1
+        on_pages([delivered], [img])
+
+def save_ocr_cache(cache_dir: str, key: str, clova: Dict[str, Any],
+                   max_mb: float = 0, max_age_days: float = 0) -> Path:
+    return _write_ocr_cache(cache_dir, key, lambda gz: gz.write(json.dumps(clova, ensure_ascii=False).encode("utf-8")),
+                            max_mb, max_age_days)
+
+def save_ocr_cache_images(cache_dir: str, key: str, images: Iterable[Dict[str, Any]],
+                          max_mb: float = 0, max_age_days: float = 0) -> Path:
+    # {"images": [...]} 를 페이지 하나씩 써 내려감 (save_ocr_cache(clova)와 같은 바이트)
+    def _write(gz):
+        gz.write(b'{"images": [')
+        for i, img in enumerate(images):
+            if i:
+                gz.write(b", ")
+            gz.write(json.dumps(img, ensure_ascii=False).encode("utf-8"))
+        gz.write(b"]}")
+    return _write_ocr_cache(cache_dir, key, _write, max_mb, max_age_days)
+
+def _write_ocr_cache(cache_dir: str, key: str, write: Callable[[Any], None],
+                     max_mb: float = 0, max_age_days: float = 0) -> Path:
+    p = _ocr_cache_path(cache_dir, key)
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=str(p.parent), prefix=f".{key[:12]}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as gz:
+                write(gz)
+        try:
+            os.replace(tmp, p)
+        except PermissionError:
+            # 윈도우: 다른 프로세스가 같은 키 파일을 읽는 중 -> 내용이 같으니 그쪽 것 사용
+            _unlink_quiet(Path(tmp))
+    except BaseException:
+        _unlink_quiet(Path(tmp))
+        raise
+
+    if max_mb > 0 or max_age_days > 0:
+        evict_ocr_cache(cache_dir, max_mb=max_mb, max_age_days=max_age_days)
+    return p
+
+def evict_ocr_cache(cache_dir: str, max_mb: float = 0, max_age_days: float = 0) -> int:
+    """
+    max_age_days: 마지막 사용 후 이 기간 지난 항목 삭제 (<= 0 이면 안 봄)
+    max_mb      : 전체 크기가 넘으면 오래 안 쓴 것부터 삭제 (<= 0 이면 안 봄)
+    return      : 삭제한 항목 수
+    """
+    root = Path(cache_dir)
+    if not root.exists():
+        return 0
+
+    now = time.time()
+    removed = 0
+    entries = []
+    for p in root.glob("*/*"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if p.name.endswith(".tmp"):
+            if now - st.st_mtime > _TMP_STALE_SEC:
+                _unlink_quiet(p)
+            continue
+        if not p.name.endswith(_CACHE_SUFFIXES):
+            continue
+        if max_age_days > 0 and now - st.st_mtime > max_age_days * 86400:
+            removed += _unlink_quiet(p)
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+
+    if max_mb > 0:
+        total = sum(size for _, size, _ in entries)
+        limit = max_mb * 1024 * 1024
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= limit:
+                break
+            if _unlink_quiet(p):
+                removed += 1
+                total -= size
+
+    return removed
+
+# ============================================================
+# ✅ 페이지 단위 OCR 캐시
+#   - 페이지 지문: 페이지 객체 트리(내용 스트림 + 이미지/폰트 등 리소스 원본 바이트) SHA-256
+#     -> 스캔 PDF는 페이지마다 내용 스트림이 같고(이미지 1장 그리기) 이미지만 다르므로 리소스까지 봐야 함
+#   - 키: 페이지 지문 + OCR 옵션 -> 재발급 PDF에서 페이지가 추가/삭제/이동돼도 같은 페이지는 hit
+#   - 캐시에 없는 페이지만 모아서 chunk로 OCR -> 결과를 원래 페이지 위치에 끼워 넣음
+# ============================================================
+_FP_SKIP_KEYS = ("/Parent", "/StructParents")  # 페이지 트리 위치/문서 구조 -> 같은 페이지라도 파일마다 다름
+
+def _hash_pdf_object(h, obj, seen: set):
+    if hasattr(obj, "idnum"):  # IndirectObject
+        ref = (obj.idnum, obj.generation)
+        if ref in seen:
+            h.update(b"R")
+            return
+        seen.add(ref)
+        obj = obj.get_object()
+
+    data = getattr(obj, "_data", None)
+    if isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj.keys()):
+            if k in _FP_SKIP_KEYS:
+                continue
+            h.update(str(k).encode("utf-8"))
+            _hash_pdf_object(h, obj.raw_get(k) if hasattr(obj, "raw_get") else obj[k], seen)
+        if isinstance(data, bytes):  # stream: 필터 적용된 원본 바이트 그대로 (디코딩 안 함)
+            h.update(b"S%d:" % len(data))
+            h.update(data)
+        h.update(b"}")
+    elif isinstance(obj, list):
+        h.update(b"[")
+        for v in obj:
+            _hash_pdf_object(h, v, seen)
+        h.update(b"]")
+    else:
+        h.update(repr(obj).encode("utf-8"))
+        h.update(b";")
+
+def page_fingerprints(pdf_path: str) -> List[str]:
+    out = []
+    with open(pdf_path, "rb") as fh:
+        reader = PdfReader(fh)
+        for page in reader.pages:
+            h = hashlib.sha256()
+            # 상속 속성(/Rotate, /MediaBox)은 페이지 dict에 없을 수 있어서 따로 넣음
+            h.update(f"rot={page.rotation};box={[float(v) for v in page.mediabox]};".encode("ascii"))
+            _hash_pdf_object(h, page, set())
+            out.append(h.hexdigest())
+    return out
+
+def _page_cache_key(fingerprint: str, options: Dict[str, Any]) -> str:
+    h = hashlib.sha256(b"page\0" + fingerprint.encode("ascii") + b"\0")
+    h.update(json.dumps(options, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+def _replay_page_cache(cache_dir: str, keys: List[Optional[str]]) -> Iterator[Dict[str, Any]]:
+    # 페이지 순서대로 페이지 캐시를 한 장씩 다시 읽음 (키 None = 건너뛴 페이지 {})
+    for pno, key in enumerate(keys, start=1):
+        if key is None:
+            yield {}
+            continue
+        hit = load_ocr_cache(cache_dir, key)
+        if hit is None or not isinstance(hit.get("image"), dict):
+            raise RuntimeError(f"page cache entry vanished: page {pno}")
+        yield hit["image"]
+
+def run_ocr_with_page_cache(
+    pdf_path: str,
+    call: Callable[..., Dict[str, Any]],
+    merge: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+    options: Dict[str, Any],
+    cache_dir: Optional[str],
+    pages_per_chunk: int = 10,
+    max_in_flight: int = 4,
+    rate_per_sec: float = 0.0,
+    burst: int = 1,
+    save_dir: Optional[str] = None,
+    max_mb: float = 0,
+    max_age_days: float = 0,
+    pages: Optional[List[int]] = None,
+    raster: Optional[Dict[str, Any]] = None,
+    max_chunk_bytes: int = 0,
+    max_retries: int = 3,
+    backoff_sec: float = 1.0,
+    on_pages: Optional[Callable[[List[int], List[Dict[str, Any]]], None]] = None,
+    keep_images: bool = True,
+) -> Dict[str, Any]:
+    """
+    call(name, stream=None) -> clova 응답 (stream 없으면 name 파일 그대로 업로드)
+    merge(chunk 응답 목록)  -> {"images": [...]} (추출기의 _merge_clova_images)
+    cache_dir None이면 페이지 캐시 없이 전체 OCR (예전 동작)
+    pages : OCR할 페이지(1-based)만 지정 (2단계 OCR), 나머지 페이지는 빈 image {} 로 채움
+    raster: {"dpi", "format", "quality"} 주면 원본 대신 래스터화한 chunk 업로드 (options에도 넣어야 캐시가 안 섞임)
+    max_chunk_bytes / max_retries / backoff_sec: 적응형 chunk 전송 (run_ocr_chunks_adaptive)
+    on_pages(페이지 목록, image 목록): 주면 페이지가 준비되는 대로 넘겨줌 (스트리밍 파싱)
+      - 캐시 hit/건너뛴 페이지는 첫 chunk를 보낸 직후 한 번에, OCR 페이지는 chunk가 끝날 때마다 (페이지 순서 아님)
+      - 모든 페이지가 정확히 한 번씩 (건너뛴 페이지는 {})
+    keep_images: False면 페이지를 모아 두지 않음 (on_pages로만, 메모리가 페이지 수와 무관)
+      - 캐시 hit 페이지도 넘겨줄 때 한 장씩 다시 읽음
+      - 반환 images는 페이지 캐시에서 한 장씩 다시 읽는 1회용 iterable (파일 전체 캐시 저장용),
+        캐시에 없는 OCR 페이지가 있으면 None
+    return: {"images": [...]} 원본 페이지 순서
+    OCR이 끝내 실패하면 끝난 페이지는 페이지 캐시에 저장한 뒤 그 예외를 올림
+    """
+    total_pages = count_pdf_pages(pdf_path)
+    wanted = list(range(1, total_pages + 1)) if pages is None else sorted(set(p for p in pages if 1 <= p <= total_pages))
+
+    # keep_images=False면 hit 여부만 (값 None) -> 넘겨줄 때 다시 읽음
+    cached: Dict[int, Optional[Dict[str, Any]]] = {}
+    page_keys: List[str] = []
+    if cache_dir:
+        page_keys = [_page_cache_key(fp, options) for fp in page_fingerprints(pdf_path)]
+        for pno in wanted:
+            hit = load_ocr_cache(cache_dir, page_keys[pno - 1], max_age_days)
+            if hit is not None and isinstance(hit.get("image"), dict):
+                cached[pno] = hit["image"] if keep_images else None
+    missing = [pno for pno in wanted if pno not in cached]
+    print(f"[OCR] page cache: total_pages={total_pages}, wanted={len(wanted)}, hit={len(cached)}, ocr={len(missing)}")
+
+    # (페이지 목록, 응답) 쌍: 전체가 chunk 1개 크기 이하면 예전처럼 원본 파일 그대로 한 번에
+    done: List[Any] = []
+    error: Optional[BaseException] = None
+    sent_bytes: List[int] = []
+    t0 = time.perf_counter()
+    chunks: List[Any] = []
+    if missing and not raster and len(missing) == total_pages and total_pages <= pages_per_chunk:
+        print(f"[OCR] single call: pages={total_pages}")
+        chunks = [_WholeFileChunk(pdf_path, missing)]
+    elif missing:
+        chunks = split_pdf_chunks(pdf_path, pages_per_chunk, save_dir=save_dir, pages=missing, raster=raster)
+        print(f"[OCR] split mode: pages={len(missing)}, chunks={len(chunks)}, per_chunk={pages_per_chunk}"
+              + (f", raster={raster}" if raster else ""))
+
+    by_page: Dict[int, Dict[str, Any]] = dict(cached) if keep_images else {}
+    saved: List[int] = []
+    save_ok = bool(cache_dir)
+
+    def _send(ch, stream):
+        sent_bytes.append(stream.seek(0, io.SEEK_END))
+        stream.seek(0)
+        return call(ch.name, stream)
+
+    def _cached_image(pno: int) -> Dict[str, Any]:
+        if pno not in cached:
+            return {}  # 2단계 OCR에서 건너뛴 페이지
+        img = cached[pno]
+        if img is None:
+            hit = load_ocr_cache(cache_dir, page_keys[pno - 1])
+            img = hit.get("image") if hit else None
+            if not isinstance(img, dict):
+                raise RuntimeError(f"page cache entry vanished: page {pno}")
+        return img
+
+    def _deliver_ready():
+        # OCR 안 하는 페이지(캐시 hit + 2단계에서 건너뛴 페이지)
+        ready = sorted(set(range(1, total_pages + 1)) - set(missing))
+        if keep_images:
+            on_pages(ready, [_cached_image(pno) for pno in ready])
+        else:
+            for pno in ready:
+                on_pages([pno], [_cached_image(pno)])
+
+    def _chunk_done(pages: List[int], res: Dict[str, Any]):
+        # chunk 끝날 때마다: 페이지 캐시 저장 -> 모아 두기(keep_images) -> 넘겨주기(on_pages)
+        nonlocal save_ok
+        got = merge([res]).get("images") or []
+        if len(got) != len(pages):
+            # 페이지 수가 안 맞으면 어느 페이지 결과인지 확실하지 않음 -> 순서대로 채우고 모자란 페이지는 {}
+            #   (뒤 페이지 번호가 밀리지 않게 chunk 페이지 수에 맞춤, 캐시엔 안 넣음 -> 다음 실행에서 다시 OCR)
+            print(f"[WARN] OCR images={len(got)} != pages={len(pages)} ({pages[0]}~{pages[-1]})"
+                  f" -> padded with empty pages, not cached")
+            got = (got + [{}] * len(pages))[:len(pages)]
+        elif save_ok:
+            for pno, img in zip(pages, got):
+                try:
+                    save_ocr_cache(cache_dir, page_keys[pno - 1], {"image": img})
+                    saved.append(pno)
+                except Exception as e:
+                    print(f"[WARN] page cache save failed: {e}")
+                    save_ok = False
+                    break
+        if keep_images:
+            by_page.update(zip(pages, got))
+        if on_pages:
+            on_pages(pages, got)
+
+    if chunks:
+        # chunk 동시 호출(동시 요청 수 + 속도 제한), 끝나는 대로 _chunk_done
+        done, error = run_ocr_chunks_adaptive(
+            chunks, _send,
+            max_in_flight=max_in_flight, rate_per_sec=rate_per_sec, burst=burst,
+            max_bytes=max_chunk_bytes, max_retries=max_retries, backoff_sec=backoff_sec,
+            on_started=_deliver_ready if on_pages else None,
+            on_done=_chunk_done,
+        )
+    elif on_pages:
+        _deliver_ready()
+    if sent_bytes:
+        print(f"[OCR] uploaded: requests={len(sent_bytes)}, bytes={sum(sent_bytes)}, "
+              f"{time.perf_counter() - t0:.2f}s")
+
+    if saved:
+        evict_ocr_cache(cache_dir, max_mb=max_mb, max_age_days=max_age_days)
+
+    if error is not None:
+        print(f"[OCR] kept pages={len(saved)} in page cache, "
+              f"failed pages={len(missing) - sum(len(p) for p, _ in done)}")
+        raise error
+
+    if not keep_images:
+        replayable = bool(cache_dir) and set(missing) <= set(saved)
+        print(f"[OCR] streamed pages={total_pages}" + ("" if replayable or not cache_dir else " (not all pages cached)"))
+        if not replayable:
+            return {"images": None}
+        in_cache = set(cached) | set(saved)
+        return {"images": _replay_page_cache(cache_dir, [page_keys[i] if i + 1 in in_cache else None
+                                                         for i in range(total_pages)])}
+
+    # 2단계에서 건너뛴 페이지는 {} (OCR한 페이지는 모자란 응답도 chunk 단위로 {}로 채워져 있음)
+    images = [by_page.get(pno, {}) for pno in range(1, total_pages + 1)]
+
+    print(f"[OCR] merged images={len(images)} (expect={total_pages})")
+    return {"images": images}
+
+class PageReorderBuffer:
+    """
+    스트리밍 파싱 결과를 페이지 순서로 내보냄
+    pages      : 나올 페이지 번호 (이 순서대로 내보냄)
+    put(p, v)  : 아무 순서로 넣음 -> 앞 페이지가 다 모였으면 emit(p, v)를 순서대로 바로 호출
+    flush()    : 끝에 남은 것(앞 페이지가 끝내 안 온 경우) 순서대로 내보냄
+    """
+
+    def __init__(self, pages, emit: Callable[[int, Any], None]):
+        self._order = list(pages)
+        self._next = 0
+        self._held: Dict[int, Any] = {}
+        self._emit = emit
+        self.max_held = 0
+
+    def put(self, pno: int, value: Any):
+        self._held[pno] = value
+        self.max_held = max(self.max_held, len(self._held))
+        while self._next < len(self._order) and self._order[self._next] in self._held:
+            p = self._order[self._next]
+            self._next += 1
+            self._emit(p, self._held.pop(p))
+
+    def flush(self):
+        for p in self._order[self._next:]:
+            if p in self._held:
+                self._emit(p, self._held.pop(p))
+        self._next = len(self._order)
+
+# ============================================================
+# ✅ 2단계 OCR 1단계: 페이지 상단 밴드 썸네일 분류
+#   - 페이지마다 상단 (ratio + 여유) 밴드만 저해상도 회색조로 렌더 -> 격자로 붙인 이미지 1장 = 요청 1건
+#     (CLOVA는 요청당 이미지 1장이라 여러 페이지를 한 장에 모음, 표 감지 없음)
+#   - 응답 field 중심점 -> 격자 칸 -> 페이지, 칸 안 y가 상단 ratio 경계 안인 것만 그 페이지 텍스트
+#   - match(페이지 상단 텍스트) True인 페이지만 2단계(표 감지 전체 OCR)로
+# ============================================================
+HEADER_SHEET_MARGIN = 0.05   # 밴드 아래 여유(페이지 높이 비율): 경계에 걸친 글자도 잘리지 않게
+HEADER_SHEET_GAP_PX = 24     # 칸 사이 흰 여백 (옆 페이지 글자와 한 field로 붙지 않게)
+
+class HeaderSheet:
+    """
+    name  : 업로드 파일명 (<stem>_header_p001_to_040.png)
+    cells : [(pno, x, y, band_px), ...] 격자 칸 왼쪽 위 픽셀 + 칸 안 상단 ratio 경계 y (행 우선 순서)
+    page_at(x, y) -> (pno, 칸 안 y, band_px) 또는 None (여백/빈 칸)
+    halves()      : 행(한 줄짜리면 칸) 기준 반으로 자른 시트 2장 (적응형 전송의 413/읽기 타임아웃 분할용)
+    """
+
+    def __init__(self, name: str, data: bytes, size: Tuple[int, int], cols: int,
+                 cell_w: int, cell_h: int, cells: List[Tuple[int, int, int, float]], stem: str = ""):
+        self.name = name
+        self.stem = stem
+        self.data = data
+        self.size = size
+        self.cols = cols
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.cells = cells
+
+    @property
+    def pages(self) -> List[int]:
+        return [c[0] for c in self.cells]
+
+    def open(self) -> io.BytesIO:
+        return io.BytesIO(self.data)
+
+    def page_at(self, x: float, y: float) -> Optional[Tuple[int, float, float]]:
+        col, row = int(x // self.cell_w), int(y // self.cell_h)
+        k = row * self.cols + col
+        if x < 0 or y < 0 or col >= self.cols or k >= len(self.cells):
+            return None
+        pno, _, y0, band_px = self.cells[k]
+        return pno, y - y0, band_px
+
+    def halves(self) -> List["HeaderSheet"]:
+        if len(self.cells) < 2:
+            return [self]  # 1장은 더 못 나눔 (적응형 전송은 1페이지 chunk를 나누지 않음)
+        rows = (len(self.cells) + self.cols - 1) // self.cols
+        if rows > 1:
+            mid = rows // 2
+            # (칸 목록, 잘라낼 영역 x0/y0/x1/y1, 열 수)
+            parts = [(self.cells[r0 * self.cols:r1 * self.cols],
+                      (0, r0 * self.cell_h, self.size[0], min(r1 * self.cell_h, self.size[1])), self.cols)
+                     for r0, r1 in ((0, mid), (mid, rows))]
+        else:
+            mid = len(self.cells) // 2
+            parts = [(self.cells[c0:c1], (c0 * self.cell_w, 0, c1 * self.cell_w, self.size[1]), c1 - c0)
+                     for c0, c1 in ((0, mid), (mid, len(self.cells)))]
+
+        with Image.open(io.BytesIO(self.data)) as im:
+            out = []
+            for cells, box, cols in parts:
+                buf = io.BytesIO()
+                part = im.crop(box)
+                part.save(buf, "PNG")
+                pnos = [c[0] for c in cells]
+                name = Path(_chunk_name(self.stem, pnos)).with_suffix(".png").name
+                out.append(HeaderSheet(name, buf.getvalue(), part.size, cols, self.cell_w, self.cell_h,
+                                       [(pno, x - box[0], y - box[1], band_px) for pno, x, y, band_px in cells],
+                                       stem=self.stem))
+        return out
+
+    def __str__(self) -> str:
+        return f"{self.name} ({len(self.cells)} pages, {self.size[0]}x{self.size[1]})"
+
+def render_header_sheets(pdf_path: str, ratio: float, dpi: float = 100, cols: int = 4,
+                         pages_per_sheet: int = 40) -> List[HeaderSheet]:
+    if pdfium is None:
+        raise RuntimeError("2단계 OCR(상단 밴드 분류)은 pypdfium2가 필요함. (pip install pypdfium2)")
+
+    scale = dpi / 72.0
+    keep = min(1.0, ratio + HEADER_SHEET_MARGIN)
+    stem = Path(pdf_path).stem
+
+    sheets: List[HeaderSheet] = []
+    with _PDFIUM_LOCK:
+        doc = pdfium.PdfDocument(pdf_path)
+        try:
+            total = len(doc)
+            for start in range(0, total, max(1, pages_per_sheet)):
+                pnos = list(range(start + 1, min(total, start + pages_per_sheet) + 1))
+                bands = []
+                for pno in pnos:
+                    page = doc[pno - 1]
+                    w, h = page.get_size()
+                    im = page.render(scale=scale, crop=(0, h * (1.0 - keep), 0, 0), grayscale=True).to_pil()
+                    bands.append((pno, im.convert("L"), h * ratio * scale))
+                    page.close()
+
+                n_cols = min(cols, len(bands))
+                cell_w = max(im.width for _, im, _ in bands) + HEADER_SHEET_GAP_PX
+                cell_h = max(im.height for _, im, _ in bands) + HEADER_SHEET_GAP_PX
+                rows = (len(bands) + n_cols - 1) // n_cols
+                sheet = Image.new("L", (n_cols * cell_w, rows * cell_h), 255)
+                cells = []
+                for k, (pno, im, band_px) in enumerate(bands):
+                    x, y = (k % n_cols) * cell_w, (k // n_cols) * cell_h
+                    sheet.paste(im, (x, y))
+                    cells.append((pno, x, y, band_px))
+
+                buf = io.BytesIO()
+                sheet.save(buf, "PNG")
+                name = Path(_chunk_name(f"{stem}_header", pnos)).with_suffix(".png").name
+                sheets.append(HeaderSheet(name, buf.getvalue(),
+                                          sheet.size, n_cols, cell_w, cell_h, cells, stem=f"{stem}_header"))
+        finally:
+            doc.close()
+    return sheets
+
+def classify_pages_by_header(
+    pdf_path: str,
+    call_image: Callable[..., Dict[str, Any]],
+    match: Callable[[str], bool],
+    ratio: float,
+    dpi: float = 100,
+    cols: int = 4,
+    pages_per_sheet: int = 40,
+    max_in_flight: int = 4,
+    rate_per_sec: float = 0.0,
+    burst: int = 1,
+    max_retries: int = 3,
+    backoff_sec: float = 1.0,
+) -> List[int]:
+    """
+    call_image(name, stream) -> clova 응답 (이미지 1장)
+    match(상단 텍스트)        -> 2단계로 보낼 페이지인지 (추출기의 키워드 판정)
+    return: match된 페이지 번호(1-based)
+    시트 전송은 PDF chunk와 같은 run_ocr_chunks_adaptive (재시도/413·읽기 타임아웃 때 시트 반으로), 최종 실패는 예외
+    """
+    sheets = render_header_sheets(pdf_path, ratio, dpi=dpi, cols=cols, pages_per_sheet=pages_per_sheet)
+
+    sent: Dict[Tuple[int, ...], HeaderSheet] = {}  # 페이지 목록 -> 실제로 보낸 시트 (반으로 나뉜 시트 포함)
+
+    def _send(sh: HeaderSheet, stream) -> Dict[str, Any]:
+        sent[tuple(sh.pages)] = sh
+        return call_image(sh.name, stream)
+
+    done, error = run_ocr_chunks_adaptive(
+        sheets, _send, max_in_flight=max_in_flight, rate_per_sec=rate_per_sec, burst=burst,
+        max_retries=max_retries, backoff_sec=backoff_sec,
+    )
+    if error is not None:
+        raise error
+
+    texts: Dict[int, List[str]] = {}
+    for pnos, res in done:
+        sh = sent[tuple(pnos)]
+        img = ((res or {}).get("images") or [{}])[0]
+        # 서버가 줄여서 인식했으면 응답 좌표 -> 보낸 이미지 픽셀로
+        sx = sy = 1.0
+        wh = clova_page_image_wh(img)
+        if wh:
+            sx, sy = sh.size[0] / wh[0], sh.size[1] / wh[1]
+        for f in img.get("fields") or []:
+            txt = f.get("inferText", "")
+            verts = (f.get("boundingPoly") or {}).get("vertices") or []
+            if not txt or not verts:
+                continue
+            cx = sum([v.get("x", 0) for v in verts]) / len(verts) * sx
+            cy = sum([v.get("y", 0) for v in verts]) / len(verts) * sy
+            hit = sh.page_at(cx, cy)
+            if hit is not None and hit[1] <= hit[2]:
+                texts.setdefault(hit[0], []).append(txt)
+
+    total = sum(len(sh.cells) for sh in sheets)
+    pages = [pno for sh in sheets for pno in sh.pages if match(" ".join(texts.get(pno, [])))]
+    print(f"[OCR] header classify: pages={total}, sheets={len(sheets)}, matched={len(pages)} {pages}")
+    return pages
+
+def matched_page_gaps(pages: List[int]) -> List[int]:
+    # 첫~마지막 match 사이인데 match 안 된 페이지
+    #   - 경력 페이지는 보통 이어져 있음 -> 썸네일 OCR이 키워드를 놓쳤을 수 있는 페이지 (2단계에서 OCR 안 됨)
+    #   - 첫 match 앞/마지막 match 뒤에서 놓친 페이지는 여기서도 알 수 없음
+    hit = set(pages)
+    return [pno for pno in range(min(hit), max(hit) + 1) if pno not in hit] if hit else []
+
+# ============================================================
+# ✅ ClovaFields: CLOVA fields 열 단위(columnar) 바이너리
+#   - 페이지별 fields를 평행 배열로: x0/y0/x1/y1(페이지 정규화 0~1), confidence, 텍스트 오프셋 + UTF-8 blob
+#   - 파일 그대로 mmap -> 캐시 hit 때 JSON 읽기/파싱/중첩 dict 순회 없음
+#   - 이미지 크기를 모르는 페이지(norm_w=0)는 픽셀 좌표 그대로 저장 -> 읽을 때 PDF 크기로 정규화(예전 fallback과 동일)
+#   - 좌표는 float64: 예전 계산(min(vertex)/image_w * pdf_w)과 같은 값이 나오게
+#
+#   레이아웃(little-endian = x86/ARM 네이티브 순서 그대로, 섹션마다 8바이트 정렬)
+#     header  : magic "CLVF", version u16, 0 u16, n_pages u32, n_fields u32, blob_len u64
+#     norm_w  : f64[n_pages]       norm_h : f64[n_pages]
+#     start   : u32[n_pages + 1]   (페이지 i의 field 범위 = start[i]:start[i+1])
+#     x0,y0,x1,y1 : f64[n_fields]  conf : f32[n_fields] (없으면 NaN)
+#     text_off: u32[n_fields + 1]  blob : bytes[blob_len]
+# ============================================================
+_FIELDS_MAGIC = b"CLVF"
+_FIELDS_VERSION = 1
+_FIELDS_HEADER = struct.Struct("<4sHHIIQ")
+
+def clova_page_image_wh(img_obj: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    # CLOVA 응답에서 페이지 이미지 width/height (없으면 None -> PDF 페이지 크기로 대체)
+    for key in ("convertedImageInfo", "convertedImage", "imageInfo"):
+        if isinstance(img_obj.get(key), dict):
+            w = img_obj[key].get("width")
+            h = img_obj[key].get("height")
+            if w and h:
+                return float(w), float(h)
+
+    w = img_obj.get("width")
+    h = img_obj.get("height")
+    if w and h:
+        return float(w), float(h)
+    return None
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+def _fields_columns(n_pages: int, n_fields: int) -> Tuple[Tuple[str, str, int], ...]:
+    # (속성 이름, 형식, 개수) - 파일 안 순서 그대로
+    return (("norm_w", "d", n_pages), ("norm_h", "d", n_pages), ("start", "I", n_pages + 1),
+            ("x0", "d", n_fields), ("y0", "d", n_fields), ("x1", "d", n_fields), ("y1", "d", n_fields),
+            ("conf", "f", n_fields), ("text_off", "I", n_fields + 1))
+
+class ClovaFields:
+    """
+    len(fields)                 : 페이지 수 (clova["images"] 길이)
+    page_fields(i0, pdf_w, pdf_h): 페이지 i0(0-based)의 (nx0, ny0, nx1, ny1, text) - 정규화 좌표
+    page_view(i0, pdf_w, pdf_h)  : PDF 좌표로 변환해 둔 페이지 뷰 (페이지당 1번 만들고 재사용)
+    close() / with ClovaFields.open(p) as fields: mmap 닫기 (열 memoryview 먼저 놓음)
+    """
+
+    def __init__(self, buf, mm: Optional[mmap.mmap] = None):
+        self._buf = buf
+        self._mm = mm
+        self._views: Dict[Tuple[int, float, float], "OcrPageView"] = {}
+
+        # 헤더/전체 길이를 memoryview 만들기 전에 검사
+        #   - 검사 중 예외가 나도 열 view가 없음 -> 호출한 쪽이 mmap을 바로 닫을 수 있음 (깨진 캐시 삭제 후 재생성)
+        if len(buf) < _FIELDS_HEADER.size:
+            raise ValueError(f"truncated ClovaFields header ({len(buf)}B)")
+        magic, version, _, n_pages, n_fields, blob_len = _FIELDS_HEADER.unpack_from(buf, 0)
+        if magic != _FIELDS_MAGIC or version != _FIELDS_VERSION:
+            raise ValueError(f"not a ClovaFields buffer (magic={magic!r}, version={version})")
+
+        layout = []
+        off = _pad8(_FIELDS_HEADER.size)
+        for name, fmt, count in _fields_columns(n_pages, n_fields):
+            size = struct.calcsize(fmt) * count
+            layout.append((name, fmt, off, size))
+            off = _pad8(off + size)
+        if len(buf) < off + blob_len:
+            raise ValueError(f"truncated ClovaFields buffer ({len(buf)}B < {off + blob_len}B)")
+
+        self.n_pages = n_pages
+        self.n_fields = n_fields
+        self._view = view = memoryview(buf)
+        for name, fmt, col_off, size in layout:
+            setattr(self, name, view[col_off:col_off + size].cast(fmt))
+        self.blob = view[off:off + blob_len]
+
+    def __len__(self) -> int:
+        return self.n_pages
+
+    def close(self):
+        # 열 memoryview가 남아 있으면 mmap.close()가 BufferError -> 전부 놓고 닫음 (여러 번 불러도 됨)
+        for col in (self.norm_w, self.norm_h, self.start, self.x0, self.y0, self.x1, self.y1,
+                    self.conf, self.text_off, self.blob, self._view):
+            col.release()
+        self._views.clear()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self) -> "ClovaFields":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def text(self, j: int) -> str:
+        return bytes(self.blob[self.text_off[j]:self.text_off[j + 1]]).decode("utf-8")
+
+    def page_fields(self, page_index_0: int, pdf_w: float, pdf_h: float):
+        nw, nh = self.norm_w[page_index_0], self.norm_h[page_index_0]
+        if nw and nh:
+            sx = sy = None
+        else:
+            # 이미지 크기 없음 -> 예전처럼 PDF 페이지 크기로 정규화
+            sx, sy = float(pdf_w), float(pdf_h)
+        x0, y0, x1, y1 = self.x0, self.y0, self.x1, self.y1
+        for j in range(self.start[page_index_0], self.start[page_index_0 + 1]):
+            if sx is None:
+                yield x0[j], y0[j], x1[j], y1[j], self.text(j)
+            else:
+                yield (x0[j] / sx if sx else 0.0, y0[j] / sy if sy else 0.0,
+                       x1[j] / sx if sx else 0.0, y1[j] / sy if sy else 0.0, self.text(j))
+
+    def page_view(self, page_index_0: int, pdf_w: float, pdf_h: float) -> "OcrPageView":
+        key = (page_index_0, float(pdf_w), float(pdf_h))
+        view = self._views.get(key)
+        if view is None:
+            view = OcrPageView(self.page_fields(page_index_0, pdf_w, pdf_h), pdf_w, pdf_h)
+            self._views[key] = view
+        return view
+
+    # ---------------- 만들기 / 저장 / 열기 ----------------
+    @staticmethod
+    def to_bytes(clova: Dict[str, Any]) -> bytes:
+        images = clova.get("images") or []
+        norm_w, norm_h = array.array("d"), array.array("d")
+        start = array.array("I", [0])
+        cols = [array.array("d") for _ in range(4)]
+        conf = array.array("f")
+        text_off = array.array("I", [0])
+        blob = bytearray()
+
+        for img_obj in images:
+            wh = clova_page_image_wh(img_obj)
+            w, h = wh if wh else (0.0, 0.0)
+            norm_w.append(w)
+            norm_h.append(h)
+            for f in (img_obj.get("fields") or []):
+                txt = f.get("inferText", "")
+                if not txt:
+                    continue  # 읽는 쪽에서 어차피 건너뜀
+                verts = (f.get("boundingPoly") or {}).get("vertices") or []
+                if verts:
+                    xs = [v.get("x", 0) for v in verts]
+                    ys = [v.get("y", 0) for v in verts]
+                    box = (min(xs), min(ys), max(xs), max(ys))
+                    if w:
+                        box = (box[0] / w, box[1] / h, box[2] / w, box[3] / h)
+                else:
+                    box = (0.0, 0.0, 0.0, 0.0)
+                for col, v in zip(cols, box):
+                    col.append(float(v))
+                c = f.get("inferConfidence")
+                conf.append(float(c) if c is not None else float("nan"))
+                blob += txt.encode("utf-8")
+                text_off.append(len(blob))
+            start.append(len(conf))
+
+        out = bytearray(_FIELDS_HEADER.pack(_FIELDS_MAGIC, _FIELDS_VERSION, 0, len(norm_w), len(conf), len(blob)))
+        for arr in (norm_w, norm_h, start, *cols, conf, text_off):
+            out += b"\0" * (_pad8(len(out)) - len(out))
+            out += arr.tobytes()
+        out += b"\0" * (_pad8(len(out)) - len(out))
+        out += blob
+        return bytes(out)
+
+    @classmethod
+    def from_clova(cls, clova: Dict[str, Any]) -> "ClovaFields":
+        return cls(cls.to_bytes(clova))
+
+    @classmethod
+    def open(cls, path: str) -> "ClovaFields":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mm, mm)
+        except Exception:
+            mm.close()
+            raise
+
+    def save(self, path: str):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(p.parent), prefix=f".{p.name[:12]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._raw())
+            try:
+                os.replace(tmp, p)
+            except PermissionError:
+                _unlink_quiet(Path(tmp))  # 윈도우: 다른 프로세스가 mmap 중 -> 같은 내용
+        except BaseException:
+            _unlink_quiet(Path(tmp))
+            raise
+
+    def _raw(self) -> bytes:
+        return self._mm[:] if self._mm is not None else bytes(self._buf)
+
+class OcrPageView:
+    """
+    페이지 1장 OCR fields를 PDF 좌표로 미리 변환해 둔 것 (셀마다 좌표 변환 반복 안 함)
+    x0/y0/x1/y1, cx/cy: field별 PDF 좌표 박스/중심점 (field 순서)
+    pick(bbox, center)  : bbox 안 field 텍스트 (읽는 순서: round(y0,1) -> x0)
+    fields_above(y)     : 중심 y <= y 인 field 번호 (field 순서)
+    texts_above(y)      : 위 field들의 텍스트
+
+    후보 찾기는 y 정렬 + bisect 창 (pdf_cells.PageWordIndex와 같은 방식), 최종 판정은 예전 조건 그대로
+    - 중심점: cy 정렬 -> [y0, y1] 창 안만 x 검사
+    - 겹침  : y0 정렬 -> (bbox.y0 - 최대 field 높이, bbox.y1) 창 안만 검사
+    """
+
+    def __init__(self, fields, pdf_w: float, pdf_h: float):
+        self.x0: List[float] = []
+        self.y0: List[float] = []
+        self.x1: List[float] = []
+        self.y1: List[float] = []
+        self.texts: List[str] = []
+        for nx0, ny0, nx1, ny1, txt in fields:
+            self.x0.append(nx0 * pdf_w)
+            self.y0.append(ny0 * pdf_h)
+            self.x1.append(nx1 * pdf_w)
+            self.y1.append(ny1 * pdf_h)
+            self.texts.append(txt)
+        self.cx = [(a + b) / 2.0 for a, b in zip(self.x0, self.x1)]
+        self.cy = [(a + b) / 2.0 for a, b in zip(self.y0, self.y1)]
+        # 정렬키 끝에 field 번호 -> 동률이면 field 순서 (후보를 어떤 순서로 모아도 결과 동일)
+        self._order = [(round(y, 1), x, j) for j, (y, x) in enumerate(zip(self.y0, self.x0))]
+
+        n = len(self.texts)
+        self._by_cy = sorted(range(n), key=self.cy.__getitem__)
+        self._cys = [self.cy[j] for j in self._by_cy]
+        self._by_y0 = sorted(range(n), key=self.y0.__getitem__)
+        self._y0s = [self.y0[j] for j in self._by_y0]
+        # 창 아래쪽 여유: 최대 높이 + 1pt (fy0 + 높이 부동소수 오차 흡수, 후보만 늘어남)
+        self._y_reach = max((b - a for a, b in zip(self.y0, self.y1)), default=0.0) + 1.0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def pick_center(self, bbox: Tuple[float, float, float, float]) -> List[int]:
+        # field 중심점이 bbox 안(경계 포함)
+        x0, y0, x1, y1 = bbox
+        cx = self.cx
+        lo = bisect_left(self._cys, y0)
+        hi = bisect_right(self._cys, y1)
+        return [j for j in self._by_cy[lo:hi] if x0 <= cx[j] <= x1]
+
+    def pick_overlap(self, bbox: Tuple[float, float, float, float]) -> List[int]:
+        # field 박스와 bbox 교집합 넓이 > 0
+        x0, y0, x1, y1 = bbox
+        fx0, fy0, fx1, fy1 = self.x0, self.y0, self.x1, self.y1
+        lo = bisect_right(self._y0s, y0 - self._y_reach)
+        hi = bisect_left(self._y0s, y1)  # 겹치려면 fy0 < bbox.y1
+        return [j for j in self._by_y0[lo:hi]
+                if min(x1, fx1[j]) > max(x0, fx0[j]) and min(y1, fy1[j]) > max(y0, fy0[j])]
+
+    def pick(self, bbox: Tuple[float, float, float, float], center: bool = True) -> List[str]:
+        idx = self.pick_center(bbox) if center else self.pick_overlap(bbox)
+        idx.sort(key=self._order.__getitem__)
+        return [self.texts[j] for j in idx]
+
+    def fields_above(self, y: float) -> List[int]:
+        # 상단 밴드는 field 몇 개뿐 -> cy 정렬 앞쪽만 잘라서 field 순서로
+        idx = self._by_cy[:bisect_right(self._cys, y)]
+        idx.sort()
+        return idx
+
+    def texts_above(self, y: float) -> List[str]:
+        return [self.texts[j] for j in self.fields_above(y)]
+
+# ============================================================
+# ✅ 페이지 상단 밴드 텍스트표 (제목/키워드로 페이지 찾기용)
+#   - 페이지마다 field를 한 번만 돌면서 여러 비율(상단 20%, 30%) 텍스트를 같이 모음
+#   - 페이지 찾는 함수들은 이 표만 읽음 (페이지마다/제목마다 field 다시 안 돎)
+#   - 중심 y 기준은 추출기마다 예전 것 그대로 넣음 (cy와 band_h 단위만 같으면 됨)
+# ============================================================
+HEADER_BAND_RATIOS = (0.20, 0.30)
+
+class HeaderBands:
+    """
+    add_page(centers, band_h): centers = [(cy, text), ...] field 순서, cy <= band_h * ratio 이면 그 밴드에 포함
+    text(i0, ratio)          : 페이지 i0 상단 ratio 밴드 텍스트(공백으로 이음), 표에 없는 페이지는 ""
+    key(i0, ratio)           : 위 텍스트에 key 함수(추출기 normalize_ocr_key 등)를 적용한 것
+                               (처음 물어볼 때 한 번만 -> 제목 여러 개로 찾아도 페이지당 정규화 1번)
+    """
+
+    def __init__(self, ratios=HEADER_BAND_RATIOS, key: Optional[Callable[[str], str]] = None):
+        self.ratios = tuple(sorted(set(float(r) for r in ratios)))
+        self._key = key
+        self._pages: List[Dict[float, str]] = []
+        self._keys: Dict[Tuple[int, float], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def add_page(self, centers, band_h: float):
+        limits = [band_h * r for r in self.ratios]
+        # 가장 넓은 밴드로 한 번 거르고(대부분 field는 여기서 빠짐), 남은 것만 비율별로 나눔
+        lim_max = max(limits, default=0.0)
+        top = [(cy, txt) for cy, txt in centers if cy <= lim_max]
+        self._pages.append({
+            r: " ".join([t for cy, t in top if cy <= lim])
+            for r, lim in zip(self.ratios, limits)
+        })
+
+    def text(self, page_index_0: int, ratio: float) -> str:
+        if page_index_0 < 0 or page_index_0 >= len(self._pages):
+            return ""
+        band = self._pages[page_index_0].get(float(ratio))
+        if band is None:
+            raise ValueError(f"header band ratio {ratio} not built (built: {self.ratios})")
+        return band
+
+    def key(self, page_index_0: int, ratio: float) -> str:
+        k = (page_index_0, float(ratio))
+        if k not in self._keys:
+            txt = self.text(page_index_0, ratio)
+            self._keys[k] = self._key(txt) if (self._key and txt) else txt
+        return self._keys[k]
+
+def header_bands_from_fields(fields: ClovaFields, pdf, ratios=HEADER_BAND_RATIOS,
+                             key: Optional[Callable[[str], str]] = None) -> HeaderBands:
+    # extract_*_withcloud 기준: PDF 좌표 field 박스 중심 y <= 페이지 높이 * ratio
+    bands = HeaderBands(ratios, key=key)
+    for i0, page in enumerate(pdf.pages):
+        if i0 >= len(fields):
+            break
+        view = fields.page_view(i0, page.width, page.height)
+        top = view.fields_above(max(page.height * r for r in bands.ratios))
+        bands.add_page([(view.cy[j], view.texts[j]) for j in top], page.height)
+    return bands
+
+def load_or_build_clova_fields(cache_dir: Optional[str], key: Optional[str],
+                               load_clova: Callable[[], Dict[str, Any]],
+                               max_age_days: float = 0) -> ClovaFields:
+    """
+    key가 있으면 <cache_dir>/<key[:2]>/<key>.fields 를 mmap으로 바로 엶 (JSON 안 읽음)
+    없거나 max_age_days보다 오래됐으면 load_clova() 결과로 만들고 저장 (load_ocr_cache와 같은 기준)
+    다 쓰면 close() (또는 with 문)
+    """
+    p = Path(cache_dir) / key[:2] / f"{key}{FIELDS_CACHE_SUFFIX}" if (cache_dir and key) else None
+    hit = False
+    if p is not None:
+        try:
+            hit = not (max_age_days > 0 and time.time() - p.stat().st_mtime > max_age_days * 86400)
+            if not hit:
+                print(f"[OCR] fields cache expired (>{max_age_days}d): {p} -> rebuild")
+        except FileNotFoundError:
+            pass
+    if hit:
+        try:
+            fields = ClovaFields.open(str(p))
+            try:
+                os.utime(p)
+            except OSError:
+                pass
+            print(f"[OCR] load fields: {p}")
+            return fields
+        except (OSError, ValueError, struct.error, TypeError, BufferError) as e:
+            print(f"[WARN] broken fields cache removed: {p} ({type(e).__name__}: {e}) -> rebuild")
+            _unlink_quiet(p)
+
+    fields = ClovaFields.from_clova(load_clova())
+    if p is not None:
+        try:
+            fields.save(str(p))
+        except Exception as e:
+            print(f"[WARN] fields cache save failed: {e}")
+    return fields
@@ -1,506 +1,640 @@
-import os
-import re
-import json
-import time
-import uuid
-import calendar
-from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
-
-import requests
-import pdfplumber
-from pypdf import PdfReader, PdfWriter
-
-# ============================================================
-# ✅ 실행 설정 (여기만 바꾸면 됨)
-# ============================================================
-PDF_PATH = r"C:/file/소방기술인협회/현준식(소방).pdf"
-
-# ✅ 최종 매핑 결과(items) 저장
-OUT_JSON = "현준식.json"
-
-USER_NO  = "hjs"
-AREA_DIV = "소방"
-CAREER_DIV_VALUE = "주요기술경력"   # 웹 payload에 맞게 필요시 변경
-
-# "주요기술경력" 페이지 필터 키워드
-KEYWORD = "주요기술경력"
-TOP_RATIO = 0.30   # 페이지 상단 30%에서만 키워드 탐색
-
-# ============================================================
-# ✅ CLOVA OCR 설정
-# ============================================================
-CLOVA_OCR_API_URL = os.environ.get(
-    "CLOVA_OCR_API_URL",
-    ""
-)
-CLOVA_OCR_SECRET = os.environ.get(
-    "CLOVA_OCR_SECRET",
-    ""
-)
-
-# OCR 결과 캐시
-CACHE_OCR_JSON = f"clova_ocr_cache_{Path(PDF_PATH).stem}.json"
-USE_CACHE_IF_EXISTS = False
-
-# 큰 PDF 분할 OCR
-PAGES_PER_CHUNK = 10
-OCR_SLEEP_SEC = 0.3
-
-# ============================================================
-# ✅ 공용 유틸
-# ============================================================
-def clean_text(s: str) -> str:
-    if not s:
-        return ""
-    s = s.replace("\u00a0", " ")
-    s = re.sub(r"[ \t]+", " ", s)
-    s = re.sub(r"\n+", "\n", s)
-    return s.strip()
-
-def clean_single_line(s: str) -> str:
-    if not s:
-        return ""
-    s = s.replace("\u00a0", " ")
-    s = s.replace("\n", " ")
-    s = re.sub(r"[ \t]+", " ", s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
-
-def remove_all_spaces(s: str) -> str:
-    if not s:
-        return ""
-    s = str(s).replace("\u00a0", " ")
-    return re.sub(r"\s+", "", s).strip()
-
-def normalize_ocr_key(s: str) -> str:
-    if not s:
-        return ""
-    s = s.replace("\u00a0", " ").lower()
-    s = re.sub(r"\s+", "", s)
-    s = re.sub(r"[^0-9a-z가-힣]", "", s)
-    return s
-
-# ============================================================
-# ✅ 참여기간 파싱: (시작일, 종료일, 총일수)
-# ============================================================
-DATE_RE = re.compile(r"(\d{4})[.\-/](\d{2})[.\-/](\d{2})")
-YM_RE   = re.compile(r"(\d{4})[.\-/](\d{2})(?![.\-/]\d{2})")
-DAYS_RE = re.compile(r"\(\s*([\d,]+)\s*일?\s*\)")
-
-def _to_dotdate(y: int, m: int, d: int) -> str:
-    return f"{y:04d}.{m:02d}.{d:02d}"
-
-def dotdate_to_iso(s: Optional[str]) -> Optional[str]:
-    if not s:
-        return None
-    return s.replace(".", "-")
-
-def parse_participation_period(text: str) -> Tuple[Optional[str], Optional[str], Optional[int]]:
-    if not text:
-        return None, None, None
-
-    t = clean_single_line(str(text))
-    t_nospace = re.sub(r"\s+", "", t)
-
-    dates = DATE_RE.findall(t_nospace)
-    start_dot = end_dot = None
-    if len(dates) >= 1:
-        y, m, d = map(int, dates[0])
-        start_dot = _to_dotdate(y, m, d)
-    if len(dates) >= 2:
-        y, m, d = map(int, dates[1])
-        end_dot = _to_dotdate(y, m, d)
-
-    if start_dot is None and end_dot is None:
-        yms = YM_RE.findall(t_nospace)
-        if len(yms) >= 1:
-            y, m = map(int, yms[0])
-            start_dot = _to_dotdate(y, m, 1)
-        if len(yms) >= 2:
-            y, m = map(int, yms[1])
-            end_dot = _to_dotdate(y, m, calendar.monthrange(y, m)[1])
-
-    car_days = None
-    m = DAYS_RE.search(t)
-    if m:
-        try:
-            car_days = int(m.group(1).replace(",", ""))
-        except:
-            car_days = None
-
-    return dotdate_to_iso(start_dot), dotdate_to_iso(end_dot), car_days
-
-# ============================================================
-# ✅ CLOVA OCR 호출
-# ============================================================
-def call_clova_ocr_pdf(pdf_path: str) -> Dict[str, Any]:
-    """
-    PDF를 CLOVA OCR로 보내서 JSON 결과 반환
-    ✅ tables를 받기 위해 enableTableDetection True
-    """
-    if not CLOVA_OCR_API_URL or not CLOVA_OCR_SECRET:
-        raise RuntimeError("CLOVA_OCR_API_URL / CLOVA_OCR_SECRET 설정이 비어있음.")
-
-    headers = {"X-OCR-SECRET": CLOVA_OCR_SECRET}
-    req = {
-        "version": "V2",
-        "requestId": str(uuid.uuid4()),
-        "timestamp": int(time.time() * 1000),
-
-        # ✅ 표 추출
-        "enableTableDetection": True,
-
-        "images": [{"format": "pdf", "name": "major_career"}],
-    }
-
-    with open(pdf_path, "rb") as f:
-        files = {"file": f}
-        data = {"message": json.dumps(req)}
-        r = requests.post(CLOVA_OCR_API_URL, headers=headers, data=data, files=files, timeout=180)
-
-    if r.status_code >= 400:
-        body = r.text if hasattr(r, "text") else "<no-body>"
-        raise requests.exceptions.HTTPError(f"{r.status_code} Client Error: {body}", response=r)
-
-    return r.json()
-
-# ============================================================
-# ✅ PDF 분할 + images 병합
-# ============================================================
-def split_pdf_by_pages(pdf_path: str, pages_per_chunk: int = 10) -> List[str]:
-    reader = PdfReader(pdf_path)
-    total = len(reader.pages)
-
-    out_files = []
-    base = Path(pdf_path)
-    out_dir = base.parent / f"{base.stem}_chunks"
-    out_dir.mkdir(exist_ok=True)
-
-    for i in range(0, total, pages_per_chunk):
-        writer = PdfWriter()
-        for j in range(i, min(i + pages_per_chunk, total)):
-            writer.add_page(reader.pages[j])
-
-        out_path = out_dir / f"{base.stem}_p{i+1:03d}_to_{min(i+pages_per_chunk, total):03d}.pdf"
-        with open(out_path, "wb") as f:
-            writer.write(f)
-
-        out_files.append(str(out_path))
-
-    return out_files
-
-def _merge_clova_images(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
-    merged: Dict[str, Any] = {"images": []}
-    for c in chunks:
-        merged["images"].extend(c.get("images") or [])
-    return merged
-
-def load_or_run_ocr(pdf_path: str) -> Dict[str, Any]:
-    if USE_CACHE_IF_EXISTS and Path(CACHE_OCR_JSON).exists():
-        print(f"[OCR] load cache: {CACHE_OCR_JSON}")
-        return json.loads(Path(CACHE_OCR_JSON).read_text(encoding="utf-8"))
-
-    reader = PdfReader(pdf_path)
-    total_pages = len(reader.pages)
-
-    if total_pages <= PAGES_PER_CHUNK:
-        print(f"[OCR] single call: pages={total_pages}")
-        clova = call_clova_ocr_pdf(pdf_path)
-    else:
-        chunk_paths = split_pdf_by_pages(pdf_path, pages_per_chunk=PAGES_PER_CHUNK)
-        print(f"[OCR] split mode: total_pages={total_pages}, chunks={len(chunk_paths)}, per_chunk={PAGES_PER_CHUNK}")
-
-        chunk_results: List[Dict[str, Any]] = []
-        for idx, ch_path in enumerate(chunk_paths, start=1):
-            print(f"[OCR] chunk {idx}/{len(chunk_paths)} -> {ch_path}")
-            chunk_results.append(call_clova_ocr_pdf(ch_path))
-            if OCR_SLEEP_SEC and OCR_SLEEP_SEC > 0:
-                time.sleep(OCR_SLEEP_SEC)
-
-        clova = _merge_clova_images(chunk_results)
-        print(f"[OCR] merged images={len(clova.get('images') or [])} (expect={total_pages})")
-
-    # cache save
-    try:
-        Path(CACHE_OCR_JSON).write_text(json.dumps(clova, ensure_ascii=False), encoding="utf-8")
-        print(f"[OCR] saved cache: {CACHE_OCR_JSON}")
-    except Exception as e:
-        print(f"[WARN] cache save failed: {e}")
-
-    return clova
-
-# ============================================================
-# ✅ 1) "주요기술경력" 페이지 찾기 (상단 TOP_RATIO만)
-# ============================================================
-def _get_page_image_h(img_obj: Dict[str, Any], fallback_h: float) -> float:
-    info = img_obj.get("convertedImageInfo") or {}
-    h = info.get("height")
-    if h:
-        return float(h)
-    h2 = img_obj.get("height")
-    return float(h2) if h2 else float(fallback_h)
-
-def find_major_pages_top(clova: Dict[str, Any], pdf, keyword: str, top_ratio: float) -> List[int]:
-    key_norm = normalize_ocr_key(keyword)
-    pages: List[int] = []
-    images = clova.get("images") or []
-
-    for i0, page in enumerate(pdf.pages):
-        if i0 >= len(images):
-            break
-        img = images[i0]
-        img_h = _get_page_image_h(img, fallback_h=page.height)
-
-        top_texts: List[str] = []
-        for f in (img.get("fields") or []):
-            txt = f.get("inferText", "")
-            if not txt:
-                continue
-            bp = f.get("boundingPoly") or {}
-            verts = bp.get("vertices") or []
-            if not verts:
-                continue
-            cy = sum([v.get("y", 0) for v in verts]) / max(len(verts), 1)
-            if cy <= img_h * top_ratio:
-                top_texts.append(txt)
-
-        merged = " ".join(top_texts)
-        if key_norm in normalize_ocr_key(merged):
-            pages.append(i0 + 1)
-
-    return pages
-
-# ============================================================
-# ✅ 2) tables/cells -> 매핑(items)
-# ============================================================
-def _join_cell_text(cell: Dict[str, Any]) -> str:
-    # 원본 CLOVA 응답은 cellTextLines/cellWords 구조일 수 있어서 둘 다 지원
-    if "text" in cell and isinstance(cell["text"], str):
-        return clean_text(cell["text"])
-
-    lines = cell.get("cellTextLines") or []
-    words: List[str] = []
-    for ln in lines:
-        for w in (ln.get("cellWords") or []):
-            t = w.get("inferText")
-            if t:
-                words.append(t)
-    return clean_text(" ".join(words))
-
-def normalize_cells_for_mapping(raw_cells: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    tables.cells가 CLOVA 원본 형태든, 우리가 저장한 major_tables_raw 형태든 둘 다 처리
-    """
-    norm: List[Dict[str, Any]] = []
-    for c in raw_cells:
-        norm.append({
-            "rowIndex": int(c.get("rowIndex", 0)),
-            "columnIndex": int(c.get("columnIndex", 0)),
-            "rowSpan": int(c.get("rowSpan", 1) or 1),
-            "columnSpan": int(c.get("columnSpan", 1) or 1),
-            "text": _join_cell_text(c),
-        })
-    return norm
-
-def build_cell_map(cells: List[Dict[str, Any]]) -> Dict[Tuple[int, int], Dict[str, Any]]:
-    m: Dict[Tuple[int, int], Dict[str, Any]] = {}
-    for c in cells:
-        m[(c["rowIndex"], c["columnIndex"])] = c
-    return m
-
-def is_empty_table(cells: List[Dict[str, Any]]) -> bool:
-    """
-    ✅ 비어있는 표 필터:
-    - 텍스트가 너무 적거나
-    - 연번(col=0)에 숫자 연번이 하나도 없으면 빈 표
-    """
-    texts = [remove_all_spaces(c.get("text", "")) for c in cells]
-    texts = [t for t in texts if t]
-    if len(texts) < 10:
-        return True
-
-    for c in cells:
-        if c["columnIndex"] != 0:
-            continue
-        t = remove_all_spaces(c.get("text", ""))
-        if t.isdigit() and c["rowIndex"] >= 2:
-            return False
-
-    return True
-
-def parse_major_table_to_items(
-    cells: List[Dict[str, Any]],
-    user_no: str,
-    area_div: str,
-    career_div: str,
-) -> List[Dict[str, Any]]:
-    """
-    ✅ 너가 지정한 매핑:
-    참여기간 -> car_s_date, car_f_date, car_days(총일수)
-    사업명 -> pjt_nm
-    발주자 -> order_nm
-    대상물규모 -> con_detail
-    주요용도 -> con_type1
-    직위 -> respon
-    담당업무 -> duty_job
-    업무분야 -> duty_field
-    구분 -> fire_div
-    (연번은 업로드 X)
-    """
-    cell_map = build_cell_map(cells)
-
-    # 연번 숫자 셀(col=0, rowIndex>=2)
-    serials = []
-    for c in cells:
-        if c["columnIndex"] != 0:
-            continue
-        t = remove_all_spaces(c.get("text", ""))
-        if t.isdigit() and c["rowIndex"] >= 2:
-            serials.append(c)
-
-    serials.sort(key=lambda x: x["rowIndex"])
-
-    items: List[Dict[str, Any]] = []
-
-    for sc in serials:
-        r0 = sc["rowIndex"]
-        span = sc.get("rowSpan", 1)
-        r_last = r0 + span - 1
-
-        def cell_txt(r: int, col: int) -> str:
-            c = cell_map.get((r, col))
-            return clean_single_line(c["text"]) if c else ""
-
-        # ✅ 참여기간: rowSpan 범위(r0 ~ r_last)의 col=1 텍스트를 전부 합쳐서 파싱
-        participation = " ".join(
-            [cell_txt(r, 1) for r in range(r0, r_last + 1)]
-        )
-
-        car_s_date, car_f_date, car_days = parse_participation_period(participation)
-
-
-        # col=2는 (사업명/발주자/대상물규모) 3줄로 들어오는 타입을 우선 지원
-        pjt_nm     = cell_txt(r0, 2)
-        order_nm   = cell_txt(r0 + 1, 2) if r0 + 1 <= r_last else ""
-        con_detail = cell_txt(r0 + 2, 2) if r0 + 2 <= r_last else ""
-
-        con_type1  = cell_txt(r0, 3)  # 주요용도
-        respon     = cell_txt(r0, 4)  # 직위
-        duty_job   = cell_txt(r0, 5)  # 담당업무
-        duty_field = cell_txt(r0, 6)  # 업무분야
-        fire_div   = cell_txt(r0, 7)  # 구분
-
-        def v(s: str) -> Optional[str]:
-            s = remove_all_spaces(clean_single_line(s))
-            return s if s else None
-
-
-        item = {
-            "user_no": user_no,
-            "area_div": area_div,
-            "career_div": career_div,
-
-            "car_s_date": car_s_date,
-            "car_f_date": car_f_date,
-            "car_days": car_days,
-
-            "pjt_nm": v(pjt_nm),
-            "order_nm": v(order_nm),
-            "con_detail": v(con_detail),
-
-            "con_type1": v(con_type1),
-            "respon": v(respon),
-            "duty_job": v(duty_job),
-            "duty_field": v(duty_field),
-            "fire_div": v(fire_div),
-        }
-
-        # 시작일 없는 건 버림(너 규칙)
-        if item["car_s_date"] is None:
-            continue
-
-        # 완전 빈 항목 방지
-        has_any = any([
-            item["car_s_date"], item["car_f_date"], item["car_days"],
-            item["pjt_nm"], item["order_nm"], item["con_detail"],
-            item["con_type1"], item["respon"], item["duty_job"],
-            item["duty_field"], item["fire_div"]
-        ])
-        if not has_any:
-            continue
-
-        items.append(item)
-
-    return items
-
-# ============================================================
-# ✅ main
-# ============================================================
-def main():
-    pdf_path = Path(PDF_PATH)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {PDF_PATH}")
-
-    # 1) OCR 실행
-    clova = load_or_run_ocr(PDF_PATH)
-
-    # 2) 주요기술경력 페이지 찾기 (상단 기준)
-    with pdfplumber.open(PDF_PATH) as pdf:
-        major_pages = find_major_pages_top(
-            clova=clova,
-            pdf=pdf,
-            keyword=KEYWORD,
-            top_ratio=TOP_RATIO
-        )
-
-    print(f"[MAJOR] keyword='{KEYWORD}' pages={major_pages}")
-
-    if not major_pages:
-        print("[WARN] No major pages found.")
-        Path(OUT_JSON).write_text("[]", encoding="utf-8")
-        return
-
-    # 3) pages -> tables -> 빈표 필터 -> 매핑
-    images = clova.get("images") or []
-    all_items: List[Dict[str, Any]] = []
-
-    for pno in major_pages:
-        if pno - 1 >= len(images):
-            continue
-        img = images[pno - 1]
-        tables = img.get("tables") or []
-        print(f"[PAGE] {pno} tables={len(tables)}")
-
-        for ti, t in enumerate(tables):
-            raw_cells = t.get("cells") or []
-            if not raw_cells:
-                print(f"  - table[{ti}] skip: no cells")
-                continue
-
-            cells = normalize_cells_for_mapping(raw_cells)
-
-            if is_empty_table(cells):
-                print(f"  - table[{ti}] skip: empty table")
-                continue
-
-            items = parse_major_table_to_items(
-                cells=cells,
-                user_no=USER_NO,
-                area_div=AREA_DIV,
-                career_div=CAREER_DIV_VALUE,
-            )
-
-            print(f"  - table[{ti}] mapped items={len(items)}")
-            all_items.extend(items)
-
-    # 4) 저장
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(all_items, f, ensure_ascii=False, indent=2)
-
-    print(f"[OK] saved: {OUT_JSON}  items={len(all_items)}")
-
-
-if __name__ == "__main__":
-    main()
-
+import os
+import re
+import json
+import time
+import uuid
+import calendar
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Optional
+
+import requests
+import pdfplumber
+
+from clova_ocr import (
+    ocr_cache_key, load_ocr_cache, save_ocr_cache, run_ocr_with_page_cache,
+    stream_ocr_cache, save_ocr_cache_images, load_clova_response, JSON_READ_BYTES,
+    HeaderBands, HEADER_BAND_RATIOS, classify_pages_by_header, matched_page_gaps, PageReorderBuffer,
+)
+
+# ============================================================
+# ✅ 실행 설정 (여기만 바꾸면 됨)
+# ============================================================
+PDF_PATH = r"C:/file/소방기술인협회/현준식(소방).pdf"
+
+# ✅ 최종 매핑 결과(items) 저장
+OUT_JSON = "현준식.json"
+
+USER_NO  = "hjs"
+AREA_DIV = "소방"
+CAREER_DIV_VALUE = "주요기술경력"   # 웹 payload에 맞게 필요시 변경
+
+# "주요기술경력" 페이지 필터 키워드
+KEYWORD = "주요기술경력"
+TOP_RATIO = 0.30   # 페이지 상단 30%에서만 키워드 탐색
+
+# ============================================================
+# ✅ CLOVA OCR 설정
+# ============================================================
+CLOVA_OCR_API_URL = os.environ.get(
+    "CLOVA_OCR_API_URL",
+    ""
+)
+CLOVA_OCR_SECRET = os.environ.get(
+    "CLOVA_OCR_SECRET",
+    ""
+)
+
+# OCR 결과 캐시 (PDF 내용 SHA-256 + OCR 옵션 기준, gzip, OCR 추출기끼리 공유)
+OCR_CACHE_DIR = "clova_ocr_cache"
+USE_CACHE_IF_EXISTS = True
+OCR_CACHE_MAX_MB = 2048         # 넘으면 오래 안 쓴 것부터 삭제 (0이면 제한 없음)
+OCR_CACHE_MAX_AGE_DAYS = 90     # 마지막 사용 후 이 기간 지나면 삭제 (0이면 제한 없음)
+
+OCR_TABLE_DETECTION = True     # 표(tables) 받기 - 파서가 표 셀을 씀
+
+# 큰 PDF 분할 OCR
+PAGES_PER_CHUNK = 10
+SAVE_OCR_CHUNKS = False       # True면 분할 PDF를 <stem>_chunks/ 에도 저장(디버그용, 기본은 메모리에서만 분할)
+OCR_MAX_IN_FLIGHT = 4         # chunk 동시 요청 수
+OCR_RATE_PER_SEC = 3.0        # 초당 요청 시작 수 상한(token bucket, 0이면 제한 없음) - 예전 OCR_SLEEP_SEC=0.3 간격과 같은 속도
+OCR_RATE_BURST = 1
+OCR_TIMEOUT_SEC = 180         # 요청 1건 타임아웃 (넘으면 그 chunk를 반으로 나눠 다시)
+OCR_CHUNK_MAX_MB = 20         # chunk 업로드 크기 상한 (넘으면 보내기 전에 반으로 나눔, 0이면 페이지 수로만)
+OCR_MAX_RETRIES = 3           # 429/5xx/연결 끊김 재시도 횟수 (지수 backoff, Retry-After 있으면 그 값)
+OCR_RETRY_BACKOFF_SEC = 1.0
+
+# 업로드 전 래스터화: 원본 스캔(고해상도 컬러) 대신 페이지를 회색조로 다시 렌더한 작은 PDF를 업로드
+#   - 페이지 크기(pt)는 원본 그대로 -> OCR 좌표(이미지 w/h 기준 정규화)는 그대로 맞음
+OCR_RASTER = False
+OCR_RASTER_DPI = 200
+OCR_RASTER_FORMAT = "jpeg"     # "jpeg"(손실, 작음) | "png"(무손실 deflate)
+OCR_RASTER_QUALITY = 80        # jpeg 품질
+
+# 2단계 OCR: 1) 페이지 상단 TOP_RATIO 밴드만 저해상도로 격자 이미지 1장에 모아 OCR(표 감지 없음) -> KEYWORD 페이지 분류
+#           2) 그 페이지만 표 감지 켜고 전체 OCR (나머지 페이지는 빈 결과, 과금 페이지/시간 절약)
+#   - 1단계에서 한 페이지도 못 찾으면 예전처럼 전체 페이지 OCR
+#   - ⚠️ 썸네일 OCR이 키워드를 놓친 페이지는 OCR 안 됨 -> 그 페이지 항목이 빠짐 (기본 꺼짐, 쓰면 [WARN] 페이지 구멍 확인)
+TWO_STAGE_OCR = False
+HEADER_OCR_DPI = 100              # 상단 밴드 썸네일 해상도
+HEADER_OCR_COLS = 4               # 격자 열 수
+HEADER_OCR_PAGES_PER_SHEET = 40   # 이미지 1장(요청 1건)에 넣는 페이지 수
+
+# 스트리밍 파싱: OCR chunk 응답이 오는 대로 그 페이지만 분류 + 표 파싱 (남은 chunk OCR 기다리는 동안 CPU 사용)
+#   - 결과는 reorder buffer로 페이지 순서 그대로 -> JSON은 한 번에 파싱할 때와 같음
+OCR_STREAM_PARSE = True
+
+# ============================================================
+# ✅ 공용 유틸
+# ============================================================
+def clean_text(s: str) -> str:
+    if not s:
+        return ""
+    s = s.replace("\u00a0", " ")
+    s = re.sub(r"[ \t]+", " ", s)
+    s = re.sub(r"\n+", "\n", s)
+    return s.strip()
+
+def clean_single_line(s: str) -> str:
+    if not s:
+        return ""
+    s = s.replace("\u00a0", " ")
+    s = s.replace("\n", " ")
+    s = re.sub(r"[ \t]+", " ", s)
+    s = re.sub(r"\s+", " ", s)
+    return s.strip()
+
+def remove_all_spaces(s: str) -> str:
+    if not s:
+        return ""
+    s = str(s).replace("\u00a0", " ")
+    return re.sub(r"\s+", "", s).strip()
+
+def normalize_ocr_key(s: str) -> str:
+    if not s:
+        return ""
+    s = s.replace("\u00a0", " ").lower()
+    s = re.sub(r"\s+", "", s)
+    s = re.sub(r"[^0-9a-z가-힣]", "", s)
+    return s
+
+# ============================================================
+# ✅ 참여기간 파싱: (시작일, 종료일, 총일수)
+# ============================================================
+DATE_RE = re.compile(r"(\d{4})[.\-/](\d{2})[.\-/](\d{2})")
+YM_RE   = re.compile(r"(\d{4})[.\-/](\d{2})(?![.\-/]\d{2})")
+DAYS_RE = re.compile(r"\(\s*([\d,]+)\s*일?\s*\)")
+
+def _to_dotdate(y: int, m: int, d: int) -> str:
+    return f"{y:04d}.{m:02d}.{d:02d}"
+
+def dotdate_to_iso(s: Optional[str]) -> Optional[str]:
+    if not s:
+        return None
+    return s.replace(".", "-")
+
+def parse_participation_period(text: str) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    if not text:
+        return None, None, None
+
+    t = clean_single_line(str(text))
+    t_nospace = re.sub(r"\s+", "", t)
+
+    dates = DATE_RE.findall(t_nospace)
+    start_dot = end_dot = None
+    if len(dates) >= 1:
+        y, m, d = map(int, dates[0])
+        start_dot = _to_dotdate(y, m, d)
+    if len(dates) >= 2:
+        y, m, d = map(int, dates[1])
+        end_dot = _to_dotdate(y, m, d)
+
+    if start_dot is None and end_dot is None:
+        yms = YM_RE.findall(t_nospace)
+        if len(yms) >= 1:
+            y, m = map(int, yms[0])
+            start_dot = _to_dotdate(y, m, 1)
+        if len(yms) >= 2:
+            y, m = map(int, yms[1])
+            end_dot = _to_dotdate(y, m, calendar.monthrange(y, m)[1])
+
+    car_days = None
+    m = DAYS_RE.search(t)
+    if m:
+        try:
+            car_days = int(m.group(1).replace(",", ""))
+        except:
+            car_days = None
+
+    return dotdate_to_iso(start_dot), dotdate_to_iso(end_dot), car_days
+
+# ============================================================
+# ✅ CLOVA OCR 호출
+# ============================================================
+def _post_clova_ocr(file_name: str, f, image_format: str, table_detection: bool) -> Dict[str, Any]:
+    if not CLOVA_OCR_API_URL or not CLOVA_OCR_SECRET:
+        raise RuntimeError("CLOVA_OCR_API_URL / CLOVA_OCR_SECRET 설정이 비어있음.")
+
+    headers = {"X-OCR-SECRET": CLOVA_OCR_SECRET}
+    req = {
+        "version": "V2",
+        "requestId": str(uuid.uuid4()),
+        "timestamp": int(time.time() * 1000),
+
+        # ✅ 표 추출
+        "enableTableDetection": table_detection,
+
+        "images": [{"format": image_format, "name": "major_career"}],
+    }
+
+    files = {"file": (file_name, f)}
+    data = {"message": json.dumps(req)}
+    with requests.post(CLOVA_OCR_API_URL, headers=headers, data=data, files=files,
+                       timeout=OCR_TIMEOUT_SEC, stream=True) as r:
+        if r.status_code >= 400:
+            body = r.text if hasattr(r, "text") else "<no-body>"
+            kind = "Server" if r.status_code >= 500 else "Client"  # requests raise_for_status와 같은 문구
+            raise requests.exceptions.HTTPError(f"{r.status_code} {kind} Error: {body}", response=r)
+
+        # 표 감지 응답은 페이지당 수백 KB -> 소켓에서 images 원소(페이지) 단위로 바로 dict (원문 사본 없음)
+        return load_clova_response(r.iter_content(JSON_READ_BYTES))
+
+def call_clova_ocr_pdf(pdf_path: str, pdf_stream=None) -> Dict[str, Any]:
+    """
+    PDF를 CLOVA OCR로 보내서 JSON 결과 반환
+    ✅ tables를 받기 위해 enableTableDetection True
+    """
+    # pdf_stream: 메모리에서 분할한 chunk(BytesIO), 없으면 파일 그대로 업로드
+    with (pdf_stream if pdf_stream is not None else open(pdf_path, "rb")) as f:
+        return _post_clova_ocr(Path(pdf_path).name, f, "pdf", OCR_TABLE_DETECTION)
+
+def call_clova_ocr_image(name: str, img_stream) -> Dict[str, Any]:
+    # 2단계 OCR 1단계: 상단 밴드 썸네일 격자 이미지 (표 감지 없이 텍스트만)
+    with img_stream as f:
+        return _post_clova_ocr(name, f, Path(name).suffix.lstrip(".").lower(), False)
+
+# ============================================================
+# ✅ PDF 분할 + images 병합
+# ============================================================
+def _merge_clova_images(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {"images": []}
+    for c in chunks:
+        merged["images"].extend(c.get("images") or [])
+    return merged
+
+def _ocr_raster_options() -> Optional[Dict[str, Any]]:
+    if not OCR_RASTER:
+        return None
+    return {"dpi": OCR_RASTER_DPI, "format": OCR_RASTER_FORMAT, "quality": OCR_RASTER_QUALITY}
+
+def _ocr_cache_options() -> Dict[str, Any]:
+    # 캐시 키에 들어가는 요청 옵션 (결과가 달라지는 것만, requestId/timestamp 제외)
+    options = {"version": "V2", "enableTableDetection": OCR_TABLE_DETECTION}
+    if OCR_RASTER:
+        options["raster"] = _ocr_raster_options()
+    return options
+
+def classify_keyword_pages(pdf_path: str) -> Optional[List[int]]:
+    # 2단계 OCR 1단계: 상단 밴드 썸네일로 KEYWORD 페이지만 고름 (못 찾으면 None -> 전체 OCR)
+    key_norm = normalize_ocr_key(KEYWORD)
+    pages = classify_pages_by_header(
+        pdf_path, call_clova_ocr_image, lambda txt: key_norm in normalize_ocr_key(txt),
+        ratio=TOP_RATIO, dpi=HEADER_OCR_DPI, cols=HEADER_OCR_COLS, pages_per_sheet=HEADER_OCR_PAGES_PER_SHEET,
+        max_in_flight=OCR_MAX_IN_FLIGHT, rate_per_sec=OCR_RATE_PER_SEC, burst=OCR_RATE_BURST,
+        max_retries=OCR_MAX_RETRIES, backoff_sec=OCR_RETRY_BACKOFF_SEC,
+    )
+    if not pages:
+        print(f"[WARN] header classify: '{KEYWORD}' not found -> full OCR")
+        return None
+    gaps = matched_page_gaps(pages)
+    if gaps:
+        print(f"[WARN] header classify: pages {gaps} between matches {pages[0]}~{pages[-1]} not matched"
+              f" -> '{KEYWORD}' may have been missed there (not OCR'd; TWO_STAGE_OCR=False for full OCR)")
+    return pages
+
+def load_or_run_ocr(pdf_path: str, on_pages=None) -> Optional[Dict[str, Any]]:
+    # 파일 전체 캐시(빠른 경로) -> 없으면 페이지 단위 캐시로 없는 페이지만 OCR
+    # on_pages(페이지 목록, image 목록): 스트리밍 파싱 (run_ocr_with_page_cache 참고)
+    #   - 페이지를 모아 두지 않음: 캐시 파일도 한 장씩 읽고, 반환은 None (메모리가 페이지 수와 무관)
+    doc_options = {**_ocr_cache_options(), "pages_per_chunk": PAGES_PER_CHUNK}
+    if TWO_STAGE_OCR:
+        # 분류된 페이지만 들어 있는 결과 -> 전체 OCR 결과와 캐시 따로
+        doc_options["two_stage"] = {"keyword": KEYWORD, "top_ratio": TOP_RATIO, "dpi": HEADER_OCR_DPI}
+    cache_key = ocr_cache_key(pdf_path, doc_options) if USE_CACHE_IF_EXISTS else None
+    if cache_key and on_pages:
+        complete, delivered = stream_ocr_cache(OCR_CACHE_DIR, cache_key, OCR_CACHE_MAX_AGE_DAYS, on_pages)
+        if complete:
+            return None
+        if delivered:
+            # 캐시가 도중에 깨짐(지워짐) -> 이미 넘긴 페이지는 빼고 OCR 결과에서 이어서
+            print(f"[WARN] OCR cache broken after {delivered} pages -> OCR")
+            on_pages = _skip_pages(on_pages, delivered)
+    elif cache_key:
+        cached = load_ocr_cache(OCR_CACHE_DIR, cache_key, OCR_CACHE_MAX_AGE_DAYS)
+        if cached is not None:
+            print(f"[OCR] load cache: {cache_key[:12]} ({OCR_CACHE_DIR})")
+            return cached
+
+    pages = classify_keyword_pages(pdf_path) if TWO_STAGE_OCR else None
+
+    clova = run_ocr_with_page_cache(
+        pdf_path, call_clova_ocr_pdf, _merge_clova_images, _ocr_cache_options(),
+        cache_dir=OCR_CACHE_DIR if USE_CACHE_IF_EXISTS else None,
+        pages_per_chunk=PAGES_PER_CHUNK,
+        max_in_flight=OCR_MAX_IN_FLIGHT, rate_per_sec=OCR_RATE_PER_SEC, burst=OCR_RATE_BURST,
+        save_dir=str(Path(pdf_path).parent / f"{Path(pdf_path).stem}_chunks") if SAVE_OCR_CHUNKS else None,
+        max_mb=OCR_CACHE_MAX_MB, max_age_days=OCR_CACHE_MAX_AGE_DAYS,
+        raster=_ocr_raster_options(),
+        max_chunk_bytes=int(OCR_CHUNK_MAX_MB * 1024 * 1024),
+        max_retries=OCR_MAX_RETRIES, backoff_sec=OCR_RETRY_BACKOFF_SEC,
+        pages=pages,
+        on_pages=on_pages,
+        keep_images=on_pages is None,
+    )
+
+    if cache_key and clova["images"] is not None:
+        try:
+            if on_pages:
+                # 페이지 캐시에서 한 장씩 다시 읽어 써 내려감
+                saved = save_ocr_cache_images(OCR_CACHE_DIR, cache_key, clova["images"],
+                                              OCR_CACHE_MAX_MB, OCR_CACHE_MAX_AGE_DAYS)
+            else:
+                saved = save_ocr_cache(OCR_CACHE_DIR, cache_key, clova, OCR_CACHE_MAX_MB, OCR_CACHE_MAX_AGE_DAYS)
+            print(f"[OCR] saved cache: {saved}")
+        except Exception as e:
+            print(f"[WARN] cache save failed: {e}")
+
+    return None if on_pages else clova
+
+def _skip_pages(on_pages, upto: int):
+    def _on_pages(pnos: List[int], imgs: List[Dict[str, Any]]):
+        keep = [(pno, img) for pno, img in zip(pnos, imgs) if pno > upto]
+        if keep:
+            on_pages([pno for pno, _ in keep], [img for _, img in keep])
+    return _on_pages
+
+# ============================================================
+# ✅ 1) "주요기술경력" 페이지 찾기 (상단 TOP_RATIO만)
+# ============================================================
+def _get_page_image_h(img_obj: Dict[str, Any], fallback_h: float) -> float:
+    info = img_obj.get("convertedImageInfo") or {}
+    h = info.get("height")
+    if h:
+        return float(h)
+    h2 = img_obj.get("height")
+    return float(h2) if h2 else float(fallback_h)
+
+def build_header_bands(clova: Dict[str, Any], pdf, ratios=HEADER_BAND_RATIOS) -> HeaderBands:
+    # 페이지 상단 텍스트표: 페이지당 field 1회 돌면서 밴드 비율별 텍스트를 같이 모음
+    # (중심 y = vertex y 평균, 이미지 픽셀 기준 -> 기존 판정 그대로)
+    bands = HeaderBands(ratios, key=normalize_ocr_key)
+    images = clova.get("images") or []
+
+    for i0, page in enumerate(pdf.pages):
+        if i0 >= len(images):
+            break
+        img = images[i0]
+        bands.add_page(_page_field_centers(img), _get_page_image_h(img, fallback_h=page.height))
+
+    return bands
+
+def _page_field_centers(img: Dict[str, Any]) -> List[Tuple[float, str]]:
+    centers: List[Tuple[float, str]] = []
+    for f in (img.get("fields") or []):
+        txt = f.get("inferText", "")
+        if not txt:
+            continue
+        bp = f.get("boundingPoly") or {}
+        verts = bp.get("vertices") or []
+        if not verts:
+            continue
+        cy = sum([v.get("y", 0) for v in verts]) / max(len(verts), 1)
+        centers.append((cy, txt))
+    return centers
+
+def page_has_keyword_top(img: Dict[str, Any], page_h: float, keyword: str, top_ratio: float) -> bool:
+    # 스트리밍 파싱용 페이지 1장 판정 (build_header_bands + 페이지 찾기와 같은 규칙)
+    bands = HeaderBands((top_ratio,), key=normalize_ocr_key)
+    bands.add_page(_page_field_centers(img), _get_page_image_h(img, fallback_h=page_h))
+    return normalize_ocr_key(keyword) in bands.key(0, top_ratio)
+
+def find_major_pages_top(bands: HeaderBands, keyword: str, top_ratio: float) -> List[int]:
+    key_norm = normalize_ocr_key(keyword)
+    pages: List[int] = []
+
+    for i0 in range(len(bands)):
+        if key_norm in bands.key(i0, top_ratio):
+            pages.append(i0 + 1)
+
+    return pages
+
+# ============================================================
+# ✅ 2) tables/cells -> 매핑(items)
+# ============================================================
+def _join_cell_text(cell: Dict[str, Any]) -> str:
+    # 원본 CLOVA 응답은 cellTextLines/cellWords 구조일 수 있어서 둘 다 지원
+    if "text" in cell and isinstance(cell["text"], str):
+        return clean_text(cell["text"])
+
+    lines = cell.get("cellTextLines") or []
+    words: List[str] = []
+    for ln in lines:
+        for w in (ln.get("cellWords") or []):
+            t = w.get("inferText")
+            if t:
+                words.append(t)
+    return clean_text(" ".join(words))
+
+def normalize_cells_for_mapping(raw_cells: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    tables.cells가 CLOVA 원본 형태든, 우리가 저장한 major_tables_raw 형태든 둘 다 처리
+    """
+    norm: List[Dict[str, Any]] = []
+    for c in raw_cells:
+        norm.append({
+            "rowIndex": int(c.get("rowIndex", 0)),
+            "columnIndex": int(c.get("columnIndex", 0)),
+            "rowSpan": int(c.get("rowSpan", 1) or 1),
+            "columnSpan": int(c.get("columnSpan", 1) or 1),
+            "text": _join_cell_text(c),
+        })
+    return norm
+
+class TableIndex:
+    """
+    표 1개 인덱스 (표마다 1번 만들고 빈 표 판정/매핑이 같이 씀 -> 셀 텍스트 정규화도 셀마다 1번)
+    text(r, col)   : 한 줄 텍스트 (clean_single_line, 처음 읽을 때 1번), 없는 셀은 ""
+    text_ns(r, col): 공백 제거 텍스트 (remove_all_spaces), 없는 셀은 ""
+    n_texts        : 텍스트 있는 셀 수
+    serials        : 연번 숫자 셀(col=0, rowIndex>=2) 행 순서 - 한 건의 시작 행
+    """
+
+    def __init__(self, cells: List[Dict[str, Any]]):
+        self._raw: Dict[Tuple[int, int], str] = {}
+        self._ns: Dict[Tuple[int, int], str] = {}
+        self._line: Dict[Tuple[int, int], str] = {}
+        self.n_texts = 0
+        self.serials: List[Dict[str, Any]] = []
+        for c in cells:
+            key = (c["rowIndex"], c["columnIndex"])
+            raw = c.get("text", "")
+            ns = remove_all_spaces(raw)  # clean_single_line은 공백만 바꿈 -> 원문에서 바로 (한 줄 텍스트는 읽을 때)
+            self._raw[key] = raw  # 같은 위치 셀이 또 있으면 마지막 것
+            self._ns[key] = ns
+            if ns:
+                self.n_texts += 1
+            if c["columnIndex"] == 0 and ns.isdigit() and c["rowIndex"] >= 2:
+                self.serials.append(c)
+        self.serials.sort(key=lambda x: x["rowIndex"])
+
+    def text(self, r: int, col: int) -> str:
+        key = (r, col)
+        line = self._line.get(key)
+        if line is None:
+            line = self._line[key] = clean_single_line(self._raw.get(key, ""))
+        return line
+
+    def text_ns(self, r: int, col: int) -> str:
+        return self._ns.get((r, col), "")
+
+def is_empty_table(idx: TableIndex) -> bool:
+    """
+    ✅ 비어있는 표 필터:
+    - 텍스트가 너무 적거나
+    - 연번(col=0)에 숫자 연번이 하나도 없으면 빈 표
+    """
+    if idx.n_texts < 10:
+        return True
+    return not idx.serials
+
+def parse_major_table_to_items(
+    idx: TableIndex,
+    user_no: str,
+    area_div: str,
+    career_div: str,
+) -> List[Dict[str, Any]]:
+    """
+    ✅ 너가 지정한 매핑:
+    참여기간 -> car_s_date, car_f_date, car_days(총일수)
+    사업명 -> pjt_nm
+    발주자 -> order_nm
+    대상물규모 -> con_detail
+    주요용도 -> con_type1
+    직위 -> respon
+    담당업무 -> duty_job
+    업무분야 -> duty_field
+    구분 -> fire_div
+    (연번은 업로드 X)
+    """
+    def v(s: str) -> Optional[str]:
+        # s: TableIndex.text_ns (이미 공백 제거)
+        return s if s else None
+
+    items: List[Dict[str, Any]] = []
+
+    for sc in idx.serials:
+        r0 = sc["rowIndex"]
+        span = sc.get("rowSpan", 1)
+        r_last = r0 + span - 1
+
+        # ✅ 참여기간: rowSpan 범위(r0 ~ r_last)의 col=1 텍스트를 전부 합쳐서 파싱
+        participation = " ".join(
+            [idx.text(r, 1) for r in range(r0, r_last + 1)]
+        )
+
+        car_s_date, car_f_date, car_days = parse_participation_period(participation)
+
+
+        # col=2는 (사업명/발주자/대상물규모) 3줄로 들어오는 타입을 우선 지원
+        pjt_nm     = idx.text_ns(r0, 2)
+        order_nm   = idx.text_ns(r0 + 1, 2) if r0 + 1 <= r_last else ""
+        con_detail = idx.text_ns(r0 + 2, 2) if r0 + 2 <= r_last else ""
+
+        con_type1  = idx.text_ns(r0, 3)  # 주요용도
+        respon     = idx.text_ns(r0, 4)  # 직위
+        duty_job   = idx.text_ns(r0, 5)  # 담당업무
+        duty_field = idx.text_ns(r0, 6)  # 업무분야
+        fire_div   = idx.text_ns(r0, 7)  # 구분
+
+
+        item = {
+            "user_no": user_no,
+            "area_div": area_div,
+            "career_div": career_div,
+
+            "car_s_date": car_s_date,
+            "car_f_date": car_f_date,
+            "car_days": car_days,
+
+            "pjt_nm": v(pjt_nm),
+            "order_nm": v(order_nm),
+            "con_detail": v(con_detail),
+
+            "con_type1": v(con_type1),
+            "respon": v(respon),
+            "duty_job": v(duty_job),
+            "duty_field": v(duty_field),
+            "fire_div": v(fire_div),
+        }
+
+        # 시작일 없는 건 버림(너 규칙)
+        if item["car_s_date"] is None:
+            continue
+
+        # 완전 빈 항목 방지
+        has_any = any([
+            item["car_s_date"], item["car_f_date"], item["car_days"],
+            item["pjt_nm"], item["order_nm"], item["con_detail"],
+            item["con_type1"], item["respon"], item["duty_job"],
+            item["duty_field"], item["fire_div"]
+        ])
+        if not has_any:
+            continue
+
+        items.append(item)
+
+    return items
+
+# ============================================================
+# ✅ main
+# ============================================================
+def parse_page_tables(pno: int, img: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # 페이지 1장: tables -> 빈표 필터 -> 매핑
+    tables = img.get("tables") or []
+    print(f"[PAGE] {pno} tables={len(tables)}")
+
+    page_items: List[Dict[str, Any]] = []
+    for ti, t in enumerate(tables):
+        raw_cells = t.get("cells") or []
+        if not raw_cells:
+            print(f"  - table[{ti}] skip: no cells")
+            continue
+
+        idx = TableIndex(normalize_cells_for_mapping(raw_cells))
+
+        if is_empty_table(idx):
+            print(f"  - table[{ti}] skip: empty table")
+            continue
+
+        items = parse_major_table_to_items(
+            idx=idx,
+            user_no=USER_NO,
+            area_div=AREA_DIV,
+            career_div=CAREER_DIV_VALUE,
+        )
+
+        print(f"  - table[{ti}] mapped items={len(items)}")
+        page_items.extend(items)
+    return page_items
+
+def ocr_and_parse_streaming(pdf_path: str) -> Tuple[List[int], List[Dict[str, Any]]]:
+    # OCR chunk가 끝나는 대로 그 페이지만 주요기술경력 판정 + 표 파싱 -> reorder buffer로 페이지 순서 결과
+    with pdfplumber.open(pdf_path) as pdf:
+        page_heights = [p.height for p in pdf.pages]
+
+    major_pages: List[int] = []
+    all_items: List[Dict[str, Any]] = []
+
+    def _emit(pno: int, items: Optional[List[Dict[str, Any]]]):
+        if items is not None:
+            major_pages.append(pno)
+            all_items.extend(items)
+
+    buf = PageReorderBuffer(range(1, len(page_heights) + 1), _emit)
+
+    def _on_pages(pnos: List[int], imgs: List[Dict[str, Any]]):
+        for pno, img in zip(pnos, imgs):
+            if pno - 1 >= len(page_heights):
+                continue
+            hit = page_has_keyword_top(img, page_heights[pno - 1], KEYWORD, TOP_RATIO)
+            buf.put(pno, parse_page_tables(pno, img) if hit else None)
+
+    load_or_run_ocr(pdf_path, on_pages=_on_pages)
+    buf.flush()
+    return major_pages, all_items
+
+def main():
+    pdf_path = Path(PDF_PATH)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {PDF_PATH}")
+
+    if OCR_STREAM_PARSE:
+        # 1~3) OCR + 페이지 찾기 + 매핑을 chunk 단위로 겹쳐서
+        major_pages, all_items = ocr_and_parse_streaming(PDF_PATH)
+    else:
+        # 1) OCR 실행
+        clova = load_or_run_ocr(PDF_PATH)
+
+        # 2) 주요기술경력 페이지 찾기 (상단 기준)
+        with pdfplumber.open(PDF_PATH) as pdf:
+            bands = build_header_bands(clova, pdf, ratios=(*HEADER_BAND_RATIOS, TOP_RATIO))
+            major_pages = find_major_pages_top(
+                bands=bands,
+                keyword=KEYWORD,
+                top_ratio=TOP_RATIO
+            )
+
+        # 3) pages -> tables -> 빈표 필터 -> 매핑
+        images = clova.get("images") or []
+        all_items = []
+        for pno in major_pages:
+            if pno - 1 >= len(images):
+                continue
+            all_items.extend(parse_page_tables(pno, images[pno - 1]))
+
+    print(f"[MAJOR] keyword='{KEYWORD}' pages={major_pages}")
+
+    if not major_pages:
+        print("[WARN] No major pages found.")
+        Path(OUT_JSON).write_text("[]", encoding="utf-8")
+        return
+
+    # 4) 저장
+    with open(OUT_JSON, "w", encoding="utf-8") as f:
+        json.dump(all_items, f, ensure_ascii=False, indent=2)
+
+    print(f"[OK] saved: {OUT_JSON}  items={len(all_items)}")
+
+
+if __name__ == "__main__":
+    main()
+
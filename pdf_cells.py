@@ -0,0 +1,503 @@
+import re
+import math
+import ctypes
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+from weakref import WeakKeyDictionary
+
+try:
+    import numpy as np
+except ImportError:  # numpy 없으면 python 백엔드만 사용
+    np = None
+
+try:
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+except ImportError:  # pdfium 없으면 pdfplumber 텍스트 백엔드만 사용
+    pdfium = None
+    pdfium_c = None
+
+# ============================================================
+# ✅ 페이지 단어 인덱스 (extract_main.py / extract_elect.py 공용)
+#   - 페이지당 extract_words()는 딱 1번
+#   - 셀 1개 조회: top 범위만 bisect로 훑고 "완전 포함" 검사
+#   - 고정 레이아웃 전체 조회: 단어를 1번만 스윕해서 셀에 배정
+# ============================================================
+WORD_EXTRACT_KW = {
+    "keep_blank_chars": False,
+    "use_text_flow": False,
+}
+
+# 셀 배정용 격자 크기(pt)
+CELL_GRID_SIZE = 24.0
+
+# 셀 텍스트 백엔드: "python"(격자 스윕) | "numpy"(단어 x 셀 포함행렬 broadcasting)
+CELL_TEXT_BACKENDS = ("python", "numpy")
+
+class PageWordIndex:
+    """
+    페이지 단어 좌표/정렬키/격자 bucket을 한 번만 계산해 두고 bbox 조회에 재사용.
+    결과 순서는 기존 strict 추출과 동일: (round(top, 1), x0), 동률이면 원래 추출 순서.
+    """
+
+    def __init__(self, words: List[Dict[str, Any]], grid_size: float = CELL_GRID_SIZE):
+        self.words = list(words)
+        self.grid_size = grid_size
+
+        self._boxes = [(w["x0"], w["x1"], w["top"], w["bottom"]) for w in self.words]
+        self._sort_keys = [(round(w["top"], 1), w["x0"], i) for i, w in enumerate(self.words)]
+
+        self._order = sorted(range(len(self.words)), key=lambda i: self._boxes[i][2])
+        self._tops = [self._boxes[i][2] for i in self._order]
+
+        # 단어 좌상단(x0, top)이 속한 격자 bucket -> 단어 인덱스들 (레이아웃과 무관)
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, (wx0, _, wy0, _) in enumerate(self._boxes):
+            key = (math.floor(wx0 / grid_size), math.floor(wy0 / grid_size))
+            self._buckets.setdefault(key, []).append(i)
+
+        self._np = None  # numpy 백엔드용 배열(처음 쓸 때 1번만 생성)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _sorted_words(self, idxs: List[int]) -> List[Dict[str, Any]]:
+        idxs.sort(key=self._sort_keys.__getitem__)
+        return [self.words[i] for i in idxs]
+
+    def words_in_bbox(self, bbox: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+        x0, y0, x1, y1 = bbox
+        boxes = self._boxes
+
+        lo = bisect_left(self._tops, y0)
+        hi = bisect_right(self._tops, y1)
+
+        picked = []
+        for i in self._order[lo:hi]:
+            wx0, wx1, wy0, wy1 = boxes[i]
+            if (wx0 >= x0 and wx1 <= x1 and wy0 >= y0 and wy1 <= y1):
+                picked.append(i)
+
+        return self._sorted_words(picked)
+
+    def has_words_in_bbox(self, bbox: Tuple[float, float, float, float]) -> bool:
+        # 완전 포함 단어가 하나라도 있으면 True (정렬/텍스트 조립 없이 첫 단어에서 중단)
+        x0, y0, x1, y1 = bbox
+        boxes = self._boxes
+
+        lo = bisect_left(self._tops, y0)
+        hi = bisect_right(self._tops, y1)
+        for i in self._order[lo:hi]:
+            wx0, wx1, wy0, wy1 = boxes[i]
+            if (wx0 >= x0 and wx1 <= x1 and wy0 >= y0 and wy1 <= y1):
+                return True
+        return False
+
+    def text_in_bbox(self, bbox: Tuple[float, float, float, float]) -> str:
+        return " ".join([w["text"] for w in self.words_in_bbox(bbox)])
+
+    def words_in_cells(
+        self,
+        cells: Dict[Any, Tuple[float, float, float, float]],
+        backend: str = "python",
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+        if backend == "numpy":
+            return self._words_in_cells_numpy(cells)
+        if backend != "python":
+            raise ValueError(f"unknown cell text backend: {backend} (allowed: {CELL_TEXT_BACKENDS})")
+        return self._words_in_cells_grid(cells)
+
+    def _words_in_cells_grid(self, cells: Dict[Any, Tuple[float, float, float, float]]) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        고정 레이아웃 셀 배정 (단어 1회 스윕)
+        - 셀 사각형을 같은 격자에 등록
+        - 단어는 자기 bucket에 등록된 셀만 "완전 포함" 검사
+          (완전 포함이면 좌상단도 셀 안이므로 누락 없음, 겹치는 셀은 각각 배정)
+        cells: {key: (x0, y0, x1, y1)} (이미 clamp된 페이지 좌표) 또는 LayoutPlan
+        """
+        keys, rects = _cell_keys_rects(cells)
+        grid = _cell_grid(rects, self.grid_size)
+
+        boxes = self._boxes
+        picked: List[List[int]] = [[] for _ in keys]
+        for bucket, idxs in self._buckets.items():
+            cands = grid.get(bucket)
+            if not cands:
+                continue
+            for i in idxs:
+                wx0, wx1, wy0, wy1 = boxes[i]
+                for ci in cands:
+                    x0, y0, x1, y1 = rects[ci]
+                    if (wx0 >= x0 and wx1 <= x1 and wy0 >= y0 and wy1 <= y1):
+                        picked[ci].append(i)
+
+        return {key: self._sorted_words(idxs) for key, idxs in zip(keys, picked)}
+
+    def _numpy_arrays(self):
+        if np is None:
+            raise RuntimeError("CELL_TEXT_BACKEND='numpy' 인데 numpy가 설치되어 있지 않음. (pip install numpy)")
+        if self._np is None:
+            n = len(self.words)
+            boxes = np.array(self._boxes, dtype=np.float64).reshape(n, 4)
+            # 정렬 순위: (round(top, 1), x0, 추출 순서) 기준 전체 순위를 미리 계산
+            rank = np.empty(n, dtype=np.int64)
+            rank[sorted(range(n), key=self._sort_keys.__getitem__)] = np.arange(n, dtype=np.int64)
+            self._np = (boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3], rank)
+        return self._np
+
+    def _words_in_cells_numpy(self, cells: Dict[Any, Tuple[float, float, float, float]]) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        numpy 백엔드: 단어 x 셀 포함행렬을 broadcasting으로 한 번에 계산
+        (판정식/정렬은 python 백엔드와 동일)
+        """
+        keys, rects = _cell_keys_rects(cells)
+        if not keys or not self.words:
+            return {key: [] for key in keys}
+
+        wx0, wx1, wy0, wy1, rank = self._numpy_arrays()
+        rects = np.array(rects, dtype=np.float64).reshape(len(keys), 4)
+        cx0, cy0, cx1, cy1 = (rects[:, j:j + 1] for j in range(4))
+
+        inside = (wx0 >= cx0) & (wx1 <= cx1) & (wy0 >= cy0) & (wy1 <= cy1)  # (cells, words)
+
+        # (셀, 단어) 쌍을 셀 -> 정렬 순위 순으로 한 번에 정렬한 뒤 셀별로 자름
+        ci, wi = np.nonzero(inside)
+        order = np.lexsort((rank[wi], ci))
+        wi = wi[order].tolist()
+        bounds = np.searchsorted(ci[order], np.arange(len(keys) + 1)).tolist()
+
+        words = self.words
+        return {
+            key: [words[i] for i in wi[bounds[k]:bounds[k + 1]]]
+            for k, key in enumerate(keys)
+        }
+
+    def texts_in_cells(
+        self,
+        cells: Dict[Any, Tuple[float, float, float, float]],
+        backend: str = "python",
+    ) -> Dict[Any, str]:
+        return {
+            key: " ".join([w["text"] for w in picked])
+            for key, picked in self.words_in_cells(cells, backend=backend).items()
+        }
+
+def _cell_keys_rects(cells) -> Tuple[List[Any], Tuple[Tuple[float, float, float, float], ...]]:
+    if isinstance(cells, LayoutPlan):
+        return list(cells.keys), cells.rects
+    keys = list(cells.keys())
+    return keys, tuple(tuple(cells[k]) for k in keys)
+
+@lru_cache(maxsize=64)
+def _cell_grid(rects: Tuple[Tuple[float, float, float, float], ...], size: float) -> Dict[Tuple[int, int], List[int]]:
+    # 셀 사각형 -> 격자 bucket 등록 (같은 레이아웃/페이지 크기면 재사용)
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for ci, (x0, y0, x1, y1) in enumerate(rects):
+        for gx in range(math.floor(x0 / size), math.floor(x1 / size) + 1):
+            for gy in range(math.floor(y0 / size), math.floor(y1 / size) + 1):
+                grid.setdefault((gx, gy), []).append(ci)
+    return grid
+
+def assign_words_to_cells(
+    words: List[Dict[str, Any]],
+    cells: Dict[Any, Tuple[float, float, float, float]],
+    backend: str = "python",
+) -> Dict[Any, List[Dict[str, Any]]]:
+    return PageWordIndex(words).words_in_cells(cells, backend=backend)
+
+# ============================================================
+# ✅ 레이아웃 컴파일 (레이아웃 dict -> 페이지 좌표 사각형 평탄 배열)
+#   - clamp까지 끝낸 사각형을 페이지 크기(page.bbox)별로 1번만 계산
+#   - 같은 양식(A4) 묶음이면 추출/디버그 PNG 모두 같은 plan 재사용
+# ============================================================
+def clamp_bbox(bbox, page_bbox):
+    x0, y0, x1, y1 = bbox
+    px0, py0, px1, py1 = page_bbox  # (0,0,w,h)
+    x0 = max(px0, min(x0, px1))
+    x1 = max(px0, min(x1, px1))
+    y0 = max(py0, min(y0, py1))
+    y1 = max(py0, min(y1, py1))
+    if x1 <= x0: x1 = x0 + 0.1
+    if y1 <= y0: y1 = y0 + 0.1
+    return (x0, y0, x1, y1)
+
+class LayoutPlan:
+    """
+    keys/rects: 셀 key와 clamp된 사각형 (같은 순서의 평탄 배열)
+    frames: 디버그용 외곽 박스(BIG_BOX, 레코드 행 등) {label: rect}
+    """
+
+    def __init__(self, cells: Dict[Any, Tuple[float, float, float, float]],
+                 frames: Dict[Any, Tuple[float, float, float, float]] = None):
+        self.keys = tuple(cells.keys())
+        self.rects = tuple(tuple(r) for r in cells.values())
+        self.cells = dict(zip(self.keys, self.rects))
+        self.frames = dict(frames or {})
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def items(self):
+        return zip(self.keys, self.rects)
+
+    def subset(self, keys) -> "LayoutPlan":
+        # 일부 셀만 남긴 plan (rect는 이미 clamp된 값 그대로, frames 공유)
+        keep = set(keys)
+        if len(keep) >= len(self.keys) and all(k in keep for k in self.keys):
+            return self
+        return LayoutPlan({k: r for k, r in self.items() if k in keep}, self.frames)
+
+_LAYOUT_PLANS: Dict[Tuple[Any, Tuple[float, ...]], LayoutPlan] = {}
+
+def get_layout_plan(page, build) -> LayoutPlan:
+    """
+    build(page) -> (cells, frames): clamp 전 페이지 좌표 {key: bbox}, {label: bbox}
+    메모 key는 (build, page.bbox) -> 모듈/레이아웃별로 분리되고 페이지 크기별로 공유
+    """
+    page_bbox = tuple(page.bbox)
+    memo_key = (build, page_bbox)
+    plan = _LAYOUT_PLANS.get(memo_key)
+    if plan is None:
+        cells, frames = build(page)
+        plan = LayoutPlan(
+            {k: clamp_bbox(b, page_bbox) for k, b in cells.items()},
+            {k: clamp_bbox(b, page_bbox) for k, b in (frames or {}).items()},
+        )
+        _LAYOUT_PLANS[memo_key] = plan
+    return plan
+
+def clear_layout_plans() -> None:
+    _LAYOUT_PLANS.clear()
+
+# ============================================================
+# ✅ 헤더 밴드 probe (페이지 분류용)
+#   - crop().extract_text() 대신 page.chars에서 top <= ratio*height 인 글자만 모음
+#   - 단어/줄 조립 없이 (줄, x0) 순서로 이어붙이고 normalize_ocr_key와 같은 정규화
+#   - 찾는 키가 나오면 남은 줄은 보지 않고 바로 반환
+# ============================================================
+HEADER_LINE_TOL = 3.0  # 같은 줄로 보는 top 차이(pt) (extract_text 기본 y_tolerance)
+
+def normalize_header_key(s: str) -> str:
+    if not s:
+        return ""
+    s = s.replace("\u00a0", " ").lower()
+    s = re.sub(r"\s+", "", s)
+    s = re.sub(r"[^0-9a-z가-힣]", "", s)
+    return s
+
+def iter_header_band_lines(page, top_ratio: float = 0.20, backend: str = "pdfplumber"):
+    # 상단 밴드 글자 -> 줄 단위 원문 문자열 (위에서 아래 순서)
+    limit = page.height * top_ratio
+    width = page.width
+    chars = [c for c in get_page_chars(page, backend) if c["top"] <= limit and c["x0"] < width and c["x1"] > 0]
+    if not chars:
+        return
+
+    chars.sort(key=lambda c: (c["top"], c["x0"]))
+    line = [chars[0]]
+    line_top = chars[0]["top"]
+    for c in chars[1:]:
+        if c["top"] - line_top > HEADER_LINE_TOL:
+            line.sort(key=lambda d: d["x0"])
+            yield "".join(d["text"] for d in line)
+            line = []
+            line_top = c["top"]
+        line.append(c)
+    line.sort(key=lambda d: d["x0"])
+    yield "".join(d["text"] for d in line)
+
+def header_band_key(page, top_ratio: float = 0.20, backend: str = "pdfplumber") -> str:
+    return "".join(normalize_header_key(t) for t in iter_header_band_lines(page, top_ratio, backend))
+
+def _strip_spaces(s: str) -> str:
+    return re.sub(r"\s+", "", s.replace("\u00a0", " ")) if s else ""
+
+def header_band_titles(page, titles, top_ratio: float = 0.20, backend: str = "pdfplumber") -> List[str]:
+    """
+    titles: 원문 제목 목록 ("1. 기술경력" 등)
+    반환  : 상단 밴드 어느 한 줄에 들어 있는 제목 전부 (titles 순서)
+      - 줄과 제목 둘 다 공백만 지우고 비교 (구두점은 남김 -> "2021 기술경력"은 "1. 기술경력"이 아님)
+      - crop().extract_text() + clean_text 줄에서 제목 찾던 것과 같은 기준 (글자 사이 공백 유무만 무시)
+    """
+    keys = [(t, _strip_spaces(t)) for t in titles]
+    found = set()
+    for line in iter_header_band_lines(page, top_ratio, backend):
+        line_ns = _strip_spaces(line)
+        for t, k in keys:
+            if k and k in line_ns:
+                found.add(t)
+        if len(found) == len(keys):
+            break
+    return [t for t, _ in keys if t in found]
+
+def header_band_find(page, keys, top_ratio: float = 0.20, backend: str = "pdfplumber"):
+    """
+    keys: normalize_header_key 적용된 키 목록 (같은 줄에서 함께 나오면 앞에 있는 키 우선)
+    반환: 상단 밴드에서 먼저 나타난 키 (없으면 None)
+    """
+    acc = ""
+    for t in iter_header_band_lines(page, top_ratio, backend):
+        acc += normalize_header_key(t)
+        for key in keys:
+            if key in acc:
+                return key
+    return None
+
+# ============================================================
+# ✅ 텍스트 백엔드 (글자 박스 출처)
+#   - "pdfplumber": pdfminer 해석 결과 page.chars (기존)
+#   - "pdfium"    : pypdfium2 FPDFText 글자 박스를 pdfminer와 같은 규칙으로 환산
+#       x0/x1     : loose char box 좌우
+#       top/bottom: baseline + descent ~ + font size (pdfminer LTChar와 동일)
+#   - 단어 조립은 두 백엔드 모두 pdfplumber.utils.extract_words (같은 옵션)
+#   - 회전 페이지/MediaBox 원점이 (0,0)이 아닌 페이지는 pdfplumber로 대체
+#   - pdfium이 유니코드로 못 바꾼 글자는 텍스트 페이지에서 통째로 빠짐 (예: CID 폰트의 "비")
+#       -> 글자가 하나도 안 잡힌 텍스트 객체가 있는 페이지는 pdfplumber로 대체
+# ============================================================
+TEXT_BACKENDS = ("pdfplumber", "pdfium")
+
+_PDFIUM_DOCS: "WeakKeyDictionary[Any, Any]" = WeakKeyDictionary()  # pdfplumber PDF -> PdfDocument
+_CHARS_BY_PAGE: "WeakKeyDictionary[Any, List[Dict[str, Any]]]" = WeakKeyDictionary()
+
+def _pdfium_document(pdf):
+    if pdfium is None:
+        raise RuntimeError("TEXT_BACKEND='pdfium' 인데 pypdfium2가 설치되어 있지 않음. (pip install pypdfium2)")
+    doc = _PDFIUM_DOCS.get(pdf)
+    if doc is None:
+        # pdfplumber.display와 같은 방식: 파일 경로 우선, 없으면 stream
+        src = getattr(pdf, "path", None)
+        if not src:
+            pdf.stream.seek(0)
+            src = pdf.stream
+        doc = pdfium.PdfDocument(src)
+        _PDFIUM_DOCS[pdf] = doc
+    return doc
+
+def _pdfium_text_objects(parent, is_page: bool = True):
+    # 페이지(또는 Form XObject) 안의 텍스트 객체 전부 (Form 안쪽까지)
+    count = pdfium_c.FPDFPage_CountObjects(parent) if is_page else pdfium_c.FPDFFormObj_CountObjects(parent)
+    for k in range(count):
+        obj = pdfium_c.FPDFPage_GetObject(parent, k) if is_page else pdfium_c.FPDFFormObj_GetObject(parent, k)
+        kind = pdfium_c.FPDFPageObj_GetType(obj)
+        if kind == pdfium_c.FPDF_PAGEOBJ_TEXT:
+            yield obj
+        elif kind == pdfium_c.FPDF_PAGEOBJ_FORM:
+            yield from _pdfium_text_objects(obj, is_page=False)
+
+def _pdfium_page_chars(page) -> List[Dict[str, Any]]:
+    if page.rotation % 360 != 0 or tuple(page.mediabox[:2]) != (0, 0):
+        return page.chars
+
+    doc = _pdfium_document(page.pdf)
+    ppage = doc[page.page_number - 1]
+    tp = ppage.get_textpage()
+    try:
+        _, mb_bottom, _, mb_top = ppage.get_mediabox()
+        height = mb_top - mb_bottom
+
+        ox, oy = ctypes.c_double(), ctypes.c_double()
+        rect = pdfium_c.FS_RECTF()
+        matrix = pdfium_c.FS_MATRIX()
+        out_f = ctypes.c_float()
+        descent_cache: Dict[Tuple[int, float], float] = {}
+        width_cache: Dict[Tuple[int, float, int], float] = {}
+
+        chars = []
+        seen_objs = set()  # 글자가 잡힌 텍스트 객체
+        for i in range(pdfium_c.FPDFText_CountChars(tp)):
+            if pdfium_c.FPDFText_IsGenerated(tp, i) == 1:
+                continue  # pdfium이 줄바꿈/띄어쓰기로 끼워넣은 글자
+            code = pdfium_c.FPDFText_GetUnicode(tp, i)
+            if code == 0:
+                continue
+            obj = pdfium_c.FPDFText_GetTextObject(tp, i)
+            seen_objs.add(ctypes.cast(obj, ctypes.c_void_p).value)
+
+            pdfium_c.FPDFText_GetLooseCharBox(tp, i, rect)
+            pdfium_c.FPDFText_GetCharOrigin(tp, i, ox, oy)
+            pdfium_c.FPDFText_GetMatrix(tp, i, matrix)
+            size = pdfium_c.FPDFText_GetFontSize(tp, i)
+
+            x0, x1 = rect.left, rect.right
+            y0, y1 = rect.bottom, rect.top
+            upright = (matrix.a * matrix.d > 0) and (matrix.b * matrix.c <= 0)
+            if upright:
+                font = pdfium_c.FPDFTextObj_GetFont(obj)
+                font_id = ctypes.cast(font, ctypes.c_void_p).value or 0
+
+                desc = descent_cache.get((font_id, size))
+                if desc is None:
+                    desc = 0.0
+                    if font and pdfium_c.FPDFFont_GetDescent(font, ctypes.c_float(size), out_f):
+                        desc = out_f.value
+                    descent_cache[(font_id, size)] = desc
+
+                adv = width_cache.get((font_id, size, code))
+                if adv is None:
+                    adv = 0.0
+                    if font and pdfium_c.FPDFFont_GetGlyphWidth(font, code, ctypes.c_float(size), out_f):
+                        adv = out_f.value
+                    width_cache[(font_id, size, code)] = adv
+
+                # pdfminer: x0 = 원점, x1 = 원점 + 글자폭(/Widths), y = baseline + descent ~ + size
+                if adv > 0:
+                    x0, x1 = ox.value, ox.value + adv
+                y0 = oy.value + desc
+                y1 = y0 + size
+            t = (height - (y1 - mb_bottom))
+            b = (height - (y0 - mb_bottom))
+            chars.append({
+                "text": chr(code),
+                "x0": x0, "x1": x1,
+                "top": t, "bottom": b,
+                "doctop": page.initial_doctop + t,
+                "width": x1 - x0, "height": b - t,
+                "size": size,
+                "upright": upright,
+            })
+
+        # 빠진 글자 검사: 글자가 하나도 안 잡힌 텍스트 객체 -> 이 페이지는 pdfminer 글자 사용
+        for obj in _pdfium_text_objects(ppage.raw):
+            if ctypes.cast(obj, ctypes.c_void_p).value not in seen_objs:
+                return page.chars
+        return chars
+    finally:
+        tp.close()
+        ppage.close()
+
+def get_page_chars(page, backend: str = "pdfplumber") -> List[Dict[str, Any]]:
+    if backend == "pdfplumber":
+        return page.chars
+    if backend != "pdfium":
+        raise ValueError(f"unknown text backend: {backend} (allowed: {TEXT_BACKENDS})")
+    chars = _CHARS_BY_PAGE.get(page)
+    if chars is None:
+        chars = _pdfium_page_chars(page)
+        _CHARS_BY_PAGE[page] = chars
+    return chars
+
+def extract_page_words(page, backend: str = "pdfplumber") -> List[Dict[str, Any]]:
+    if backend == "pdfplumber":
+        return page.extract_words(**WORD_EXTRACT_KW) or []
+    from pdfplumber.utils import extract_words
+    return extract_words(get_page_chars(page, backend), **WORD_EXTRACT_KW) or []
+
+# 페이지 객체가 살아있는 동안만 인덱스 유지(pdf 닫히고 page가 사라지면 같이 정리됨)
+_WORD_INDEX_BY_PAGE: "WeakKeyDictionary[Any, Dict[str, PageWordIndex]]" = WeakKeyDictionary()
+
+def get_page_word_index(page, backend: str = "pdfplumber") -> PageWordIndex:
+    by_backend = _WORD_INDEX_BY_PAGE.setdefault(page, {})
+    idx = by_backend.get(backend)
+    if idx is None:
+        idx = PageWordIndex(extract_page_words(page, backend))
+        by_backend[backend] = idx
+    return idx
+
+def clear_page_word_index(page=None) -> None:
+    if page is None:
+        _WORD_INDEX_BY_PAGE.clear()
+        _CHARS_BY_PAGE.clear()
+    else:
+        _WORD_INDEX_BY_PAGE.pop(page, None)
+        _CHARS_BY_PAGE.pop(page, None)